@@ -0,0 +1,78 @@
+"""
+Lectura de tareas y subtareas archivadas con ?include_archived=1.
+
+Las tablas de archivo (Apps/task/archive.py) tienen las mismas columnas y
+relaciones que las vivas, así que se serializan con los mismos serializers.
+list() une ambas en el orden de keyset_ordering, también con cursor, y
+retrieve() busca en el archivo si la fila ya no está viva. Con el parámetro
+cada elemento trae "archived": true/false.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from Apps.pagination import sort_rows
+
+
+class IncludeArchivedMixin:
+    """
+    Va debajo de los mixins de ETag y caché (la URL ya distingue el parámetro)
+    y encima de FastListMixin: la unión usa siempre el serializer.
+    """
+    include_archived_query_param = 'include_archived'
+    # Modelo de archivo equivalente al de la vista (o sobrescribir get_archived_queryset)
+    archived_model = None
+    # FilterSet equivalente al de la vista sobre el modelo archivado
+    archived_filterset_class = None
+
+    def include_archived(self):
+        value = self.request.query_params.get(self.include_archived_query_param, '')
+        return self.action in ('list', 'retrieve') and value.lower() in ('1', 'true')
+
+    def get_archived_queryset(self):
+        if self.archived_model is None:
+            raise ImproperlyConfigured(
+                f"{type(self).__name__} debe definir archived_model o sobrescribir get_archived_queryset()."
+            )
+        return self.archived_model._default_manager.all()
+
+    def filter_archived_queryset(self, queryset):
+        if self.archived_filterset_class is None:
+            return queryset
+        filterset = self.archived_filterset_class(self.request.query_params, queryset=queryset, request=self.request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        return filterset.qs
+
+    def list(self, request, *args, **kwargs):
+        if not self.include_archived():
+            return super().list(request, *args, **kwargs)
+
+        live = self.filter_queryset(self.get_queryset())
+        archived = self.filter_archived_queryset(self.get_archived_queryset())
+        page = self.paginator.paginate_querysets([live, archived], request, view=self)
+        rows = page if page is not None else sort_rows([*live, *archived], self.keyset_ordering)
+
+        data = self.get_serializer(rows, many=True).data
+        for row, item in zip(rows, data):
+            item['archived'] = isinstance(row, archived.model)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.include_archived():
+            return super().retrieve(request, *args, **kwargs)
+
+        try:
+            response = super().retrieve(request, *args, **kwargs)
+            archived = False
+        except Http404:
+            lookup = {self.lookup_field: kwargs[self.lookup_url_kwarg or self.lookup_field]}
+            instance = get_object_or_404(self.get_archived_queryset(), **lookup)
+            response = Response(self.get_serializer(instance).data)
+            archived = True
+        response.data['archived'] = archived
+        return response
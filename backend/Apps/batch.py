@@ -0,0 +1,145 @@
+"""
+POST /api/batch/: varias llamadas a la API en un solo viaje de red.
+
+Cada sub-petición se resuelve con el mismo URLconf y se ejecuta en el proceso
+con la vista real (filtros, permisos, caché, ETag). La autenticación se
+verifica una sola vez sobre la petición del batch y se reutiliza forzada en
+las sub-peticiones; los middlewares no se vuelven a ejecutar.
+"""
+import io
+import json
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.urls import Resolver404, resolve
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from Apps.read_cache import bump_data_version
+
+# Cabeceras de la petición del batch que no aplican a cada sub-petición
+SKIPPED_META = ('CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_IF_NONE_MATCH', 'HTTP_IF_MATCH', 'wsgi.input')
+# Cabeceras de cada sub-respuesta que se devuelven al cliente
+FORWARDED_HEADERS = ('ETag', 'X-Cache', 'Location')
+
+
+class BatchItemSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.CharField(max_length=2000)
+    body = serializers.JSONField(required=False)
+
+    def validate_path(self, value):
+        if not value.startswith('/api/') or value.split('?')[0].rstrip('/') == '/api/batch':
+            raise serializers.ValidationError("Solo rutas de la API (/api/...) y no el propio /api/batch/.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchItemSerializer(many=True, allow_empty=False)
+    # Todas las sub-peticiones en una transacción: la primera que falla deshace las anteriores
+    atomic = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(f"Máximo {settings.BATCH_MAX_REQUESTS} peticiones por batch.")
+        return value
+
+
+def _sub_request(request, item, atomic=False):
+    """WSGIRequest equivalente a `item` con el entorno de la petición del batch."""
+    path, _, query = item['path'].partition('?')
+    body = b'' if 'body' not in item else json.dumps(item['body'], cls=DjangoJSONEncoder).encode()
+    environ = {key: value for key, value in request.META.items() if key not in SKIPPED_META}
+    environ.update({
+        'REQUEST_METHOD': item['method'],
+        'PATH_INFO': path,
+        'SCRIPT_NAME': '',
+        'QUERY_STRING': query,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.url_scheme': request.scheme,
+    })
+    sub_request = WSGIRequest(environ)
+    # DRF autentica la sub-petición con el usuario ya verificado, sin volver a leer el token
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    # En modo atómico lo leído puede deshacerse: no se guarda en el caché de lecturas
+    sub_request.skip_read_cache = atomic
+    return sub_request
+
+
+def _run(request, item, atomic=False):
+    """Ejecuta una sub-petición y devuelve (status, body, headers)."""
+    sub_request = _sub_request(request, item, atomic)
+    try:
+        match = resolve(sub_request.path_info)
+    except Resolver404:
+        return status.HTTP_404_NOT_FOUND, {"detail": "Ruta no encontrada."}, {}
+    response = match.func(sub_request, *match.args, **match.kwargs)
+    if not hasattr(response, 'data'):
+        # Respuestas que no son de DRF (archivos, streaming): no hay datos que devolver en el JSON
+        response.close()
+        return status.HTTP_400_BAD_REQUEST, {"detail": "Ruta no soportada en batch."}, {}
+    # Las vistas de la API devuelven Response de DRF: se reutilizan los datos sin renderizar dos veces
+    headers = {name: response[name] for name in FORWARDED_HEADERS if response.has_header(name)}
+    return response.status_code, response.data, headers
+
+
+class BatchView(APIView):
+    """
+    Ejecuta una lista de sub-peticiones y devuelve sus respuestas en el mismo orden.
+    POST /api/batch/
+    Body: {"atomic": false, "requests": [{"method": "GET", "path": "/api/user/me/"}, ...]}
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data['requests']
+        atomic = serializer.validated_data['atomic']
+
+        started = time.perf_counter()
+        deadline = started + settings.BATCH_TIME_BUDGET_MS / 1000
+        results = []
+        with transaction.atomic() if atomic else nullcontext():
+            failed = False
+            for item in items:
+                if failed or time.perf_counter() > deadline:
+                    # No se ejecuta: falló una anterior en modo atómico o se agotó el tiempo del batch
+                    code = status.HTTP_424_FAILED_DEPENDENCY if failed else status.HTTP_503_SERVICE_UNAVAILABLE
+                    results.append({"status": code, "body": None, "headers": {}, "duration_ms": 0.0})
+                    if atomic and not failed:
+                        # Sin tiempo para terminar, el batch atómico no puede quedar a medias
+                        failed = True
+                        transaction.set_rollback(True)
+                    continue
+
+                item_started = time.perf_counter()
+                code, body, headers = _run(request, item, atomic)
+                results.append({
+                    "status": code,
+                    "body": body,
+                    "headers": headers,
+                    "duration_ms": round((time.perf_counter() - item_started) * 1000, 2),
+                })
+                if atomic and code >= 400:
+                    failed = True
+                    transaction.set_rollback(True)
+
+        if failed:
+            # Las sub-peticiones vieron datos deshechos con la versión ya incrementada
+            # (ETag de sus respuestas): se pasa a otra para que no sigan validando
+            bump_data_version(request.user.pk)
+
+        return Response({
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "responses": results,
+        }, status=status.HTTP_200_OK)
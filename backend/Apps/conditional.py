@@ -0,0 +1,51 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from Apps.read_cache import data_version
+
+
+class ConditionalGetMixin:
+    """
+    ETag fuerte en list/retrieve y 304 Not Modified con If-None-Match.
+
+    El ETag sale del contador de versión del caché de lecturas y de la URL
+    completa, así que se compara antes de tocar el queryset o el serializer.
+    Solo se activa con settings.READ_CACHE_ENABLED: sin un caché compartido
+    el contador de cada proceso no ve las escrituras de los demás, y
+    calcular una versión desde la BD costaría una agregación de toda la
+    cuenta en cada GET, 304 incluidos.
+    """
+    def get_data_version(self):
+        return data_version(self.request.user.pk)
+
+    def get_etag(self):
+        request = self.request
+        raw = json.dumps(
+            [request.user.pk, request.get_full_path(), request.accepted_renderer.format, self.get_data_version()],
+            default=str,
+        )
+        return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if not settings.READ_CACHE_ENABLED:
+            return handler(request, *args, **kwargs)
+        etag = self.get_etag()
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,149 @@
+"""
+Render rápido de solo lectura para los listados grandes.
+
+ValuesRenderer compila una vez por petición los campos de un serializer a
+(clave, columna de values(), conversor) y arma cada dict directamente desde
+las filas de .values(), sin instanciar modelos ni recorrer los campos de DRF
+por fila. Los conversores replican el to_representation de DRF, así que la
+respuesta es idéntica byte a byte a la del serializer.
+
+Los campos que no salen de una columna (serializers anidados,
+SerializerMethodField, source='*') los resuelve la vista pasando `custom`;
+si queda alguno sin resolver, compile() devuelve None y la vista usa el
+camino normal.
+"""
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.fields import ISO_8601
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+def _identity(value):
+    return value
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or tz is None:
+        return field.to_representation
+
+    def convert(value):
+        text = value.astimezone(tz).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    return lambda value: value.isoformat()
+
+
+def _choice_converter(field):
+    choices = dict(field.choice_strings_to_values)
+
+    def convert(value):
+        if value == '':
+            return value
+        return choices.get(str(value), value)
+    return convert
+
+
+def converter_for(field):
+    """Conversor equivalente a field.to_representation, o None si el campo no sale de una columna."""
+    if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField, serializers.ManyRelatedField)):
+        return None
+    if isinstance(field, serializers.RelatedField):
+        # values() sobre una FK devuelve directamente la pk
+        return _identity if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None else None
+    if isinstance(field, serializers.ChoiceField):
+        return _choice_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        return _date_converter(field)
+    if type(field) is serializers.CharField:
+        return str
+    if type(field) is serializers.IntegerField:
+        return int
+    if type(field) is serializers.FloatField:
+        return float
+    return field.to_representation
+
+
+class ValuesRenderer:
+    """Arma dicts con la forma de un serializer a partir de filas de values()."""
+
+    def __init__(self, columns, custom):
+        self.columns = columns
+        self.custom = custom
+
+    @classmethod
+    def compile(cls, serializer, prefix='', custom=None):
+        """
+        `prefix` antepone un lookup a las columnas (p. ej. 'task__' para leer la
+        tarea desde la fila de la subtarea). `custom` mapea nombre de campo a
+        (columnas, función(fila)) para los campos que resuelve la vista.
+        """
+        custom = custom or {}
+        columns = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if name in custom:
+                columns.append((name, None, custom[name][1]))
+                continue
+            convert = converter_for(field)
+            if convert is None or field.source == '*':
+                return None
+            columns.append((name, prefix + field.source.replace('.', '__'), convert))
+        extra = [source for name, (sources, _) in custom.items() for source in sources if name in serializer.fields]
+        return cls(columns, extra)
+
+    @property
+    def sources(self):
+        return [source for _, source, _ in self.columns if source is not None] + self.custom
+
+    def render(self, row):
+        data = {}
+        for name, source, convert in self.columns:
+            if source is None:
+                data[name] = convert(row)
+                continue
+            value = row[source]
+            data[name] = None if value is None else convert(value)
+        return data
+
+
+class FastListMixin:
+    """
+    list() desde values() cuando settings.FAST_LIST_RENDERING está activo.
+
+    La vista puede sobrescribir get_fast_renderer() para resolver campos
+    anidados y fast_render() para cargar datos por página.
+    """
+
+    def get_fast_renderer(self):
+        return ValuesRenderer.compile(self.get_serializer())
+
+    def fast_render(self, renderer, rows):
+        return [renderer.render(row) for row in rows]
+
+    def list(self, request, *args, **kwargs):
+        renderer = self.get_fast_renderer() if settings.FAST_LIST_RENDERING else None
+        if renderer is None:
+            return super().list(request, *args, **kwargs)
+
+        # El cursor de paginación lee los campos de orden de cada fila
+        sources = set(renderer.sources)
+        sources.update(name.lstrip('-') for name in getattr(self, 'keyset_ordering', ()))
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None).values(*sources)
+
+        page = self.paginate_queryset(queryset)
+        data = self.fast_render(renderer, queryset if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
@@ -0,0 +1,129 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def row_value(row, name):
+    """Valor del campo `name` de una instancia o de una fila de values()."""
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def sort_rows(rows, ordering):
+    """Ordena en memoria filas de distintos querysets como lo haría order_by(*ordering)."""
+    rows = list(rows)
+    # Ordenamientos estables del último campo al primero
+    for name in reversed(ordering):
+        field = name.lstrip('-')
+        rows.sort(key=lambda row: row_value(row, field), reverse=name.startswith('-'))
+    return rows
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) opcional.
+
+    Solo se activa si la petición trae ?cursor= o ?page_size=; si no, la vista
+    responde la lista completa como siempre. El orden sale de `keyset_ordering`
+    en la vista y debe terminar en un campo único (id) para que el cursor sea
+    estable aunque se inserten filas entre páginas. No hace COUNT(*).
+    """
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Página de la unión de varios querysets con los mismos campos de orden
+        (p. ej. filas vivas y archivadas): cada uno aporta hasta page_size + 1
+        filas después del cursor y se mezclan en memoria.
+        """
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(view.keyset_ordering)
+        cursor = params.get(self.cursor_query_param)
+
+        rows = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*self.ordering)
+            if cursor:
+                queryset = queryset.filter(self.after(self.decode_cursor(cursor, queryset.model)))
+            # Se pide una fila de más para saber si hay página siguiente
+            rows.extend(queryset[:self.page_size + 1])
+        if len(querysets) > 1:
+            rows = sort_rows(rows, self.ordering)
+
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = self.position(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            size = self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def position(self, instance):
+        """Valores de los campos de orden de la última fila de la página (instancia o fila de values())."""
+        return [row_value(instance, name.lstrip('-')) for name in self.ordering]
+
+    def after(self, values):
+        """
+        Filtro 'estrictamente después de' la posición para un orden compuesto.
+
+        (a, b, c) > (x, y, z) se expande a a>x OR (a=x AND b>y) OR (a=x AND b=y AND c>z),
+        usando < en los campos descendentes.
+        """
+        condition = Q()
+        equal = Q()
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def encode_cursor(self, values):
+        raw = json.dumps([value.isoformat() if hasattr(value, 'isoformat') else value for value in values])
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, cursor, model):
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            if not isinstance(raw, list) or len(raw) != len(self.ordering):
+                raise ValueError
+            return [
+                model._meta.get_field(name.lstrip('-')).to_python(value)
+                for name, value in zip(self.ordering, raw)
+            ]
+        except (ValueError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
@@ -0,0 +1,60 @@
+"""
+Revisión de planes de ejecución para los tests de regresión de consultas.
+
+plan_problems() corre EXPLAIN sobre una consulta ya ejecutada (SQL con los
+parámetros interpolados, como lo captura CaptureQueriesContext) y reporta
+lecturas completas de tablas y ordenamientos en memoria.
+"""
+import re
+
+from django.db import connection
+
+# Motores cuyos planes sabe leer plan_problems(); en otros los tests se saltan
+SUPPORTED_VENDORS = ('sqlite', 'postgresql')
+
+
+def explain(sql):
+    """Líneas del plan de `sql` en el motor actual."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        if connection.vendor == 'postgresql':
+            # Con tablas de test casi vacías el planner preferiría Seq Scan igual
+            cursor.execute('SET enable_seqscan = off')
+            try:
+                cursor.execute(f'EXPLAIN {sql}')
+                return [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.execute('RESET enable_seqscan')
+    raise ValueError(f"EXPLAIN no soportado para {connection.vendor}.")
+
+
+def main_table(sql):
+    match = re.search(r'\bFROM "?(\w+)"?', sql)
+    return match.group(1) if match else None
+
+
+def plan_problems(sql, allow_sort=()):
+    """
+    Problemas del plan de `sql`: tablas leídas completas y ordenamientos en memoria.
+
+    allow_sort lista las tablas principales (FROM) cuyas consultas pueden
+    ordenar en memoria porque ningún índice da ese orden.
+    """
+    tables = set(connection.introspection.table_names())
+    may_sort = main_table(sql) in allow_sort
+    problems = []
+    for line in explain(sql):
+        if connection.vendor == 'sqlite':
+            scan = re.match(r'\s*SCAN (\w+)', line)
+            if scan and scan.group(1) in tables and 'VIRTUAL TABLE' not in line:
+                problems.append(line.strip())
+            elif 'USE TEMP B-TREE' in line and not may_sort:
+                problems.append(line.strip())
+        else:
+            if 'Seq Scan' in line:
+                problems.append(line.strip())
+            elif re.search(r'(^|->\s*)(Incremental )?Sort\b', line.strip()) and not may_sort:
+                problems.append(line.strip())
+    return problems
@@ -0,0 +1,123 @@
+"""
+Caché de respuestas de lectura por usuario, versionada.
+
+Cada usuario tiene un contador de versión en el caché de Django; toda escritura
+de sus tareas, subtareas o de su usuario lo incrementa (bump_data_version) y
+las claves de respuesta incluyen la versión, así que invalidar es O(1): las
+respuestas viejas quedan inalcanzables y expiran solas. Requiere un backend
+compartido entre procesos (LocMem solo sirve con un proceso, p. ej. en tests).
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'read-cache:version:{}'
+RESPONSE_KEY = 'read-cache:response:{}:{}:{}'
+STATS_KEYS = {'hits': 'read-cache:hits', 'misses': 'read-cache:misses'}
+
+
+def data_version(user_id):
+    """Versión actual de los datos del usuario; se inicializa si no existe o fue desalojada."""
+    key = VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Un valor basado en el reloj no repite versiones anteriores a un desalojo
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump(user_ids):
+    for user_id in user_ids:
+        key = VERSION_KEY.format(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
+
+
+def bump_data_version(*user_ids):
+    """
+    Invalida las respuestas cacheadas de los usuarios.
+
+    Se incrementa ya (lecturas dentro de la misma transacción) y otra vez al
+    confirmar, para descartar lo que se haya cacheado con datos viejos entre
+    la escritura y el commit.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    _bump(user_ids)
+    transaction.on_commit(lambda: _bump(user_ids))
+
+
+def _count(name):
+    key = STATS_KEYS[name]
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+def stats():
+    """Contadores de aciertos y fallos del caché de lecturas."""
+    return {name: cache.get(key, 0) for name, key in STATS_KEYS.items()}
+
+
+def reset_stats():
+    cache.delete_many(STATS_KEYS.values())
+
+
+def cached_response(handler, request, *args, **kwargs):
+    """Devuelve la respuesta cacheada de `handler` para esta URL y versión, o la calcula y guarda."""
+    # skip_read_cache: lecturas que pueden ver datos que se van a deshacer (batch atómico)
+    if (not settings.READ_CACHE_ENABLED or getattr(request, 'skip_read_cache', False)
+            or not request.user.is_authenticated):
+        return handler(request, *args, **kwargs)
+
+    # La fecha entra en la clave: hay vistas que dependen de "hoy"
+    raw = f'{request.build_absolute_uri()}|{request.accepted_renderer.format}|{timezone.localdate()}'
+    key = RESPONSE_KEY.format(
+        request.user.pk,
+        data_version(request.user.pk),
+        hashlib.sha1(raw.encode()).hexdigest(),
+    )
+
+    cached = cache.get(key)
+    if cached is not None:
+        _count('hits')
+        response = Response(cached, status=status.HTTP_200_OK)
+        response['X-Cache'] = 'HIT'
+        return response
+
+    _count('misses')
+    response = handler(request, *args, **kwargs)
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, timeout=settings.READ_CACHE_TIMEOUT)
+        response['X-Cache'] = 'MISS'
+    return response
+
+
+def cached_read(method):
+    """Decorador para acciones GET propias de un ViewSet."""
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        return cached_response(functools.partial(method, self), request, *args, **kwargs)
+    return wrapper
+
+
+class CachedReadMixin:
+    """Cachea list/retrieve con la versión de datos del usuario."""
+
+    def list(self, request, *args, **kwargs):
+        return cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return cached_response(super().retrieve, request, *args, **kwargs)
@@ -0,0 +1,107 @@
+"""
+Búsqueda de texto completo sobre tareas y subtareas.
+
+Cada modelo declara SEARCH_FIELDS. Según el motor:
+
+- PostgreSQL: índice GIN sobre la misma expresión SearchVector que usa la
+  consulta, con ranking por ts_rank. La configuración spanish_unaccent es
+  'spanish' con unaccent antes del stemmer, para ignorar tildes como SQLite.
+- SQLite: tabla FTS5 "sombra" (<tabla>_search) con contenido externo,
+  sincronizada por triggers en INSERT/UPDATE/DELETE, con ranking bm25.
+- Otros motores: sin índice, cada palabra como subcadena (icontains) y sin
+  ranking.
+
+Los índices se crean en las migraciones (task 0006/0009, subtask
+0008/0010/0012), cada una con su propio SQL. En SQLite, cualquier migración
+que recree la tabla (AlterField, RemoveField...) borra los triggers: debe
+reinstalarlos como 0010_subtask_user. test_search_index_installed_after_migrate
+lo verifica sobre la BD de pruebas.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from rest_framework import serializers
+
+SEARCH_CONFIG = 'spanish_unaccent'
+
+
+class SearchParamsSerializer(serializers.Serializer):
+    """Valida ?q=&limit= de los endpoints de búsqueda."""
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate_q(self, value):
+        if not terms(value):
+            raise serializers.ValidationError("La búsqueda debe incluir al menos una palabra.")
+        return value
+
+
+def terms(text):
+    return re.findall(r'\w+', text)
+
+
+def _fts_table(model):
+    return f'{model._meta.db_table}_search'
+
+
+def _search_vector(fields):
+    from django.contrib.postgres.search import SearchVector
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def search(queryset, text, limit):
+    """
+    Las `limit` filas de `queryset` que mejor coinciden con `text`, ordenadas por relevancia.
+
+    Cada palabra se busca como prefijo y deben aparecer todas. Cada
+    instancia trae `search_rank` (mayor es mejor).
+    """
+    words = terms(text)
+    model = queryset.model
+    queryset = queryset.order_by()
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        query = SearchQuery(' & '.join(f'{word}:*' for word in words), search_type='raw', config=SEARCH_CONFIG)
+        # Misma expresión que el índice GIN para que el planner lo use
+        vector = _search_vector(model.SEARCH_FIELDS)
+        return list(
+            queryset.annotate(search=vector, search_rank=SearchRank(vector, query))
+            .filter(search=query)
+            .order_by('-search_rank', 'pk')[:limit]
+        )
+
+    if connection.vendor != 'sqlite':
+        return _search_substrings(queryset, words, limit)
+
+    fts = _fts_table(model)
+    match = ' '.join('"%s"*' % word.replace('"', '""') for word in words)
+    # El filtro del queryset (p. ej. el usuario) se aplica dentro de la consulta FTS
+    scope_sql, scope_params = queryset.values('pk').query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid, rank FROM {fts} WHERE {fts} MATCH %s AND rowid IN ({scope_sql}) ORDER BY rank LIMIT %s',
+            [match, *scope_params, limit],
+        )
+        ranked = cursor.fetchall()
+
+    objects = queryset.in_bulk([pk for pk, _ in ranked])
+    results = []
+    for pk, rank in ranked:
+        instance = objects[pk]
+        # bm25 de FTS5 es negativo: cuanto menor, más relevante
+        instance.search_rank = -rank
+        results.append(instance)
+    return results
+
+
+def _search_substrings(queryset, words, limit):
+    """Sin índice de texto completo: cada palabra en alguno de los campos, las más nuevas primero."""
+    condition = Q()
+    for word in words:
+        condition &= Q.create([(f'{name}__icontains', word) for name in queryset.model.SEARCH_FIELDS], connector=Q.OR)
+    results = list(queryset.filter(condition).order_by('-pk')[:limit])
+    for instance in results:
+        instance.search_rank = 0.0
+    return results
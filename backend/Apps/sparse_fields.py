@@ -0,0 +1,84 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+class SparseFieldsSerializerMixin:
+    """Permite recortar los campos del serializer con los argumentos fields= y omit=."""
+
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+
+class SparseFieldsViewMixin:
+    """
+    Proyección de campos por query params: ?fields=id,title o ?omit=subtasks.
+
+    Solo aplica a las acciones de lectura listadas en `sparse_actions`. Además de
+    recortar la respuesta, restrict_queryset() lleva la proyección al SQL con only().
+    """
+    sparse_actions = ('list', 'retrieve')
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fields(self):
+        """Devuelve (fields, omit): fields es None si no se pidió proyección."""
+        if self.action not in self.sparse_actions:
+            return None, set()
+        params = self.request.query_params
+
+        def parse(name):
+            return {token.strip() for token in params.get(name, '').split(',') if token.strip()}
+
+        fields = parse(self.fields_query_param) if self.fields_query_param in params else None
+        return fields, parse(self.omit_query_param)
+
+    def wants_field(self, name):
+        """Indica si el campo `name` del serializer forma parte de la respuesta."""
+        fields, omit = self.get_sparse_fields()
+        return (fields is None or name in fields) and name not in omit
+
+    def get_serializer(self, *args, **kwargs):
+        fields, omit = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        if omit:
+            kwargs.setdefault('omit', omit)
+        return super().get_serializer(*args, **kwargs)
+
+    def restrict_queryset(self, queryset, also=()):
+        """
+        Aplica only() con las columnas que realmente se serializan.
+
+        `also` agrega columnas que se leen fuera del serializer de la vista (p. ej.
+        la tarea embebida en las subtareas prefetcheadas, que es esta misma instancia).
+        """
+        fields, omit = self.get_sparse_fields()
+        if fields is None and not omit:
+            return queryset
+
+        model = queryset.model
+        columns = {model._meta.pk.name, *also}
+        serializer = self.get_serializer_class()(fields=fields, omit=omit)
+        for field in serializer.fields.values():
+            if isinstance(field, serializers.SerializerMethodField):
+                # Se calculan a partir de anotaciones, no de columnas
+                continue
+            name = field.source.split('.')[0]
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                # Fuente que no es una columna (propiedad, '*'): no se puede acotar
+                return queryset
+            if model_field.concrete:
+                columns.add(name)
+            elif not model_field.is_relation:
+                return queryset
+
+        # El cursor de paginación lee los campos de orden de la última fila
+        columns.update(name.lstrip('-') for name in getattr(self, 'keyset_ordering', ()))
+        return queryset.only(*columns)
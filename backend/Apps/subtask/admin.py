@@ -1,5 +1,19 @@
 from django.contrib import admin
-from .models import Subtask
+from Apps.task.metrics import deferred_metrics, mark_dirty, mark_dirty_days
+from .models import Subtask, UserDayLoad
 
-# Register your models here.
-admin.site.register(Subtask)
\ No newline at end of file
+
+@admin.register(Subtask)
+class SubtaskAdmin(admin.ModelAdmin):
+    def delete_queryset(self, request, queryset):
+        # El borrado masivo no pasa por Subtask.delete(): recalculamos una vez por tarea y día
+        with deferred_metrics():
+            mark_dirty(*queryset.order_by().values_list('task_id', flat=True).distinct())
+            mark_dirty_days(*queryset.order_by().values_list('user_id', 'planification_date').distinct())
+            queryset.delete()
+
+
+@admin.register(UserDayLoad)
+class UserDayLoadAdmin(admin.ModelAdmin):
+    list_display = ('user', 'date', 'planned_hours', 'subtask_count')
+    list_filter = ('date',)
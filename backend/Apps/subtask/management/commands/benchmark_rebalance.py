@@ -0,0 +1,46 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from Apps.subtask.scheduling import PlanItem, plan_rebalance
+
+
+class Command(BaseCommand):
+    help = "Mide el motor de reprogramación con datos sintéticos en memoria (sin tocar la BD)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000])
+        parser.add_argument('--capacity', type=int, default=6)
+        parser.add_argument('--per-day', type=int, default=3, help="Subtareas promedio por día planificado.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        start = datetime.date.today()
+        priorities = ['low', 'medium', 'high']
+
+        for size in options['sizes']:
+            days = max(size // options['per_day'], 1)
+            items = []
+            for pk in range(size):
+                day = rng.randrange(days)
+                # La entrega cae entre el día siguiente y dos meses después
+                due = day + rng.randrange(1, 60)
+                items.append(PlanItem(
+                    pk,
+                    start + datetime.timedelta(days=day),
+                    rng.choice([0.5, 1.0, 1.5, 2.0, 3.0, 4.0]),
+                    start + datetime.timedelta(days=due),
+                    rng.choice(priorities),
+                ))
+
+            began = time.perf_counter()
+            plan = plan_rebalance(items, options['capacity'], start)
+            elapsed = time.perf_counter() - began
+
+            self.stdout.write(
+                f"{size:>7} subtareas: {elapsed * 1000:8.1f} ms, "
+                f"{len(plan.moves)} movidas, {len(plan.unresolved)} sin resolver"
+            )
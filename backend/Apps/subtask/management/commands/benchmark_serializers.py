@@ -0,0 +1,87 @@
+import datetime
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from Apps.subtask.models import Subtask
+from Apps.subtask.serializers import SubtaskSerializer, subtask_values_renderer
+from Apps.task.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la serialización de listas de subtareas con instancias y filas de values() "
+        "construidas en memoria (sin tocar la BD)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+        parser.add_argument('--per-task', type=int, default=10, help="Subtareas promedio por tarea.")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def build(self, size, per_task, rng):
+        now = timezone.now()
+        tasks = [
+            Task(pk=pk, title=f"Tarea {pk}", due_date=now, priority=Task.Priority.MEDIUM, user_id=1)
+            for pk in range(1, max(size // per_task, 1) + 1)
+        ]
+        subtasks = []
+        for pk in range(1, size + 1):
+            task = rng.choice(tasks)
+            subtasks.append(Subtask(
+                pk=pk,
+                task=task,
+                user_id=task.user_id,
+                description=f"Subtarea {pk}",
+                planification_date=now.date() + datetime.timedelta(days=rng.randrange(30)),
+                needed_hours=rng.choice([0.5, 1.0, 2.0]),
+                created_at=now,
+            ))
+        return subtasks
+
+    def as_rows(self, subtasks, sources):
+        """Filas equivalentes a las de .values() para las mismas subtareas."""
+        def value(subtask, source):
+            # values('task') devuelve el id de la FK
+            if source == 'task':
+                return subtask.task_id
+            target = subtask
+            for part in source.split('__'):
+                target = getattr(target, part)
+            return target
+
+        return [{source: value(subtask, source) for source in sources} for subtask in subtasks]
+
+    def fast(self, rows):
+        renderer = subtask_values_renderer(SubtaskSerializer(), {})
+        return [renderer.render(row) for row in rows]
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        variants = {
+            # Referencia: un ListSerializer genérico no tiene memo y serializa la tarea en cada subtarea
+            'sin memo': lambda subtasks: serializers.ListSerializer(subtasks, child=SubtaskSerializer()).data,
+            'memo': lambda subtasks: SubtaskSerializer(subtasks, many=True).data,
+            'sideload': lambda subtasks: SubtaskSerializer(subtasks, many=True, context={'sideload_tasks': True}).data,
+        }
+        sources = subtask_values_renderer(SubtaskSerializer(), {}).sources
+
+        for size in options['sizes']:
+            subtasks = self.build(size, options['per_task'], rng)
+            timings = []
+            for name, serialize in variants.items():
+                began = time.perf_counter()
+                serialize(subtasks)
+                timings.append(f"{name} {(time.perf_counter() - began) * 1000:8.1f} ms")
+
+            rows = self.as_rows(subtasks, sources)
+            began = time.perf_counter()
+            data = self.fast(rows)
+            timings.append(f"values() {(time.perf_counter() - began) * 1000:8.1f} ms")
+
+            identical = JSONRenderer().render(data) == JSONRenderer().render(variants['memo'](subtasks))
+            self.stdout.write(f"{size:>7} subtareas: " + ", ".join(timings) + ("" if identical else "  [SALIDA DISTINTA]"))
@@ -0,0 +1,26 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from Apps.read_cache import bump_data_version
+from Apps.subtask.models import UserDayLoad
+
+
+class Command(BaseCommand):
+    help = "Reconstruye la carga diaria (UserDayLoad) de los usuarios a partir de sus subtareas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help="Solo este usuario (id).")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by('pk')
+        if options['user']:
+            users = users.filter(pk=options['user'])
+
+        total = 0
+        for user_id in users.values_list('pk', flat=True).iterator():
+            UserDayLoad.rebuild(user_id)
+            # Las respuestas cacheadas (capacidad, hoy) se calcularon con la carga anterior
+            bump_data_version(user_id)
+            total += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Carga diaria reconstruida para {total} usuarios."))
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def build_day_loads(apps, schema_editor):
+    """Llena la carga diaria a partir de las subtareas pendientes o en progreso."""
+    Subtask = apps.get_model('subtask', 'Subtask')
+    UserDayLoad = apps.get_model('subtask', 'UserDayLoad')
+    rows = Subtask.objects.filter(status__in=['pending', 'in_progress']).order_by().values(
+        'task__user', 'planification_date'
+    ).annotate(hours=Sum('needed_hours'), count=Count('id'))
+
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        batch.append(UserDayLoad(
+            user_id=row['task__user'],
+            date=row['planification_date'],
+            planned_hours=row['hours'],
+            subtask_count=row['count'],
+        ))
+        if len(batch) >= 1000:
+            UserDayLoad.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        UserDayLoad.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subtask', '0005_alter_subtask_options'),
+        ('task', '0005_task_subtask_count_completed_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDayLoad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('planned_hours', models.FloatField(default=0.0)),
+                ('subtask_count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='day_loads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['date'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'date'), name='unique_user_day_load')],
+            },
+        ),
+        migrations.RunPython(build_day_loads, migrations.RunPython.noop),
+    ]
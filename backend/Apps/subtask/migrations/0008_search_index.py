@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:43
+
+from django.db import migrations
+
+# Definiciones fijas de esta migración (no se importan de Apps.search: si ese
+# módulo cambia, lo que hace esta migración debe seguir siendo lo mismo)
+INDEX_NAME = 'subtask_subtask_search'
+SEARCH_FIELDS = ['description', 'note']
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE subtask_subtask_search USING fts5(description, note, "
+    "content='subtask_subtask', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER subtask_subtask_search_ai AFTER INSERT ON subtask_subtask BEGIN "
+    "INSERT INTO subtask_subtask_search(rowid, description, note) "
+    "VALUES (new.id, new.description, new.note); END",
+    "CREATE TRIGGER subtask_subtask_search_ad AFTER DELETE ON subtask_subtask BEGIN "
+    "INSERT INTO subtask_subtask_search(subtask_subtask_search, rowid, description, note) "
+    "VALUES ('delete', old.id, old.description, old.note); END",
+    "CREATE TRIGGER subtask_subtask_search_au AFTER UPDATE ON subtask_subtask BEGIN "
+    "INSERT INTO subtask_subtask_search(subtask_subtask_search, rowid, description, note) "
+    "VALUES ('delete', old.id, old.description, old.note); "
+    "INSERT INTO subtask_subtask_search(rowid, description, note) "
+    "VALUES (new.id, new.description, new.note); END",
+    # Indexa las filas existentes
+    "INSERT INTO subtask_subtask_search(subtask_subtask_search) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS subtask_subtask_search_ai",
+    "DROP TRIGGER IF EXISTS subtask_subtask_search_ad",
+    "DROP TRIGGER IF EXISTS subtask_subtask_search_au",
+    "DROP TABLE IF EXISTS subtask_subtask_search",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+        index = GinIndex(SearchVector(*SEARCH_FIELDS, config='spanish'), name=INDEX_NAME)
+        schema_editor.add_index(apps.get_model('subtask', 'Subtask'), index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_CREATE:
+            schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+    elif vendor == 'sqlite':
+        for sql in SQLITE_DROP:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subtask', '0007_subtask_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subtask', '0008_search_index'),
+        ('task', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['task', 'planification_date', 'created_at'], name='subtask_task_plan_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'in_progress'])), fields=['task', 'planification_date'], name='subtask_active_plan_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+# Búsqueda de SQLite tal como la instaló 0008_search_index (definiciones fijas,
+# no se importan de Apps.search)
+SQLITE_SEARCH = [
+    "DROP TRIGGER IF EXISTS subtask_subtask_search_ai",
+    "DROP TRIGGER IF EXISTS subtask_subtask_search_ad",
+    "DROP TRIGGER IF EXISTS subtask_subtask_search_au",
+    "DROP TABLE IF EXISTS subtask_subtask_search",
+    "CREATE VIRTUAL TABLE subtask_subtask_search USING fts5(description, note, "
+    "content='subtask_subtask', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER subtask_subtask_search_ai AFTER INSERT ON subtask_subtask BEGIN "
+    "INSERT INTO subtask_subtask_search(rowid, description, note) "
+    "VALUES (new.id, new.description, new.note); END",
+    "CREATE TRIGGER subtask_subtask_search_ad AFTER DELETE ON subtask_subtask BEGIN "
+    "INSERT INTO subtask_subtask_search(subtask_subtask_search, rowid, description, note) "
+    "VALUES ('delete', old.id, old.description, old.note); END",
+    "CREATE TRIGGER subtask_subtask_search_au AFTER UPDATE ON subtask_subtask BEGIN "
+    "INSERT INTO subtask_subtask_search(subtask_subtask_search, rowid, description, note) "
+    "VALUES ('delete', old.id, old.description, old.note); "
+    "INSERT INTO subtask_subtask_search(rowid, description, note) "
+    "VALUES (new.id, new.description, new.note); END",
+    "INSERT INTO subtask_subtask_search(subtask_subtask_search) VALUES ('rebuild')",
+]
+
+
+def copy_task_owner(apps, schema_editor):
+    Subtask = apps.get_model('subtask', 'Subtask')
+    Task = apps.get_model('task', 'Task')
+    # Un solo UPDATE con subconsulta correlacionada
+    Subtask.objects.update(user_id=Subquery(Task.objects.filter(pk=OuterRef('task_id')).values('user_id')[:1]))
+
+
+def reinstall_sqlite_search(apps, schema_editor):
+    # En SQLite AlterField recrea la tabla y se pierden los triggers de la búsqueda
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in SQLITE_SEARCH:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subtask', '0009_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subtask',
+            name='user',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(copy_task_owner, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='subtask',
+            name='user',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RemoveIndex(
+            model_name='subtask',
+            name='subtask_active_plan_idx',
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(fields=['user', 'planification_date', 'created_at', 'id'], name='subtask_user_plan_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='subtask',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'in_progress'])), fields=['user', 'planification_date'], name='subtask_user_active_idx'),
+        ),
+        migrations.RunPython(reinstall_sqlite_search, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subtask', '0010_subtask_user'),
+        ('task', '0008_archive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSubtask',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('description', models.CharField(max_length=300)),
+                ('status', models.CharField(choices=[('pending', 'Pendiente'), ('in_progress', 'En Progreso'), ('completed', 'Completado'), ('postponed', 'Pospuesta')], max_length=50)),
+                ('planification_date', models.DateField()),
+                ('needed_hours', models.FloatField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('note', models.TextField(blank=True, null=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subtasks', to='task.archivedtask')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_subtasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['planification_date', 'created_at'],
+                'indexes': [models.Index(fields=['task', 'planification_date', 'created_at'], name='archivedsubtask_task_plan_idx'), models.Index(fields=['user', 'planification_date', 'created_at', 'id'], name='archivedsubtask_user_plan_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:20
+
+from django.db import migrations
+
+# Definiciones fijas de esta migración (no se importan de Apps.search)
+INDEX_NAME = 'subtask_subtask_search'
+SEARCH_FIELDS = ['description', 'note']
+
+
+def rebuild_index(schema_editor, model, config):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+    schema_editor.add_index(model, GinIndex(SearchVector(*SEARCH_FIELDS, config=config), name=INDEX_NAME))
+
+
+def use_unaccent(apps, schema_editor):
+    # El índice GIN se creó con la configuración 'spanish': se recrea con spanish_unaccent (sin tildes)
+    if schema_editor.connection.vendor == 'postgresql':
+        rebuild_index(schema_editor, apps.get_model('subtask', 'Subtask'), 'spanish_unaccent')
+
+
+def use_spanish(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        rebuild_index(schema_editor, apps.get_model('subtask', 'Subtask'), 'spanish')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subtask', '0011_archive'),
+        # Crea la configuración spanish_unaccent
+        ('task', '0009_search_unaccent'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_unaccent, use_spanish),
+    ]
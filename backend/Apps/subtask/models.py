@@ -1,8 +1,24 @@
-from django.db import models
+import datetime
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, F, Sum
 from Apps.task.models import Task
+from Apps.task.metrics import is_deferred, mark_dirty, mark_dirty_days
 from django.core.validators import MinValueValidator
 from django.core.exceptions import ValidationError # <--- IMPORTANTE
 
+class MetricsSnapshot(NamedTuple):
+    """Valores de una subtarea que alimentan las métricas de su tarea y la carga diaria."""
+    task_id: int
+    status: str
+    needed_hours: float
+    planification_date: datetime.date
+    user_id: int
+
+
 class Subtask(models.Model):
     
     class Status(models.TextChoices):
@@ -12,12 +28,23 @@ class Subtask(models.Model):
         #Estado para cuando se pospone una subtarea
         POSTPONED = "postponed", "Pospuesta"
 
+    # Estados que ocupan capacidad del día (pendientes o en progreso)
+    ACTIVE_STATUSES = (Status.PENDING, Status.IN_PROGRESS)
+
     task = models.ForeignKey(
         Task, 
         on_delete=models.CASCADE, 
         related_name="subtasks"
     )
 
+    # Dueño de la tarea, copiado en save() para filtrar por usuario sin join con task
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="subtasks",
+        editable=False,
+    )
+
     description = models.CharField(max_length=300)
     
     status = models.CharField(
@@ -29,33 +56,249 @@ class Subtask(models.Model):
     planification_date = models.DateField() 
     needed_hours = models.FloatField(validators=[MinValueValidator(0.0)])
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     #Campo para guardar notas sobre las subtareas
     note = models.TextField(blank=True,null=True)
 
+    # Campos de la búsqueda de texto completo (Apps/search.py)
+    SEARCH_FIELDS = ['description', 'note']
+
     class Meta:
         ordering = ['planification_date', 'created_at']
+        indexes = [
+            # Subtareas de una tarea en su orden (prefetch, detalle de tarea)
+            models.Index(fields=['task', 'planification_date', 'created_at'], name='subtask_task_plan_idx'),
+            # Listado, cursor y calendario del usuario en su orden, sin join ni ordenamiento
+            models.Index(fields=['user', 'planification_date', 'created_at', 'id'], name='subtask_user_plan_idx'),
+            # Carga diaria, conflictos y reprogramación: solo pendientes/en progreso (ACTIVE_STATUSES)
+            models.Index(
+                fields=['user', 'planification_date'],
+                condition=models.Q(status__in=['pending', 'in_progress']),
+                name='subtask_user_active_idx',
+            ),
+        ]
 
     # --- NUEVA LÓGICA DE VALIDACIÓN ---
     def clean(self):
         """Valida que la fecha de la subtarea no sea mayor a la de la tarea padre."""
         super().clean()
         if self.task and self.task.due_date and self.planification_date:
-            # Comparamos solo la parte de la fecha (.date())
-            if self.planification_date > self.task.due_date.date():
+            # Comparamos con el día de entrega en la hora local (mismo criterio que el planificador)
+            due_day = self.task.due_day
+            if self.planification_date > due_day:
                 raise ValidationError({
-                    'planification_date': f"La fecha ({self.planification_date}) no puede ser posterior a la entrega de la tarea ({self.task.due_date.date()})."
+                    'planification_date': f"La fecha ({self.planification_date}) no puede ser posterior a la entrega de la tarea ({due_day})."
                 })
 
+    # Campos (attname) que afectan las métricas de la tarea padre y la carga diaria
+    METRIC_FIELDS = MetricsSnapshot._fields
+
+    def _metrics_values(self):
+        return MetricsSnapshot(*(getattr(self, name) for name in self.METRIC_FIELDS))
+
+    def _load_metrics_snapshot(self):
+        """
+        Lee y bloquea los valores actuales de métricas en la BD (1 consulta).
+
+        Debe llamarse dentro de una transacción: otra escritura concurrente de
+        la misma subtarea espera y después parte del valor ya actualizado.
+        """
+        row = (
+            type(self)._base_manager.select_for_update()
+            .filter(pk=self.pk).values_list(*self.METRIC_FIELDS).first()
+        )
+        return MetricsSnapshot(*row) if row else None
+
+    def _sync_metrics(self, previous, current):
+        """
+        Propaga un cambio (previous -> current) a la tarea padre y a la carga diaria.
+
+        previous es None al crear y current es None al borrar.
+        """
+        task_deltas = defaultdict(lambda: [0.0, 0, 0])
+        for snapshot, sign in ((previous, -1), (current, 1)):
+            if snapshot is not None:
+                delta = task_deltas[snapshot.task_id]
+                delta[0] += sign * snapshot.needed_hours
+                delta[1] += sign
+                delta[2] += sign * int(snapshot.status == self.Status.COMPLETED)
+        task_deltas = {task_id: delta for task_id, delta in task_deltas.items() if any(delta)}
+
+        day_deltas = UserDayLoad.deltas_for(previous, current)
+
+        if is_deferred():
+            # Dentro de deferred_metrics(): se recalcula una vez al cerrar la transacción
+            mark_dirty(*task_deltas)
+            mark_dirty_days(*day_deltas)
+            return
+
+        if getattr(settings, 'TASK_METRICS_INCREMENTAL', True):
+            for task_id, (hours, count, completed) in task_deltas.items():
+                Task.apply_subtask_delta(task_id, hours=hours, count=count, completed=completed)
+        else:
+            # Recálculo completo y exacto de cada tarea afectada
+            Task.recompute_metrics(task_deltas)
+
+        if self.task_id in task_deltas:
+            self.task.refresh_from_db(fields=Task.METRIC_FIELDS)
+
+        UserDayLoad.apply_deltas(day_deltas)
+
     def save(self, *args, **kwargs):
         """Ejecuta la validación y luego guarda/actualiza métricas."""
+        if self.task_id is not None:
+            # El dueño sigue siempre a la tarea, también al cambiar de tarea
+            self.user_id = self.task.user_id
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None and {'task', 'task_id'} & set(update_fields):
+                kwargs['update_fields'] = [*update_fields, 'user']
         self.full_clean() # <--- OBLIGATORIO: Llama a la función clean() definida arriba
-        super().save(*args, **kwargs)
-        self.task.update_metrics()
+        with transaction.atomic():
+            # El valor previo se relee con bloqueo: una instancia cargada antes
+            # (o una escritura concurrente) no debe contar dos veces el mismo cambio
+            previous = None if self._state.adding else self._load_metrics_snapshot()
+            super().save(*args, **kwargs)
+
+            current = self._metrics_values()
+            update_fields = kwargs.get('update_fields')
+            if previous is not None and update_fields is not None:
+                # Solo se escribieron algunos campos: el resto sigue como estaba en la BD
+                written = {self._meta.get_field(name).attname for name in update_fields}
+                current = previous._replace(**{
+                    name: value for name, value in current._asdict().items() if name in written
+                })
+
+            self._sync_metrics(previous, current)
 
     def delete(self, *args, **kwargs):
-        task_reference = self.task
-        super().delete(*args, **kwargs)
-        task_reference.update_metrics()
+        with transaction.atomic():
+            previous = self._load_metrics_snapshot()
+            result = super().delete(*args, **kwargs)
+            # Si la fila ya no existía (borrado repetido) no hay nada que descontar
+            if previous is not None and result[0] > 0:
+                self._sync_metrics(previous, None)
+        return result
+
+    def __str__(self):
+        return f"Subtask: {self.description[:30]}... (Task: {self.task.title})"
+
+
+class UserDayLoad(models.Model):
+    """
+    Carga planificada por usuario y día, mantenida por las escrituras de Subtask.
+
+    Solo cuenta subtareas pendientes o en progreso, el mismo criterio de los
+    chequeos de capacidad contra CustomUser.daily_hours.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="day_loads"
+    )
+    date = models.DateField()
+    planned_hours = models.FloatField(default=0.0)
+    subtask_count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'date'], name='unique_user_day_load'),
+        ]
+
+    @staticmethod
+    def deltas_for(previous, current):
+        """Calcula {(user_id, fecha): [horas, cantidad]} para un cambio de subtarea."""
+        deltas = defaultdict(lambda: [0.0, 0])
+        for snapshot, sign in ((previous, -1), (current, 1)):
+            if snapshot is None or snapshot.status not in Subtask.ACTIVE_STATUSES:
+                continue
+            delta = deltas[(snapshot.user_id, snapshot.planification_date)]
+            delta[0] += sign * snapshot.needed_hours
+            delta[1] += sign
+        return {key: delta for key, delta in deltas.items() if key[0] is not None and any(delta)}
+
+    @classmethod
+    def apply_deltas(cls, deltas):
+        """Suma los deltas con UPDATE atómicos; si la fila no existe, reconstruye ese día."""
+        missing = []
+        for (user_id, day), (hours, count) in deltas.items():
+            updated = cls.objects.filter(user_id=user_id, date=day).update(
+                planned_hours=F('planned_hours') + hours,
+                subtask_count=F('subtask_count') + count,
+            )
+            if not updated:
+                missing.append((user_id, day))
+        if missing:
+            cls.rebuild_days(missing)
+
+    @classmethod
+    def rebuild_days(cls, pairs):
+        """Reconstruye de forma exacta los pares (user_id, fecha) indicados."""
+        dates_by_user = defaultdict(set)
+        for user_id, day in pairs:
+            dates_by_user[user_id].add(day)
+        for user_id, dates in dates_by_user.items():
+            cls.rebuild(user_id, dates)
+
+    @classmethod
+    def rebuild(cls, user_id, dates=None):
+        """Reconstruye la carga de un usuario (todos los días o solo `dates`) desde sus subtareas."""
+        subtasks = Subtask.objects.filter(user_id=user_id, status__in=Subtask.ACTIVE_STATUSES)
+        stale = cls.objects.filter(user_id=user_id)
+        if dates is not None:
+            subtasks = subtasks.filter(planification_date__in=dates)
+            stale = stale.filter(date__in=dates)
+
+        rows = subtasks.order_by().values('planification_date').annotate(
+            hours=Sum('needed_hours'),
+            count=Count('id'),
+        )
+        loads = [
+            cls(user_id=user_id, date=row['planification_date'], planned_hours=row['hours'], subtask_count=row['count'])
+            for row in rows
+        ]
+
+        with transaction.atomic(savepoint=False):
+            if dates is None:
+                stale.delete()
+            else:
+                stale.exclude(date__in=[load.date for load in loads]).delete()
+            cls.objects.bulk_create(
+                loads,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['user', 'date'],
+                update_fields=['planned_hours', 'subtask_count'],
+            )
+
+
+class ArchivedSubtask(models.Model):
+    """Subtarea de una ArchivedTask: mismas columnas que Subtask, de solo lectura."""
+    id = models.BigIntegerField(primary_key=True)
+    task = models.ForeignKey(
+        'task.ArchivedTask',
+        on_delete=models.CASCADE,
+        related_name="subtasks"
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_subtasks"
+    )
+    description = models.CharField(max_length=300)
+    status = models.CharField(max_length=50, choices=Subtask.Status.choices)
+    planification_date = models.DateField()
+    needed_hours = models.FloatField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    note = models.TextField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['planification_date', 'created_at']
+        indexes = [
+            models.Index(fields=['task', 'planification_date', 'created_at'], name='archivedsubtask_task_plan_idx'),
+            models.Index(fields=['user', 'planification_date', 'created_at', 'id'], name='archivedsubtask_user_plan_idx'),
+        ]
 
     def __str__(self):
-        return f"Subtask: {self.description[:30]}... (Task: {self.task.title})"
\ No newline at end of file
+        return f"Subtask: {self.description[:30]}... (archivada)"
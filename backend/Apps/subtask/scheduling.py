@@ -0,0 +1,216 @@
+"""
+Motor de reprogramación de subtareas según la capacidad diaria del usuario.
+
+Toma las subtareas futuras pendientes o en progreso y reasigna su
+planification_date para que ningún día supere la capacidad, sin pasar nunca
+del due_date de su tarea. Es un greedy O(n log n):
+
+1. En cada día se conservan las subtareas más urgentes que caben
+   (due_date más cercano y luego mayor prioridad); el resto pasa a un pool.
+2. El pool se recorre por urgencia y cada subtarea va al primer día con
+   espacio entre su fecha original y su entrega; si no hay, al día libre más
+   cercano antes de su fecha original. La búsqueda usa un árbol de segmentos
+   sobre la capacidad libre, O(log D) por subtarea.
+
+Lo que no cabe en ningún día queda en su fecha y se reporta como no resuelto.
+"""
+import datetime
+from bisect import bisect_right
+from itertools import accumulate
+from typing import NamedTuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from Apps.read_cache import bump_data_version
+from Apps.task.models import Task
+from .models import Subtask, UserDayLoad
+
+# Tolerancia para comparar sumas de horas en coma flotante
+EPSILON = 1e-9
+
+PRIORITY_RANK = {
+    Task.Priority.HIGH: 0,
+    Task.Priority.MEDIUM: 1,
+    Task.Priority.LOW: 2,
+}
+
+
+class PlanItem(NamedTuple):
+    id: int
+    planification_date: datetime.date
+    needed_hours: float
+    due_date: datetime.date
+    priority: str
+
+    def urgency(self):
+        return (self.due_date, PRIORITY_RANK.get(self.priority, 1), self.planification_date, self.id)
+
+
+class Move(NamedTuple):
+    id: int
+    from_date: datetime.date
+    to_date: datetime.date
+
+
+class RebalancePlan(NamedTuple):
+    capacity: float
+    moves: list
+    unresolved: list
+
+
+class _FreeCapacityTree:
+    """Árbol de segmentos con el máximo de capacidad libre por rango de días."""
+
+    def __init__(self, free):
+        self.n = len(free)
+        self.size = 1
+        while self.size < self.n:
+            self.size *= 2
+        self.tree = [float('-inf')] * (2 * self.size)
+        self.tree[self.size:self.size + self.n] = free
+        for i in range(self.size - 1, 0, -1):
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def add(self, index, delta):
+        i = self.size + index
+        self.tree[i] += delta
+        i //= 2
+        while i:
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+            i //= 2
+
+    def first_fit(self, lo, hi, hours):
+        """Índice más bajo en [lo, hi] con capacidad libre >= hours, o None."""
+        return self._search(1, 0, self.size - 1, lo, hi, hours, leftmost=True)
+
+    def last_fit(self, lo, hi, hours):
+        """Índice más alto en [lo, hi] con capacidad libre >= hours, o None."""
+        return self._search(1, 0, self.size - 1, lo, hi, hours, leftmost=False)
+
+    def _search(self, node, node_lo, node_hi, lo, hi, hours, leftmost):
+        if lo > hi or node_hi < lo or node_lo > hi or self.tree[node] + EPSILON < hours:
+            return None
+        if node_lo == node_hi:
+            return node_lo
+        mid = (node_lo + node_hi) // 2
+        children = [(2 * node, node_lo, mid), (2 * node + 1, mid + 1, node_hi)]
+        if not leftmost:
+            children.reverse()
+        for child, child_lo, child_hi in children:
+            found = self._search(child, child_lo, child_hi, lo, hi, hours, leftmost)
+            if found is not None:
+                return found
+        return None
+
+
+def plan_rebalance(items, capacity, start):
+    """Calcula una reprogramación factible para `items` (PlanItem) desde `start`."""
+    items = [item for item in items if item.planification_date >= start]
+    if not items:
+        return RebalancePlan(capacity, [], [])
+
+    horizon = max(max(item.due_date, item.planification_date) for item in items)
+    days = (horizon - start).days + 1
+
+    def index(day):
+        return (day - start).days
+
+    # 1. Por día, se conservan las más urgentes que caben
+    by_day = {}
+    for item in sorted(items, key=PlanItem.urgency):
+        by_day.setdefault(item.planification_date, []).append(item)
+
+    free = [float(capacity)] * days
+    pool = []
+    for day, day_items in by_day.items():
+        slot = index(day)
+        for item in day_items:
+            if item.needed_hours <= free[slot] + EPSILON:
+                free[slot] -= item.needed_hours
+            else:
+                pool.append(item)
+
+    # 2. El pool se ubica por urgencia en el día libre más cercano
+    tree = _FreeCapacityTree(free)
+    moves = []
+    unresolved = []
+    for item in sorted(pool, key=PlanItem.urgency):
+        original = index(item.planification_date)
+        deadline = index(max(item.due_date, item.planification_date))
+
+        slot = tree.first_fit(original, deadline, item.needed_hours)
+        if slot is None:
+            slot = tree.last_fit(0, original - 1, item.needed_hours)
+        if slot is None:
+            # No cabe en ningún día permitido: se queda donde estaba
+            slot = original
+            unresolved.append(item.id)
+
+        tree.add(slot, -item.needed_hours)
+        if slot != original:
+            moves.append(Move(item.id, item.planification_date, start + datetime.timedelta(days=slot)))
+
+    return RebalancePlan(capacity, moves, unresolved)
+
+
+def load_plan_items(user, start):
+    """Lee como tuplas las subtareas futuras pendientes o en progreso del usuario."""
+    rows = Subtask.objects.filter(
+        user=user,
+        planification_date__gte=start,
+        status__in=Subtask.ACTIVE_STATUSES,
+    ).order_by().values_list('id', 'planification_date', 'needed_hours', 'task__due_date', 'task__priority')
+
+    return [
+        PlanItem(pk, day, hours, Task.due_day_of(due), priority)
+        for pk, day, hours, due, priority in rows.iterator(chunk_size=2000)
+    ]
+
+
+def rebalance(user, capacity=None, apply=False, start=None):
+    """
+    Propone (y opcionalmente aplica) una reprogramación para el usuario.
+
+    capacity por defecto es user.daily_hours; permite evaluar un valor nuevo
+    antes de guardarlo. Con apply=True las fechas se escriben con bulk_update.
+    """
+    start = start or timezone.localdate()
+    capacity = user.daily_hours if capacity is None else capacity
+
+    with transaction.atomic():
+        plan = plan_rebalance(load_plan_items(user, start), capacity, start)
+        if apply and plan.moves:
+            # bulk_update no aplica auto_now: updated_at se escribe a mano
+            now = timezone.now()
+            Subtask.objects.bulk_update(
+                [Subtask(pk=move.id, planification_date=move.to_date, updated_at=now) for move in plan.moves],
+                ['planification_date', 'updated_at'],
+                batch_size=1000,
+            )
+            bump_data_version(user.pk)
+            affected = {move.from_date for move in plan.moves} | {move.to_date for move in plan.moves}
+            UserDayLoad.rebuild(user.pk, affected)
+    return plan
+
+
+def capacity_curve(loads, candidates=range(1, 25)):
+    """
+    Para cada capacidad candidata, cuántos días quedarían en conflicto y cuántas horas sobran.
+
+    `loads` son las horas planificadas por día; se ordenan una vez y cada candidato
+    se resuelve con una búsqueda binaria y sumas de sufijo.
+    """
+    loads = sorted(loads)
+    # suffix[i] = suma de loads[i:]
+    suffix = list(accumulate(reversed(loads), initial=0.0))[::-1]
+    curve = []
+    for hours in candidates:
+        first_over = bisect_right(loads, hours)
+        days = len(loads) - first_over
+        curve.append({
+            "daily_hours": hours,
+            "conflicting_days": days,
+            "overflow_hours": suffix[first_over] - hours * days,
+        })
+    return curve
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from .models import Subtask
 from Apps.task.models import Task
+from Apps.fast_read import ValuesRenderer
+from Apps.sparse_fields import SparseFieldsSerializerMixin
 
 class TaskMiniSerializer(serializers.ModelSerializer):
     class Meta:
@@ -17,7 +19,41 @@ class TaskMiniSerializer(serializers.ModelSerializer):
             'total_hours'
         ]
 
-class SubtaskSerializer(serializers.ModelSerializer):
+def apply_note_rules(validated_data):
+    """Normaliza la nota de una edición parcial y la interpreta como posposición si no trae status."""
+    note = validated_data.get('note', serializers.empty)
+    incoming_status = validated_data.get('status', serializers.empty)
+
+    if note is not serializers.empty and isinstance(note, str):
+        normalized_note = note.strip()
+        validated_data['note'] = normalized_note if normalized_note else None
+
+    # Si se guarda una nota sin enviar status explícito,
+    # interpretamos la acción como una posposición.
+    if (
+        note is not serializers.empty
+        and validated_data.get('note')
+        and incoming_status is serializers.empty
+    ):
+        validated_data['status'] = Subtask.Status.POSTPONED
+    return validated_data
+
+
+class SubtaskListSerializer(serializers.ListSerializer):
+    """
+    Lista de subtareas que serializa cada tarea padre una sola vez por respuesta.
+
+    task_memo guarda {task_id: datos de TaskMiniSerializer}; la vista puede pasar
+    su propio dict en el contexto ('task_memo') para devolverlo aparte como mapa
+    de tareas con 'sideload_tasks'.
+    """
+
+    def to_representation(self, data):
+        self.task_memo = self.context.get('task_memo', {})
+        return super().to_representation(data)
+
+
+class SubtaskSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     # El campo task no es requerido en la entrada porque se asigna en el backend
     # desde la URL del endpoint /api/task/{id}/subtasks/
     task = serializers.PrimaryKeyRelatedField(
@@ -27,26 +63,12 @@ class SubtaskSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Subtask
-        fields = '__all__'
+        # El dueño se deriva de la tarea y no forma parte de la API
+        exclude = ['user']
+        list_serializer_class = SubtaskListSerializer
 
     def update(self, instance, validated_data):
-        note = validated_data.get('note', serializers.empty)
-        incoming_status = validated_data.get('status', serializers.empty)
-
-        if note is not serializers.empty and isinstance(note, str):
-            normalized_note = note.strip()
-            validated_data['note'] = normalized_note if normalized_note else None
-
-        # Si se guarda una nota sin enviar status explícito,
-        # interpretamos la acción como una posposición.
-        if (
-            note is not serializers.empty
-            and validated_data.get('note')
-            and incoming_status is serializers.empty
-        ):
-            validated_data['status'] = Subtask.Status.POSTPONED
-
-        return super().update(instance, validated_data)
+        return super().update(instance, apply_note_rules(validated_data))
 
     # Agregamos esta función para modificar cómo se ENVÍAN los datos (GET)
     def to_representation(self, instance):
@@ -55,7 +77,85 @@ class SubtaskSerializer(serializers.ModelSerializer):
         
         # Si la subtarea tiene una tarea asociada, usamos tu TaskMiniSerializer
         # para empaquetar toda la info y sobreescribimos el campo 'task'
-        if instance.task:
-            representation['task'] = TaskMiniSerializer(instance.task).data
+        # (solo si 'task' se pidió, para no cargar la relación en vano)
+        if 'task' in representation and instance.task_id:
+            representation['task'] = self.task_representation(instance)
             
-        return representation
\ No newline at end of file
+        return representation
+
+    def task_representation(self, instance):
+        """Tarea embebida, memorizada en la lista para no serializar la misma tarea varias veces."""
+        memo = getattr(self.parent, 'task_memo', None)
+        if memo is None:
+            return TaskMiniSerializer(instance.task).data
+        if instance.task_id not in memo:
+            memo[instance.task_id] = TaskMiniSerializer(instance.task).data
+        # En modo side-load la subtarea conserva solo el id y la tarea va en el mapa aparte
+        if self.context.get('sideload_tasks'):
+            return instance.task_id
+        return memo[instance.task_id]
+
+def subtask_values_renderer(serializer, task_memo, sideload=False):
+    """
+    ValuesRenderer de SubtaskSerializer que lee la tarea embebida de las columnas task__*.
+
+    Usa la misma memoización que SubtaskListSerializer sobre `task_memo`.
+    """
+    task_renderer = ValuesRenderer.compile(TaskMiniSerializer(), prefix='task__')
+
+    def task(row):
+        task_id = row['task']
+        if task_id not in task_memo:
+            task_memo[task_id] = task_renderer.render(row)
+        return task_id if sideload else task_memo[task_id]
+
+    return ValuesRenderer.compile(serializer, custom={'task': (['task', *task_renderer.sources], task)})
+
+class CalendarRangeSerializer(serializers.Serializer):
+    """Valida el rango ?from=&to= del endpoint de calendario."""
+    MAX_DAYS = 366
+
+    def get_fields(self):
+        # 'from' es palabra reservada: los campos se declaran aquí
+        return {
+            'from': serializers.DateField(),
+            'to': serializers.DateField(),
+        }
+
+    def validate(self, attrs):
+        if attrs['to'] < attrs['from']:
+            raise serializers.ValidationError({'to': "La fecha final no puede ser anterior a la inicial."})
+        if (attrs['to'] - attrs['from']).days >= self.MAX_DAYS:
+            raise serializers.ValidationError({'to': f"El rango no puede superar {self.MAX_DAYS} días."})
+        return attrs
+
+
+class ConflictProposalSerializer(serializers.Serializer):
+    """Subtarea hipotética para /api/subtasks/conflict-check/ (id solo si se está editando una existente)."""
+    id = serializers.IntegerField(required=False)
+    planification_date = serializers.DateField()
+    needed_hours = serializers.FloatField(min_value=0.0)
+
+
+class SubtaskChangesSerializer(serializers.ModelSerializer):
+    """Campos editables de una subtarea en PATCH /api/subtasks/bulk/."""
+
+    class Meta:
+        model = Subtask
+        fields = ['description', 'status', 'planification_date', 'needed_hours', 'note']
+
+
+class BulkSubtaskChangeSerializer(serializers.Serializer):
+    """Un elemento {id, changes} de PATCH /api/subtasks/bulk/."""
+    id = serializers.IntegerField()
+    changes = serializers.DictField()
+
+    def validate_changes(self, value):
+        unknown = set(value) - set(SubtaskChangesSerializer.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError(f"Campos no editables en bloque: {', '.join(sorted(unknown))}.")
+        if not value:
+            raise serializers.ValidationError("Debe incluir al menos un cambio.")
+        serializer = SubtaskChangesSerializer(data=value, partial=True)
+        serializer.is_valid(raise_exception=True)
+        return apply_note_rules(dict(serializer.validated_data))
@@ -0,0 +1,32 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from Apps.read_cache import bump_data_version
+from Apps.task.metrics import is_deferred, mark_dirty_days
+from Apps.task.models import Task
+from .models import Subtask, UserDayLoad
+
+
+def _deleted_with_task(origin):
+    """Indica si el borrado viene en cascada de una tarea (o un queryset de tareas)."""
+    return isinstance(origin, Task) or getattr(origin, 'model', None) is Task
+
+
+@receiver([post_save, post_delete], sender=Subtask)
+def invalidate_subtask_reads(sender, instance, origin=None, **kwargs):
+    # En el borrado en cascada de una tarea ya invalida la señal de la tarea
+    if _deleted_with_task(origin):
+        return
+    bump_data_version(instance.user_id)
+
+
+@receiver(post_delete, sender=Subtask)
+def release_day_load(sender, instance, origin=None, **kwargs):
+    # En cascada no corre Subtask.delete(): la carga diaria se descuenta aquí
+    if not _deleted_with_task(origin):
+        return
+    deltas = UserDayLoad.deltas_for(instance._metrics_values(), None)
+    if is_deferred():
+        mark_dirty_days(*deltas)
+    else:
+        UserDayLoad.apply_deltas(deltas)
@@ -402,3 +402,339 @@ def test_subtask_response_includes_task_info(api_client, test_task):
     assert isinstance(response.data["task"], dict)
     assert response.data["task"]["id"] == test_task.id
     assert response.data["task"]["title"] == "Test Task"
+
+
+@pytest.mark.django_db
+def test_calendar_groups_subtasks_by_day(api_client, test_user, django_assert_max_num_queries):
+    """Test resumen por día del calendario (GET /subtasks/calendar/?from=&to=)"""
+    from datetime import timedelta
+
+    today = timezone.localdate()
+    task = Task.objects.create(title="Calendario", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    first = Subtask.objects.create(task=task, description="A", planification_date=today, needed_hours=6.0)
+    second = Subtask.objects.create(task=task, description="B", planification_date=today, needed_hours=3.0)
+    Subtask.objects.create(
+        task=task, description="C", status="completed", planification_date=today + timedelta(days=1), needed_hours=2.0
+    )
+    Subtask.objects.create(task=task, description="Fuera", planification_date=today + timedelta(days=5), needed_hours=1.0)
+
+    api_client.force_authenticate(user=test_user)
+    with django_assert_max_num_queries(1):
+        response = api_client.get(
+            f"/api/subtasks/calendar/?from={today.isoformat()}&to={(today + timedelta(days=2)).isoformat()}"
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    days = response.data["days"]
+    assert [day["date"] for day in days] == [today, today + timedelta(days=1)]
+    assert days[0]["total_hours"] == 9.0
+    assert days[0]["counts"]["pending"] == 2
+    assert days[0]["overloaded"] is True
+    assert days[0]["subtask_ids"] == sorted([first.id, second.id])
+    assert days[1]["counts"]["completed"] == 1
+    assert days[1]["overloaded"] is False
+
+
+@pytest.mark.django_db
+def test_calendar_requires_valid_range(api_client, test_user):
+    """Test que el calendario exige un rango from/to válido"""
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.get("/api/subtasks/calendar/?from=2026-03-10&to=2026-03-01")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_today_buckets(api_client, test_user):
+    """Test grupos de la vista Hoy (GET /subtasks/today/)"""
+    from datetime import timedelta
+
+    today = timezone.localdate()
+    task = Task.objects.create(title="Hoy", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    Subtask.objects.create(task=task, description="Vencida", planification_date=today - timedelta(days=2), needed_hours=1.0)
+    Subtask.objects.create(task=task, description="Larga", planification_date=today, needed_hours=3.0)
+    Subtask.objects.create(task=task, description="Corta", planification_date=today, needed_hours=1.0)
+    Subtask.objects.create(
+        task=task, description="Pospuesta", status="postponed", planification_date=today - timedelta(days=1), needed_hours=2.0
+    )
+    Subtask.objects.create(
+        task=task, description="Hecha", status="completed", planification_date=today, needed_hours=5.0
+    )
+    for i in range(3):
+        Subtask.objects.create(
+            task=task, description=f"Próxima {i}", planification_date=today + timedelta(days=i + 1), needed_hours=1.0
+        )
+
+    api_client.force_authenticate(user=test_user)
+    response = api_client.get("/api/subtasks/today/?limit=2")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [s["description"] for s in response.data["overdue"]["results"]] == ["Vencida"]
+    assert [s["description"] for s in response.data["today"]["results"]] == ["Pospuesta", "Corta"]
+    assert response.data["today"]["count"] == 3
+    assert response.data["today"]["hours"] == 6.0
+    assert response.data["upcoming"]["count"] == 3
+    assert len(response.data["upcoming"]["results"]) == 2
+    assert response.data["capacity"]["planned_hours"] == 4.0
+    assert response.data["capacity"]["remaining_hours"] == test_user.daily_hours - 4.0
+
+
+@pytest.mark.django_db
+def test_conflict_check_projects_daily_load(api_client, test_user, django_assert_max_num_queries):
+    """Test chequeo de conflictos con subtareas hipotéticas (POST /subtasks/conflict-check/)"""
+    from datetime import timedelta
+
+    today = timezone.localdate()
+    task = Task.objects.create(title="Conflictos", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    existing = Subtask.objects.create(task=task, description="Existente", planification_date=today, needed_hours=6.0)
+    edited = Subtask.objects.create(task=task, description="Editada", planification_date=today, needed_hours=1.0)
+
+    api_client.force_authenticate(user=test_user)
+    data = [
+        {"planification_date": today.isoformat(), "needed_hours": 4.0, "id": edited.id},
+        {"planification_date": (today + timedelta(days=1)).isoformat(), "needed_hours": 2.0},
+    ]
+    with django_assert_max_num_queries(1):
+        response = api_client.post("/api/subtasks/conflict-check/", data, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["has_conflict"] is True
+    first, second = response.data["days"]
+    assert first["existing_hours"] == 6.0
+    assert first["projected_hours"] == 10.0
+    assert first["overflow_hours"] == 10.0 - test_user.daily_hours
+    assert [s["id"] for s in first["subtasks"]] == [existing.id]
+    assert second["conflict"] is False
+
+
+@pytest.mark.django_db
+def test_list_subtasks_cursor_pagination(api_client, test_user):
+    """Test paginación por cursor opcional (GET /subtasks/?page_size=2)"""
+    from datetime import timedelta
+
+    today = timezone.localdate()
+    task = Task.objects.create(title="Paginada", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    for i in range(5):
+        Subtask.objects.create(
+            task=task, description=f"Subtarea {i}", planification_date=today + timedelta(days=i % 2), needed_hours=1.0
+        )
+    api_client.force_authenticate(user=test_user)
+
+    seen = []
+    url = "/api/subtasks/?page_size=2"
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert "count" not in response.data
+        seen.extend(response.data["results"])
+        url = response.data["next"]
+        if seen and len(seen) == 2:
+            # Una inserción entre páginas no debe duplicar ni saltar filas ya vistas
+            Subtask.objects.create(task=task, description="Nueva", planification_date=today, needed_hours=1.0)
+
+    ids = [s["id"] for s in seen]
+    assert len(ids) == len(set(ids)) == 6
+    keys = [(s["planification_date"], s["created_at"], s["id"]) for s in seen]
+    assert keys == sorted(keys)
+
+    # Sin parámetros la respuesta sigue siendo la lista completa
+    assert isinstance(api_client.get("/api/subtasks/").data, list)
+
+
+@pytest.mark.django_db
+def test_list_subtasks_invalid_cursor(api_client, test_user):
+    """Test que un cursor corrupto devuelve 404"""
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.get("/api/subtasks/?cursor=no-es-un-cursor")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_list_subtasks_sparse_fields_skip_task_join(api_client, test_user):
+    """Test que ?fields= sin 'task' no hace join con la tarea"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    task = Task.objects.create(title="Proyección", due_date=timezone.now(), user=test_user)
+    Subtask.objects.create(task=task, description="Sub", planification_date=timezone.localdate(), needed_hours=1.0)
+    api_client.force_authenticate(user=test_user)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/api/subtasks/?fields=id,status,needed_hours")
+
+    assert response.data == [{"id": response.data[0]["id"], "status": "pending", "needed_hours": 1.0}]
+    assert len(queries) == 1
+    assert '"task_task"."title"' not in queries[-1]["sql"]
+
+
+@pytest.mark.django_db
+def test_list_subtasks_embeds_each_task_once(api_client, test_user):
+    """Test que la tarea embebida se reutiliza y que ?tasks=sideload la devuelve aparte"""
+    task = Task.objects.create(title="Compartida", due_date=timezone.now(), user=test_user)
+    for i in range(3):
+        Subtask.objects.create(task=task, description=f"Sub {i}", planification_date=timezone.localdate(), needed_hours=1.0)
+    api_client.force_authenticate(user=test_user)
+
+    embedded = api_client.get("/api/subtasks/").data
+    assert [item["task"]["id"] for item in embedded] == [task.id] * 3
+    assert embedded[0]["task"] == embedded[2]["task"]
+
+    response = api_client.get("/api/subtasks/?tasks=sideload")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["task"] for item in response.data["results"]] == [task.id] * 3
+    assert response.data["tasks"] == {task.id: embedded[0]["task"]}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["", "?tasks=sideload", "?page_size=2", "?fields=id,task,planification_date", "?omit=task&status=pending"])
+def test_list_subtasks_fast_rendering_is_identical(api_client, test_user, settings, query):
+    """Test que el listado desde values() produce exactamente los mismos bytes que los serializers"""
+    for i, title in enumerate(["Uno", "Dos"]):
+        task = Task.objects.create(title=title, due_date=timezone.now() + timezone.timedelta(days=5), user=test_user)
+        for j in range(2):
+            Subtask.objects.create(
+                task=task,
+                description=f"Sub {i}-{j}",
+                planification_date=timezone.localdate() + timezone.timedelta(days=j),
+                needed_hours=1.5,
+                note="nota" if j else None,
+            )
+    api_client.force_authenticate(user=test_user)
+
+    settings.READ_CACHE_ENABLED = False
+    settings.FAST_LIST_RENDERING = False
+    expected = api_client.get(f"/api/subtasks/{query}").content
+    settings.FAST_LIST_RENDERING = True
+    assert api_client.get(f"/api/subtasks/{query}").content == expected
+
+
+@pytest.mark.django_db
+def test_list_subtasks_etag_changes_on_subtask_write(api_client, test_task, settings):
+    """Test que el ETag del listado cambia al editar o borrar una subtarea"""
+    settings.READ_CACHE_ENABLED = True
+    subtask = Subtask.objects.create(task=test_task, description="Sub", planification_date=timezone.localdate(), needed_hours=1.0)
+    api_client.force_authenticate(user=test_task.user)
+
+    etag = api_client.get("/api/subtasks/?tasks=sideload")["ETag"]
+    response = api_client.get("/api/subtasks/?tasks=sideload", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    # Otra URL, otro ETag
+    assert api_client.get("/api/subtasks/")["ETag"] != etag
+
+    subtask.description = "Editada"
+    subtask.save()
+    response = api_client.get("/api/subtasks/?tasks=sideload", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+
+    etag = response["ETag"]
+    subtask.delete()
+    assert api_client.get("/api/subtasks/?tasks=sideload", HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_search_subtasks_ranked_and_synced(api_client, test_task):
+    """Test búsqueda de texto completo (GET /subtasks/search/?q=) por relevancia y sincronizada con las escrituras"""
+    other_user = get_user_model().objects.create_user(username="otro", email="otro@example.com", password="x")
+    other_task = Task.objects.create(title="Ajena", due_date=timezone.now(), user=other_user)
+    today = timezone.localdate()
+
+    best = Subtask.objects.create(
+        task=test_task, description="Informe de laboratorio", note="Revisar informe final", planification_date=today, needed_hours=1.0
+    )
+    other = Subtask.objects.create(task=test_task, description="Leer el informe", planification_date=today, needed_hours=1.0)
+    calc = Subtask.objects.create(task=test_task, description="Estudiar cálculo", planification_date=today, needed_hours=1.0)
+    Subtask.objects.create(task=other_task, description="Informe ajeno", planification_date=today, needed_hours=1.0)
+    api_client.force_authenticate(user=test_task.user)
+
+    response = api_client.get("/api/subtasks/search/?q=informe")
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data] == [best.id, other.id]
+
+    # Prefijos, sin tildes y todas las palabras
+    assert [item["id"] for item in api_client.get("/api/subtasks/search/?q=calculo estud").data] == [calc.id]
+    assert [item["id"] for item in api_client.get("/api/subtasks/search/?q=informe leer").data] == [other.id]
+
+    other.description = "Leer el resumen"
+    other.save()
+    assert [item["id"] for item in api_client.get("/api/subtasks/search/?q=informe").data] == [best.id]
+
+    best.delete()
+    assert api_client.get("/api/subtasks/search/?q=informe").data == []
+    assert api_client.get("/api/subtasks/search/?q=%20").status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_bulk_patch_subtasks(api_client, test_user, django_assert_max_num_queries):
+    """Test edición en bloque (PATCH /subtasks/bulk/): métricas y carga diaria una vez por tarea y día"""
+    from datetime import timedelta
+    from Apps.subtask.models import UserDayLoad
+
+    today = timezone.localdate()
+    tomorrow = today + timedelta(days=1)
+    tasks = [Task.objects.create(title=f"Bloque {i}", due_date=timezone.now() + timedelta(days=5), user=test_user) for i in range(2)]
+    subtasks = [
+        Subtask.objects.create(task=task, description=f"S{i}", planification_date=today, needed_hours=1.0)
+        for task in tasks for i in range(5)
+    ]
+
+    api_client.force_authenticate(user=test_user)
+    data = [{"id": subtask.id, "changes": {"status": "completed"}} for subtask in subtasks[:5]]
+    data += [{"id": subtask.id, "changes": {"planification_date": tomorrow.isoformat()}} for subtask in subtasks[5:]]
+    # Carga + bulk_update + métricas de las tareas + carga diaria + relectura, sin importar cuántas sean
+    with django_assert_max_num_queries(10):
+        response = api_client.patch("/api/subtasks/bulk/", data, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data] == [subtask.id for subtask in subtasks]
+    assert response.data[0]["task"]["status"] == Task.Status.COMPLETED
+    tasks[0].refresh_from_db()
+    assert (tasks[0].completed_count, tasks[0].progress) == (5, 100.0)
+    assert not UserDayLoad.objects.filter(user=test_user, date=today, subtask_count__gt=0).exists()
+    assert UserDayLoad.objects.get(user=test_user, date=tomorrow).planned_hours == 5.0
+
+
+@pytest.mark.django_db
+def test_bulk_patch_subtasks_all_or_nothing(api_client, test_user):
+    """Test que un error en cualquier elemento no escribe nada y se reporta por elemento"""
+    from datetime import timedelta
+
+    other = get_user_model().objects.create_user(username="otro", email="otro@example.com", password="x")
+    task = Task.objects.create(title="Propia", due_date=timezone.now() + timedelta(days=2), user=test_user)
+    foreign = Task.objects.create(title="Ajena", due_date=timezone.now() + timedelta(days=2), user=other)
+    mine = Subtask.objects.create(task=task, description="Mía", planification_date=timezone.localdate(), needed_hours=1.0)
+    theirs = Subtask.objects.create(task=foreign, description="Ajena", planification_date=timezone.localdate(), needed_hours=1.0)
+
+    api_client.force_authenticate(user=test_user)
+    late = (timezone.localdate() + timedelta(days=30)).isoformat()
+    response = api_client.patch("/api/subtasks/bulk/", [
+        {"id": mine.id, "changes": {"status": "completed"}},
+        {"id": mine.id, "changes": {"planification_date": late}},
+        {"id": theirs.id, "changes": {"status": "completed"}},
+    ], format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {1, 2}
+    assert "id" in response.data[1] and "id" in response.data[2]
+
+    response = api_client.patch("/api/subtasks/bulk/", [
+        {"id": mine.id, "changes": {"status": "completed"}},
+        {"id": mine.id + 1000, "changes": {"task": task.id}},
+    ], format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data) == {1}
+
+    # La fecha se valida contra el due_date de la tarea, en memoria
+    response = api_client.patch("/api/subtasks/bulk/", [{"id": mine.id, "changes": {"planification_date": late}}], format="json")
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "planification_date" in response.data[0]["changes"]
+
+    mine.refresh_from_db()
+    assert mine.status == Subtask.Status.PENDING
+
+    # La nota sin status explícito pospone, como en el PATCH individual
+    response = api_client.patch("/api/subtasks/bulk/", [{"id": mine.id, "changes": {"note": " Mañana "}}], format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert (response.data[0]["status"], response.data[0]["note"]) == ("postponed", "Mañana")
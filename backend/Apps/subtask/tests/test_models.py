@@ -174,3 +174,260 @@ def test_subtask_created_at_auto_set(test_task):
     
     assert subtask.created_at is not None
     assert before_creation <= subtask.created_at <= after_creation
+
+
+@pytest.mark.django_db
+def test_subtask_writes_keep_task_metrics_incremental(test_task):
+    """Test que crear, completar, cambiar horas y borrar mantiene las métricas de la tarea"""
+    first = Subtask.objects.create(
+        task=test_task,
+        description="Subtask 1",
+        planification_date=timezone.localdate(),
+        needed_hours=2.0,
+    )
+    second = Subtask.objects.create(
+        task=test_task,
+        description="Subtask 2",
+        planification_date=timezone.localdate(),
+        needed_hours=3.0,
+    )
+    assert (test_task.total_hours, test_task.subtask_count, test_task.completed_count) == (5.0, 2, 0)
+
+    first.status = Subtask.Status.COMPLETED
+    first.needed_hours = 4.0
+    first.save()
+    test_task.refresh_from_db()
+    assert test_task.total_hours == 7.0
+    assert test_task.completed_count == 1
+    assert test_task.progress == 50.0
+
+    second.delete()
+    test_task.refresh_from_db()
+    assert (test_task.total_hours, test_task.subtask_count, test_task.completed_count) == (4.0, 1, 1)
+    assert test_task.progress == 100.0
+    assert test_task.status == Task.Status.COMPLETED
+
+
+@pytest.mark.django_db
+def test_subtask_metrics_match_full_recompute(test_task):
+    """Test que los contadores incrementales coinciden con el recálculo completo"""
+    for i, status in enumerate([Subtask.Status.COMPLETED, Subtask.Status.PENDING, Subtask.Status.COMPLETED]):
+        Subtask.objects.create(
+            task=test_task,
+            description=f"Subtask {i}",
+            status=status,
+            planification_date=timezone.localdate(),
+            needed_hours=1.5 + i,
+        )
+    reopened = Subtask.objects.filter(task=test_task, status=Subtask.Status.COMPLETED).first()
+    reopened.status = Subtask.Status.IN_PROGRESS
+    reopened.save()
+
+    test_task.refresh_from_db()
+    incremental = [getattr(test_task, f) for f in Task.METRIC_FIELDS]
+    test_task.update_metrics()
+    test_task.refresh_from_db()
+
+    assert incremental == [getattr(test_task, f) for f in Task.METRIC_FIELDS]
+    assert test_task.status == Task.Status.IN_PROGRESS
+
+
+@pytest.mark.django_db
+def test_stale_double_save_counts_completion_once(test_task):
+    """Test que dos instancias cargadas antes de completar la misma subtarea no la cuentan dos veces"""
+    from Apps.subtask.models import UserDayLoad
+
+    today = timezone.localdate()
+    first = Subtask.objects.create(task=test_task, description="A", planification_date=today, needed_hours=2.0)
+    Subtask.objects.create(task=test_task, description="B", planification_date=today, needed_hours=1.0)
+
+    stale_a = Subtask.objects.get(pk=first.pk)
+    stale_b = Subtask.objects.get(pk=first.pk)
+    for stale in (stale_a, stale_b):
+        stale.status = Subtask.Status.COMPLETED
+        stale.save()
+
+    test_task.refresh_from_db()
+    assert (test_task.subtask_count, test_task.completed_count, test_task.progress) == (2, 1, 50.0)
+    assert test_task.status != Task.Status.COMPLETED
+    assert UserDayLoad.objects.get(user=test_task.user, date=today).planned_hours == 1.0
+
+
+@pytest.mark.django_db
+def test_double_delete_discounts_once(test_task):
+    """Test que borrar otra vez una subtarea ya borrada no descuenta de nuevo sus métricas"""
+    from Apps.subtask.models import UserDayLoad
+
+    today = timezone.localdate()
+    first = Subtask.objects.create(task=test_task, description="A", planification_date=today, needed_hours=3.0)
+    Subtask.objects.create(task=test_task, description="B", planification_date=today, needed_hours=2.0)
+
+    stale = Subtask.objects.get(pk=first.pk)
+    first.delete()
+    stale.delete()
+
+    test_task.refresh_from_db()
+    assert (test_task.total_hours, test_task.subtask_count) == (2.0, 1)
+    assert UserDayLoad.objects.get(user=test_task.user, date=today).planned_hours == 2.0
+
+
+@pytest.mark.django_db
+def test_deferred_metrics_recomputes_each_task_once(test_task):
+    """Test que dentro de deferred_metrics() la tarea se recalcula una sola vez al cerrar"""
+    from Apps.task.metrics import deferred_metrics
+
+    subtasks = [
+        Subtask.objects.create(
+            task=test_task,
+            description=f"Subtask {i}",
+            planification_date=timezone.localdate(),
+            needed_hours=1.0,
+        )
+        for i in range(3)
+    ]
+
+    with deferred_metrics():
+        for subtask in subtasks:
+            subtask.status = Subtask.Status.COMPLETED
+            subtask.save()
+        subtasks[0].delete()
+        test_task.refresh_from_db()
+        # Aún no se ha recalculado nada
+        assert test_task.completed_count == 0
+
+    test_task.refresh_from_db()
+    assert (test_task.total_hours, test_task.subtask_count, test_task.completed_count) == (2.0, 2, 2)
+    assert test_task.status == Task.Status.COMPLETED
+
+
+@pytest.mark.django_db
+def test_recompute_metrics_handles_tasks_without_subtasks(test_task):
+    """Test que el recálculo en bloque deja en cero una tarea sin subtareas"""
+    Task.objects.filter(pk=test_task.pk).update(
+        total_hours=9.0, subtask_count=3, completed_count=3, progress=100.0, status=Task.Status.COMPLETED
+    )
+
+    Task.recompute_metrics([test_task.pk])
+
+    test_task.refresh_from_db()
+    assert (test_task.total_hours, test_task.subtask_count, test_task.progress) == (0.0, 0, 0.0)
+    assert test_task.status == Task.Status.IN_PROGRESS
+
+
+@pytest.mark.django_db
+def test_user_day_load_follows_subtask_writes(test_user):
+    """Test que la carga diaria se mantiene al crear, mover, completar y borrar subtareas"""
+    from datetime import timedelta
+    from Apps.subtask.models import UserDayLoad
+
+    today = timezone.localdate()
+    tomorrow = today + timedelta(days=1)
+    task = Task.objects.create(title="Carga", due_date=timezone.now() + timedelta(days=5), user=test_user)
+
+    def load(day):
+        row = UserDayLoad.objects.filter(user=test_user, date=day).values_list('planned_hours', 'subtask_count').first()
+        return row or (0.0, 0)
+
+    first = Subtask.objects.create(task=task, description="A", planification_date=today, needed_hours=3.0)
+    second = Subtask.objects.create(task=task, description="B", planification_date=today, needed_hours=2.0)
+    assert load(today) == (5.0, 2)
+
+    second.planification_date = tomorrow
+    second.save()
+    assert load(today) == (3.0, 1)
+    assert load(tomorrow) == (2.0, 1)
+
+    first.status = Subtask.Status.COMPLETED
+    first.save()
+    assert load(today) == (0.0, 0)
+
+    second.delete()
+    assert load(tomorrow) == (0.0, 0)
+
+    UserDayLoad.rebuild(test_user.pk)
+    assert not UserDayLoad.objects.filter(user=test_user).exists()
+
+
+@pytest.mark.django_db
+def test_user_day_load_released_when_task_is_deleted(test_user):
+    """Test que borrar una tarea (sola o por queryset) descuenta la carga diaria de sus subtareas"""
+    from datetime import timedelta
+    from rest_framework.test import APIClient
+    from Apps.subtask.models import UserDayLoad
+
+    today = timezone.localdate()
+    due = timezone.now() + timedelta(days=5)
+    first = Task.objects.create(title="Una", due_date=due, user=test_user)
+    second = Task.objects.create(title="Otra", due_date=due, user=test_user)
+    Subtask.objects.create(task=first, description="A", planification_date=today, needed_hours=3.0)
+    Subtask.objects.create(task=second, description="B", planification_date=today, needed_hours=2.0)
+    assert UserDayLoad.objects.get(user=test_user, date=today).planned_hours == 5.0
+
+    client = APIClient()
+    client.force_authenticate(user=test_user)
+    assert client.delete(f"/api/task/{first.pk}/").status_code == 204
+    assert UserDayLoad.objects.get(user=test_user, date=today).planned_hours == 2.0
+
+    Task.objects.filter(pk=second.pk).delete()
+    assert UserDayLoad.objects.get(user=test_user, date=today).planned_hours == 0.0
+
+
+@pytest.mark.django_db
+def test_rebuild_day_loads_command_invalidates_read_cache(test_user):
+    """Test que rebuild_day_loads invalida las lecturas cacheadas del usuario"""
+    from django.core.management import call_command
+    from Apps.read_cache import data_version
+
+    version = data_version(test_user.pk)
+    call_command('rebuild_day_loads', '--user', str(test_user.pk))
+    assert data_version(test_user.pk) != version
+
+
+@pytest.mark.django_db
+def test_due_date_rule_uses_local_day_like_planner(test_user):
+    """Test que Subtask.clean y el planificador usan el mismo día de entrega cerca de medianoche"""
+    import datetime
+    from Apps.subtask.scheduling import load_plan_items
+
+    # 22:00 en TIME_ZONE es el día siguiente en UTC
+    due = timezone.make_aware(datetime.datetime(2099, 3, 10, 22, 0))
+    assert due.astimezone(datetime.timezone.utc).date() == datetime.date(2099, 3, 11)
+    task = Task.objects.create(title="Noche", due_date=due, user=test_user)
+    task = Task.objects.get(pk=task.pk)
+    assert task.due_day == datetime.date(2099, 3, 10)
+
+    with pytest.raises(ValidationError):
+        Subtask.objects.create(task=task, description="Tarde", planification_date="2099-03-11", needed_hours=1.0)
+    Subtask.objects.create(task=task, description="A tiempo", planification_date="2099-03-10", needed_hours=1.0)
+
+    [item] = load_plan_items(test_user, datetime.date(2099, 3, 1))
+    assert item.due_date == task.due_day
+
+
+@pytest.mark.django_db
+def test_subtask_owner_follows_task(test_user):
+    """Test que el dueño de la subtarea sigue a su tarea al crear, mover de tarea y reasignar la tarea"""
+    from datetime import timedelta
+    from Apps.subtask.models import UserDayLoad
+
+    other = get_user_model().objects.create_user(username="otro", email="otro@example.com", password="x")
+    today = timezone.localdate()
+    due = timezone.now() + timedelta(days=5)
+    mine = Task.objects.create(title="Mía", due_date=due, user=test_user)
+    theirs = Task.objects.create(title="Ajena", due_date=due, user=other)
+
+    subtask = Subtask.objects.create(task=mine, description="A", planification_date=today, needed_hours=3.0)
+    assert subtask.user_id == test_user.pk
+
+    subtask.task = theirs
+    subtask.save(update_fields=['task'])
+    assert Subtask.objects.get(pk=subtask.pk).user_id == other.pk
+    assert UserDayLoad.objects.get(user=other, date=today).planned_hours == 3.0
+    assert not UserDayLoad.objects.filter(user=test_user, date=today, subtask_count__gt=0).exists()
+
+    # Reasignar la tarea mueve sus subtareas y la carga diaria
+    theirs.user = test_user
+    theirs.save()
+    assert Subtask.objects.get(pk=subtask.pk).user_id == test_user.pk
+    assert UserDayLoad.objects.get(user=test_user, date=today).planned_hours == 3.0
+    assert not UserDayLoad.objects.filter(user=other, date=today, subtask_count__gt=0).exists()
@@ -0,0 +1,75 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Apps.query_plans import SUPPORTED_VENDORS, plan_problems
+from Apps.subtask.models import Subtask
+from Apps.task.models import Task
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor not in SUPPORTED_VENDORS, reason=f"Sin lectura de planes para {connection.vendor}."
+)
+
+
+@pytest.fixture
+def api_client(settings):
+    """Cliente autenticado con datos mínimos y sin caché de lecturas"""
+    settings.READ_CACHE_ENABLED = False
+    user = get_user_model().objects.create_user(username="plan", email="plan@example.com", password="x")
+    for i in range(3):
+        task = Task.objects.create(title=f"Tarea {i}", due_date=timezone.now() + timezone.timedelta(days=5), user=user)
+        subtask = Subtask.objects.create(task=task, description="Sub", planification_date=timezone.localdate(), needed_hours=1.0)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    client.subtask = subtask
+    return client
+
+
+def request_problems(api_client, method, url, data=None, allow_sort=()):
+    with CaptureQueriesContext(connection) as queries:
+        assert getattr(api_client, method)(url, data, format="json").status_code == 200
+    return {
+        query["sql"]: problems
+        for query in queries
+        if query["sql"].lstrip().upper().startswith("SELECT")
+        for problems in [plan_problems(query["sql"], allow_sort)]
+        if problems
+    }
+
+
+# El grupo "hoy" ordena por pospuestas primero y luego por horas: ese orden
+# calculado no sale de ningún índice.
+TODAY_ORDER = ("subtask_subtask",)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url, allow_sort", [
+    ("/api/subtasks/", ()),
+    ("/api/subtasks/?page_size=1", ()),
+    ("/api/subtasks/?include_archived=1&page_size=1", ()),
+    ("/api/subtasks/?status=pending&task=1", ()),
+    ("/api/subtasks/today/", TODAY_ORDER),
+    ("/api/subtasks/search/?q=sub", ("subtask_subtask_search",)),
+    ("/api/user/capacity-impact/", ()),
+])
+def test_subtask_read_query_plans(api_client, url, allow_sort):
+    """Test que las lecturas de subtareas usan índices y solo ordenan en memoria donde no hay alternativa"""
+    assert request_problems(api_client, "get", url, allow_sort=allow_sort) == {}
+
+
+@pytest.mark.django_db
+def test_subtask_calendar_and_detail_query_plans(api_client):
+    """Test planes del calendario y del detalle de una subtarea"""
+    today = timezone.localdate()
+    assert request_problems(api_client, "get", f"/api/subtasks/calendar/?from={today}&to={today}") == {}
+    assert request_problems(api_client, "get", f"/api/subtasks/{api_client.subtask.id}/") == {}
+
+
+@pytest.mark.django_db
+def test_conflict_check_query_plans(api_client):
+    """Test planes del chequeo de conflictos"""
+    payload = [{"planification_date": str(timezone.localdate()), "needed_hours": 2, "id": api_client.subtask.id}]
+    assert request_problems(api_client, "post", "/api/subtasks/conflict-check/", payload) == {}
@@ -0,0 +1,105 @@
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from Apps.subtask.models import Subtask, UserDayLoad
+from Apps.subtask.scheduling import PlanItem, plan_rebalance
+from Apps.task.models import Task
+
+START = datetime.date(2026, 3, 2)
+
+
+def day(offset):
+    return START + datetime.timedelta(days=offset)
+
+
+def test_plan_moves_least_urgent_to_next_free_day():
+    """Test que el día sobrecargado conserva lo urgente y mueve el resto al siguiente día libre"""
+    items = [
+        PlanItem(1, day(0), 4.0, day(0), "high"),
+        PlanItem(2, day(0), 3.0, day(5), "low"),
+        PlanItem(3, day(1), 4.0, day(5), "medium"),
+    ]
+
+    plan = plan_rebalance(items, capacity=6, start=START)
+
+    assert [(m.id, m.to_date) for m in plan.moves] == [(2, day(2))]
+    assert plan.unresolved == []
+
+
+def test_plan_never_moves_past_due_date():
+    """Test que una subtarea sin espacio antes de su entrega se busca hacia atrás o queda sin resolver"""
+    items = [
+        PlanItem(1, day(1), 5.0, day(1), "high"),
+        PlanItem(2, day(1), 3.0, day(1), "low"),
+        PlanItem(3, day(0), 6.0, day(0), "high"),
+    ]
+
+    plan = plan_rebalance(items, capacity=6, start=START)
+
+    assert plan.moves == []
+    assert plan.unresolved == [2]
+
+
+@pytest.mark.django_db
+def test_rebalance_endpoint_dry_run_and_apply():
+    """Test reprogramación (POST /user/rebalance/) en modo prueba y aplicando"""
+    user = get_user_model().objects.create_user(
+        username="rebalance.user", email="rebalance@example.com", password="testpass123", daily_hours=6,
+    )
+    today = timezone.localdate()
+    task = Task.objects.create(title="Rebalanceo", due_date=timezone.now() + datetime.timedelta(days=5), user=user)
+    Subtask.objects.create(task=task, description="A", planification_date=today, needed_hours=4.0)
+    moved = Subtask.objects.create(task=task, description="B", planification_date=today, needed_hours=4.0)
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+
+    response = client.post("/api/user/rebalance/", {}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["moves"] == [
+        {"id": moved.id, "from": today, "to": today + datetime.timedelta(days=1)}
+    ]
+    moved.refresh_from_db()
+    assert moved.planification_date == today
+
+    response = client.post("/api/user/rebalance/", {"apply": True}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    moved.refresh_from_db()
+    assert moved.planification_date == today + datetime.timedelta(days=1)
+    assert UserDayLoad.objects.get(user=user, date=today).planned_hours == 4.0
+
+
+def test_capacity_curve_counts_days_and_overflow():
+    """Test curva de capacidad: días en conflicto y horas sobrantes por cada valor candidato"""
+    from Apps.subtask.scheduling import capacity_curve
+
+    curve = {row["daily_hours"]: row for row in capacity_curve([2.0, 5.0, 9.0])}
+
+    assert (curve[1]["conflicting_days"], curve[1]["overflow_hours"]) == (3, 13.0)
+    assert (curve[5]["conflicting_days"], curve[5]["overflow_hours"]) == (1, 4.0)
+    assert (curve[9]["conflicting_days"], curve[9]["overflow_hours"]) == (0, 0.0)
+    assert len(curve) == 24
+
+
+@pytest.mark.django_db
+def test_capacity_impact_endpoint(django_assert_max_num_queries):
+    """Test GET /user/capacity-impact/ con una sola consulta"""
+    user = get_user_model().objects.create_user(
+        username="impact.user", email="impact@example.com", password="testpass123",
+    )
+    today = timezone.localdate()
+    task = Task.objects.create(title="Impacto", due_date=timezone.now() + datetime.timedelta(days=5), user=user)
+    Subtask.objects.create(task=task, description="A", planification_date=today, needed_hours=7.0)
+
+    client = APIClient()
+    client.force_authenticate(user=user)
+    with django_assert_max_num_queries(1):
+        response = client.get("/api/user/capacity-impact/")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["curve"][5] == {"daily_hours": 6, "conflicting_days": 1, "overflow_hours": 1.0}
@@ -1,8 +1,29 @@
-from rest_framework import viewsets
+from collections import defaultdict
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 from django_filters import rest_framework as filters
-from .models import Subtask
-from .serializers import SubtaskSerializer
+from Apps.archived import IncludeArchivedMixin
+from Apps.conditional import ConditionalGetMixin
+from Apps.fast_read import FastListMixin
+from Apps.pagination import KeysetPagination
+from Apps.read_cache import CachedReadMixin, bump_data_version, cached_read
+from Apps.search import SearchParamsSerializer, search
+from Apps.sparse_fields import SparseFieldsViewMixin
+from Apps.task.metrics import deferred_metrics, mark_dirty, mark_dirty_days
+from Apps.utils import ConcatIds, split_ids
+from .models import ArchivedSubtask, Subtask, UserDayLoad
+from .serializers import (
+    BulkSubtaskChangeSerializer,
+    CalendarRangeSerializer,
+    ConflictProposalSerializer,
+    SubtaskSerializer,
+    subtask_values_renderer,
+)
 
 
 class SubtaskFilter(filters.FilterSet):
@@ -49,11 +70,318 @@ class SubtaskFilter(filters.FilterSet):
         fields = ['planification_date', 'planification_date_gte', 'planification_date_lte', 'status', 'needed_hours', 'subject', 'type', 'priority', 'task', 'task_title', 'exclude_ids', 'note']
 
 
-class SubtaskViewSet(viewsets.ModelViewSet):
+class ArchivedSubtaskFilter(SubtaskFilter):
+    """Los mismos filtros sobre las subtareas archivadas (?include_archived=1)."""
+
+    class Meta(SubtaskFilter.Meta):
+        model = ArchivedSubtask
+
+
+class SideloadTasksMixin:
+    """
+    Listado de subtareas con ?tasks=sideload.
+
+    Va debajo de los mixins de ETag y caché para que la respuesta cacheada
+    incluya el mapa de tareas.
+    """
+
+    def sideload_tasks(self):
+        """?tasks=sideload: las tareas van una sola vez en un mapa aparte y cada subtarea conserva solo el id."""
+        return self.action == 'list' and self.request.query_params.get('tasks') == 'sideload'
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['sideload_tasks'] = self.sideload_tasks()
+        if self.sideload_tasks():
+            context['task_memo'] = self.task_memo
+        return context
+
+    def list(self, request, *args, **kwargs):
+        # Tareas ya serializadas en esta respuesta, por id
+        self.task_memo = {}
+        response = super().list(request, *args, **kwargs)
+        if not self.sideload_tasks() or response.status_code != status.HTTP_200_OK:
+            return response
+
+        if isinstance(response.data, list):
+            response.data = {"results": response.data}
+        response.data['tasks'] = self.task_memo
+        return response
+
+    def get_fast_renderer(self):
+        return subtask_values_renderer(self.get_serializer(), self.task_memo, sideload=self.sideload_tasks())
+
+
+class SubtaskViewSet(ConditionalGetMixin, CachedReadMixin, SideloadTasksMixin, IncludeArchivedMixin, FastListMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
+    # Tope por defecto y máximo de elementos por grupo en /subtasks/today/
+    TODAY_LIMIT = 50
+    TODAY_MAX_LIMIT = 200
+    # Máximo de elementos por PATCH /api/subtasks/bulk/
+    BULK_MAX_ITEMS = 500
+
     serializer_class = SubtaskSerializer
     permission_classes = [IsAuthenticated]
     filterset_class = SubtaskFilter
+    archived_model = ArchivedSubtask
+    archived_filterset_class = ArchivedSubtaskFilter
+    pagination_class = KeysetPagination
+    keyset_ordering = ('planification_date', 'created_at', 'id')
 
     def get_queryset(self):
-        return Subtask.objects.select_related('task').filter(task__user=self.request.user).order_by('planification_date', 'created_at')
-        
\ No newline at end of file
+        return self.shape_queryset(Subtask.objects.filter(user=self.request.user))
+
+    def get_archived_queryset(self):
+        return self.shape_queryset(super().get_archived_queryset().filter(user=self.request.user))
+
+    def shape_queryset(self, queryset):
+        queryset = queryset.order_by('planification_date', 'created_at')
+        if self.wants_field('task'):
+            queryset = queryset.select_related('task')
+        return self.restrict_queryset(queryset)
+
+    @action(detail=False, methods=['get'], url_path='calendar')
+    @cached_read
+    def calendar(self, request):
+        """
+        Resumen compacto por día para el calendario.
+        GET /api/subtasks/calendar/?from=YYYY-MM-DD&to=YYYY-MM-DD
+        """
+        params = CalendarRangeSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        # Una sola consulta agrupada por día
+        status_counts = {
+            value: Count('id', filter=Q(status=value)) for value in Subtask.Status.values
+        }
+        rows = Subtask.objects.filter(
+            user=request.user,
+            planification_date__gte=params.validated_data['from'],
+            planification_date__lte=params.validated_data['to'],
+        ).order_by('planification_date').values('planification_date').annotate(
+            total_hours=Sum('needed_hours'),
+            active_hours=Sum('needed_hours', filter=Q(status__in=Subtask.ACTIVE_STATUSES)),
+            ids=ConcatIds('id'),
+            **status_counts,
+        )
+
+        daily_hours = request.user.daily_hours
+        days = [
+            {
+                "date": row['planification_date'],
+                "total_hours": row['total_hours'],
+                "active_hours": row['active_hours'] or 0.0,
+                "counts": {value: row[value] for value in Subtask.Status.values},
+                "overloaded": (row['active_hours'] or 0.0) > daily_hours,
+                "subtask_ids": split_ids(row['ids']),
+            }
+            for row in rows
+        ]
+        return Response({"daily_hours": daily_hours, "days": days}, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='search')
+    @cached_read
+    def search(self, request):
+        """
+        Búsqueda de texto completo en descripción y nota, ordenada por relevancia.
+        GET /api/subtasks/search/?q=informe&limit=20
+        """
+        params = SearchParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        results = search(self.get_queryset(), params.validated_data['q'], params.validated_data['limit'])
+        return Response(self.get_serializer(results, many=True).data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='today')
+    @cached_read
+    def today(self, request):
+        """
+        Grupos de la vista Hoy (vencidas, hoy y próximas) ya ordenados y acotados.
+        GET /api/subtasks/today/?limit=50
+        Acepta los mismos filtros que el listado (subject, type, status, ...).
+        """
+        try:
+            limit = int(request.query_params.get('limit', self.TODAY_LIMIT))
+        except ValueError:
+            limit = self.TODAY_LIMIT
+        limit = max(1, min(limit, self.TODAY_MAX_LIMIT))
+
+        today = timezone.localdate()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        if 'status' in request.query_params:
+            # Con un estado explícito no se aplican las reglas de agrupación por estado
+            buckets = {
+                'overdue': Q(planification_date__lt=today),
+                'today': Q(planification_date=today),
+                'upcoming': Q(planification_date__gt=today),
+            }
+        else:
+            # Mismas reglas que la vista Hoy: las pospuestas se muestran en "hoy"
+            active = Q(status__in=Subtask.ACTIVE_STATUSES)
+            buckets = {
+                'overdue': Q(planification_date__lt=today) & active,
+                'today': (Q(planification_date=today) & active) | Q(status=Subtask.Status.POSTPONED),
+                'upcoming': Q(planification_date__gt=today) & active,
+            }
+
+        # Totales de los tres grupos en una sola consulta
+        totals = {}
+        for name, condition in buckets.items():
+            totals[f'{name}_count'] = Count('id', filter=condition)
+            totals[f'{name}_hours'] = Sum('needed_hours', filter=condition)
+        totals = queryset.order_by().aggregate(**totals)
+
+        orderings = {
+            'overdue': ('planification_date', 'created_at'),
+            # Pospuestas primero y luego las más cortas
+            'today': (
+                Case(When(status=Subtask.Status.POSTPONED, then=Value(0)), default=Value(1), output_field=IntegerField()),
+                'needed_hours',
+                'planification_date',
+                'created_at',
+            ),
+            'upcoming': ('planification_date', 'created_at'),
+        }
+
+        data = {}
+        for name, condition in buckets.items():
+            items = queryset.filter(condition).order_by(*orderings[name])[:limit]
+            data[name] = {
+                "count": totals[f'{name}_count'],
+                "hours": totals[f'{name}_hours'] or 0.0,
+                "results": SubtaskSerializer(items, many=True).data,
+            }
+
+        # Capacidad del día: búsqueda puntual en la carga diaria materializada
+        planned = UserDayLoad.objects.filter(user=request.user, date=today).values_list('planned_hours', flat=True).first() or 0.0
+        data["capacity"] = {
+            "daily_hours": request.user.daily_hours,
+            "planned_hours": planned,
+            "remaining_hours": request.user.daily_hours - planned,
+        }
+        data["date"] = today
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='conflict-check')
+    def conflict_check(self, request):
+        """
+        Proyecta la carga de cada día si se guardaran las subtareas propuestas.
+        POST /api/subtasks/conflict-check/
+        Body: una propuesta o una lista [{planification_date, needed_hours, id?}, ...]
+        """
+        many = isinstance(request.data, list)
+        serializer = ConflictProposalSerializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        proposals = serializer.validated_data if many else [serializer.validated_data]
+
+        proposed_hours = defaultdict(float)
+        for proposal in proposals:
+            proposed_hours[proposal['planification_date']] += proposal['needed_hours']
+        # Las subtareas que se están editando se reemplazan por su propuesta
+        edited_ids = [proposal['id'] for proposal in proposals if proposal.get('id')]
+
+        # Una sola consulta para todas las fechas del lote
+        competing = Subtask.objects.filter(
+            user=request.user,
+            planification_date__in=proposed_hours.keys(),
+            status__in=Subtask.ACTIVE_STATUSES,
+        ).exclude(id__in=edited_ids).order_by('planification_date', 'created_at').values(
+            'id', 'description', 'status', 'needed_hours', 'planification_date', 'task_id', 'task__title',
+        )
+
+        competing_by_date = defaultdict(list)
+        for row in competing:
+            competing_by_date[row['planification_date']].append({
+                "id": row['id'],
+                "description": row['description'],
+                "status": row['status'],
+                "needed_hours": row['needed_hours'],
+                "task_id": row['task_id'],
+                "task_title": row['task__title'],
+            })
+
+        daily_hours = request.user.daily_hours
+        days = []
+        for day in sorted(proposed_hours):
+            existing = sum(item['needed_hours'] for item in competing_by_date[day])
+            projected = existing + proposed_hours[day]
+            days.append({
+                "date": day,
+                "existing_hours": existing,
+                "proposed_hours": proposed_hours[day],
+                "projected_hours": projected,
+                "overflow_hours": max(projected - daily_hours, 0.0),
+                "conflict": projected > daily_hours,
+                "subtasks": competing_by_date[day],
+            })
+
+        return Response({
+            "daily_hours": daily_hours,
+            "has_conflict": any(day["conflict"] for day in days),
+            "days": days,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['patch'], url_path='bulk')
+    def bulk(self, request):
+        """
+        Edita varias subtareas en una sola transacción: se aplican todas o ninguna.
+        PATCH /api/subtasks/bulk/
+        Body: [{"id": 1, "changes": {"status": "completed"}}, {"id": 2, "changes": {"planification_date": "2026-05-02"}}]
+        Si algo falla responde 400 con los errores por posición en el cuerpo, como DRF: {índice: errores}.
+        """
+        serializer = BulkSubtaskChangeSerializer(
+            data=request.data, many=True, allow_empty=False, max_length=self.BULK_MAX_ITEMS,
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        items = serializer.validated_data
+        ids = [item['id'] for item in items]
+
+        with deferred_metrics():
+            # Una consulta autoriza todos los ids y trae la tarea de cada uno para validar fechas
+            subtasks = Subtask.objects.select_for_update(of=('self',)).select_related('task').filter(
+                user=request.user,
+            ).in_bulk(ids)
+
+            errors = {}
+            seen = set()
+            fields = {'updated_at'}
+            days = set()
+            now = timezone.now()
+            for index, item in enumerate(items):
+                subtask = subtasks.get(item['id'])
+                if item['id'] in seen:
+                    errors[index] = {'id': ["La subtarea aparece más de una vez en el lote."]}
+                    continue
+                seen.add(item['id'])
+                if subtask is None:
+                    errors[index] = {'id': ["Subtarea no encontrada."]}
+                    continue
+
+                days.add((subtask.user_id, subtask.planification_date))
+                for name, value in item['changes'].items():
+                    setattr(subtask, name, value)
+                subtask.updated_at = now
+                try:
+                    # Mismas reglas que save(), en memoria: la FK ya viene cargada
+                    subtask.clean_fields(exclude=['task', 'user'])
+                    subtask.clean()
+                except DjangoValidationError as exc:
+                    errors[index] = {'changes': exc.message_dict}
+                    continue
+                fields.update(item['changes'])
+                days.add((subtask.user_id, subtask.planification_date))
+
+            if errors:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+            Subtask.objects.bulk_update(subtasks.values(), sorted(fields))
+            # Cada tarea y cada día afectado se recalcula una sola vez al cerrar el bloque
+            mark_dirty(*{subtask.task_id for subtask in subtasks.values()})
+            mark_dirty_days(*days)
+            # bulk_update no emite señales
+            bump_data_version(request.user.pk)
+
+        # Relectura con las métricas ya recalculadas de cada tarea
+        updated = Subtask.objects.select_related('task').in_bulk(ids)
+        return Response(SubtaskSerializer([updated[pk] for pk in ids], many=True).data, status=status.HTTP_200_OK)
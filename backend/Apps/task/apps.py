@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TaskConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Apps.task'
+
+    def ready(self):
+        # Invalida el caché de lecturas en cada escritura
+        from . import signals  # noqa: F401
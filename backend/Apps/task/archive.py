@@ -0,0 +1,69 @@
+"""
+Archivo de tareas completadas o inactivas.
+
+archive_tasks() mueve por lotes las tareas viejas (y sus subtareas) de
+task_task/subtask_subtask a archivedtask/archivedsubtask, para que los
+listados, filtros y agregados del día a día recorran solo las filas vivas.
+Cada lote es una transacción: copia, borra los originales y reconstruye la
+carga diaria de los días afectados.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from Apps.read_cache import bump_data_version
+from Apps.subtask.models import ArchivedSubtask, Subtask
+from Apps.task.metrics import deferred_metrics, mark_dirty_days
+from Apps.task.models import ArchivedTask, Task
+
+DEFAULT_DAYS = 90
+DEFAULT_CHUNK_SIZE = 500
+
+TASK_COLUMNS = [field.attname for field in Task._meta.concrete_fields]
+SUBTASK_COLUMNS = [field.attname for field in Subtask._meta.concrete_fields]
+
+
+def archivable(days=DEFAULT_DAYS, now=None):
+    """Tareas completadas o inactivas sin cambios en los últimos `days` días."""
+    cutoff = (now or timezone.now()) - datetime.timedelta(days=days)
+    return Task.objects.filter(Q(status=Task.Status.COMPLETED) | Q(is_active=False), updated_at__lt=cutoff)
+
+
+def archive_chunk(tasks, now=None):
+    """Mueve al archivo las tareas del queryset `tasks` con sus subtareas. Devuelve cuántas movió."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        # Bloquea las tareas (nadie agrega subtareas mientras se copian) y
+        # vuelve a evaluar el filtro por si alguna cambió desde que se eligió
+        tasks = list(tasks.select_for_update().order_by().values(*TASK_COLUMNS))
+        if not tasks:
+            return 0
+        ids = [row['id'] for row in tasks]
+        subtasks = list(Subtask.objects.filter(task_id__in=ids).order_by().values(*SUBTASK_COLUMNS))
+
+        ArchivedTask.objects.bulk_create([ArchivedTask(archived_at=now, **row) for row in tasks])
+        ArchivedSubtask.objects.bulk_create([ArchivedSubtask(**row) for row in subtasks])
+
+        with deferred_metrics():
+            # Las subtareas pendientes dejan de ocupar capacidad
+            mark_dirty_days(*{
+                (row['user_id'], row['planification_date'])
+                for row in subtasks if row['status'] in Subtask.ACTIVE_STATUSES
+            })
+            Task.objects.filter(pk__in=ids).delete()
+
+        bump_data_version(*{row['user_id'] for row in tasks})
+    return len(tasks)
+
+
+def archive_tasks(days=DEFAULT_DAYS, chunk_size=DEFAULT_CHUNK_SIZE, now=None):
+    """Archiva por lotes de `chunk_size` todas las tareas archivables. Devuelve el total movido."""
+    now = now or timezone.now()
+    total = 0
+    while True:
+        ids = list(archivable(days, now).order_by('pk').values_list('pk', flat=True)[:chunk_size])
+        if not ids:
+            return total
+        total += archive_chunk(archivable(days, now).filter(pk__in=ids), now)
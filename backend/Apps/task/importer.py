@@ -0,0 +1,259 @@
+"""
+Importación masiva de tareas y subtareas desde CSV o JSON Lines.
+
+Cada fila es una subtarea con las columnas de su tarea; las filas con la
+misma clave `task` (o, si no viene, el mismo título y entrega) van a la misma
+tarea, que se crea con la primera. Una fila sin `subtask` crea solo la tarea.
+
+    task,title,due_date,priority,subject,type,description,subtask,planification_date,needed_hours,status,note
+
+El archivo se lee como stream (una fila a la vez) y se inserta con
+bulk_create por lotes, así que la memoria no depende del tamaño del archivo.
+Cada fila se valida con las reglas de los modelos (clean_fields y
+Subtask.clean contra el due_date). La importación es todo o nada: si alguna
+fila falla se deshace y se informa el error por fila.
+"""
+import codecs
+import csv
+import json
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from Apps.read_cache import bump_data_version
+from Apps.subtask.models import Subtask, UserDayLoad
+from Apps.task.models import Task
+
+FORMATS = ('csv', 'jsonl')
+TASK_COLUMNS = ('title', 'due_date', 'priority', 'subject', 'type', 'description')
+SUBTASK_COLUMNS = {
+    'subtask': 'description',
+    'planification_date': 'planification_date',
+    'needed_hours': 'needed_hours',
+    'status': 'status',
+    'note': 'note',
+}
+DEFAULT_CHUNK_SIZE = 2000
+# Errores que se detallan en el reporte; el resto solo se cuenta
+MAX_REPORTED_ERRORS = 100
+NOT_UTF8 = "El archivo debe estar codificado en UTF-8 (p. ej., «CSV UTF-8» en la planilla)."
+
+
+class ImportRollback(Exception):
+    """Deshace la transacción de una importación con errores o en modo prueba."""
+
+
+@dataclass
+class ImportReport:
+    dry_run: bool = False
+    rows: int = 0
+    tasks: int = 0
+    subtasks: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    @property
+    def imported(self):
+        return not self.dry_run and not self.error_count
+
+    def as_dict(self):
+        return {
+            "dry_run": self.dry_run,
+            "imported": self.imported,
+            "rows": self.rows,
+            "tasks": self.tasks,
+            "subtasks": self.subtasks,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+def detect_format(filename):
+    """'csv' o 'jsonl' según la extensión del archivo, o None."""
+    name = (filename or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return None
+
+
+def read_rows(stream, file_format):
+    """
+    Itera (número de línea, fila) de un stream binario sin cargarlo entero.
+
+    Una línea que no se puede leer llega como una excepción en lugar de la fila.
+    """
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    return _csv_rows(lines) if file_format == 'csv' else _jsonl_rows(lines)
+
+
+def _csv_rows(lines):
+    reader = csv.DictReader(lines)
+    try:
+        for row in reader:
+            yield reader.line_num, row
+    except UnicodeDecodeError:
+        # El decodificador no puede seguir: se informa y se corta la lectura
+        yield reader.line_num + 1, ValueError(NOT_UTF8)
+    except csv.Error as exc:
+        yield reader.line_num, ValueError(f"CSV inválido: {exc}.")
+
+
+def _jsonl_rows(lines):
+    number = 0
+    try:
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else ValueError("La línea no es un objeto JSON.")
+    except UnicodeDecodeError:
+        yield number + 1, ValueError(NOT_UTF8)
+
+
+def _values(row, columns):
+    """
+    Valores presentes (no vacíos) de `row` para `columns`, con su nombre en el modelo.
+
+    Los números de JSON pasan a texto, como llegan en un CSV; otros tipos
+    (listas, objetos, booleanos) se rechazan con ValidationError.
+    """
+    if isinstance(columns, tuple):
+        columns = dict(zip(columns, columns))
+    values, errors = {}, {}
+    for column, name in columns.items():
+        value = row.get(column)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = str(value)
+        elif value is not None and not isinstance(value, str):
+            errors[column] = ["Debe ser un texto o un número."]
+            continue
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, ''):
+            values[name] = value
+    if errors:
+        raise ValidationError(errors)
+    return values
+
+
+def _build_task(user, values):
+    task = Task(user=user, **values)
+    task.clean_fields(exclude=['user'])
+    if timezone.is_naive(task.due_date):
+        task.due_date = timezone.make_aware(task.due_date)
+    return task
+
+
+def _build_subtask(task, values):
+    subtask = Subtask(task=task, user_id=task.user_id, **values)
+    subtask.clean_fields(exclude=['task', 'user'])
+    # Misma regla que al guardar: la fecha no puede pasar la entrega de la tarea
+    subtask.clean()
+    return subtask
+
+
+def import_rows(rows, user, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Importa las filas (número, fila) para `user` y devuelve un ImportReport.
+
+    Las tareas y subtareas pendientes se insertan cada `chunk_size`
+    subtareas. Las métricas de cada tarea se acumulan en memoria y viajan en
+    su INSERT; solo las subtareas que llegan después de insertar su tarea se
+    aplican al final como delta. La carga diaria se reconstruye una vez.
+    """
+    report = ImportReport(dry_run=dry_run)
+    # Clave de la tarea -> Task (ya insertada o pendiente) o el número de la fila que la invalidó
+    tasks = {}
+    pending_tasks, pending_subtasks = [], []
+    # pk de tarea ya insertada -> [horas, subtareas, completadas] que llegaron después
+    late = {}
+    dates = set()
+
+    def flush():
+        if not dry_run and not report.error_count:
+            Task.objects.bulk_create(pending_tasks)
+            # Las subtareas toman el id de su tarea recién insertada
+            Subtask.objects.bulk_create(pending_subtasks)
+        pending_tasks.clear()
+        pending_subtasks.clear()
+
+    try:
+        with transaction.atomic():
+            for number, row in rows:
+                report.rows += 1
+                if isinstance(row, Exception):
+                    report.add_error(number, {"row": [str(row)]})
+                    continue
+
+                try:
+                    task_values = _values(row, TASK_COLUMNS)
+                    key = _values(row, ('task',)).get('task') or (task_values.get('title'), task_values.get('due_date'))
+                    subtask_values = _values(row, SUBTASK_COLUMNS)
+                except ValidationError as exc:
+                    report.add_error(number, exc.message_dict)
+                    continue
+                task = tasks.get(key)
+                if task is None:
+                    try:
+                        task = tasks[key] = _build_task(user, task_values)
+                    except ValidationError as exc:
+                        tasks[key] = number
+                        report.add_error(number, exc.message_dict)
+                        continue
+                    pending_tasks.append(task)
+                    report.tasks += 1
+                elif not isinstance(task, Task):
+                    report.add_error(number, {"task": [f"La tarea de esta fila es inválida (fila {task})."]})
+                    continue
+
+                if not subtask_values:
+                    continue
+                try:
+                    subtask = _build_subtask(task, subtask_values)
+                except ValidationError as exc:
+                    report.add_error(number, exc.message_dict)
+                    continue
+                pending_subtasks.append(subtask)
+                report.subtasks += 1
+                completed = int(subtask.status == Subtask.Status.COMPLETED)
+                if task.pk is None:
+                    task.set_metrics(task.total_hours + subtask.needed_hours,
+                                     task.subtask_count + 1, task.completed_count + completed)
+                else:
+                    delta = late.setdefault(task.pk, [0.0, 0, 0])
+                    delta[0] += subtask.needed_hours
+                    delta[1] += 1
+                    delta[2] += completed
+                if subtask.status in Subtask.ACTIVE_STATUSES:
+                    dates.add(subtask.planification_date)
+                if len(pending_subtasks) >= chunk_size or len(pending_tasks) >= chunk_size:
+                    flush()
+            flush()
+
+            if not report.imported:
+                raise ImportRollback
+
+            for task_id, (hours, count, completed) in late.items():
+                Task.apply_subtask_delta(task_id, hours, count, completed)
+            # bulk_create no actualiza la carga diaria: una pasada al final
+            UserDayLoad.rebuild(user.pk, dates)
+            bump_data_version(user.pk)
+    except ImportRollback:
+        pass
+    return report
+
+
+def import_file(stream, file_format, user, dry_run=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    return import_rows(read_rows(stream, file_format), user, dry_run=dry_run, chunk_size=chunk_size)
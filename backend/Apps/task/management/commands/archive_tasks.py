@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from Apps.task.archive import DEFAULT_CHUNK_SIZE, DEFAULT_DAYS, archivable, archive_tasks
+
+
+class Command(BaseCommand):
+    help = "Mueve al archivo las tareas completadas o inactivas sin cambios en los últimos N días, con sus subtareas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=DEFAULT_DAYS)
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Solo cuenta las tareas que se archivarían.")
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            total = archivable(options['days']).count()
+            self.stdout.write(f"{total} tareas para archivar.")
+            return
+
+        total = archive_tasks(options['days'], options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"{total} tareas archivadas."))
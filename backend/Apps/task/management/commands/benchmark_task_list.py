@@ -0,0 +1,95 @@
+import datetime
+import json
+import random
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from Apps.subtask.models import Subtask
+from Apps.task.models import Task
+from Apps.task.views import TaskViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide GET /api/task/ (TaskViewSet.list) sobre filas reales en la BD, con y sin "
+        "FAST_LIST_RENDERING, para cada modo de ?subtasks=. Los datos se crean en una "
+        "transacción que se deshace al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help="Cantidad de tareas.")
+        parser.add_argument('--per-task', type=int, default=5, help="Subtareas por tarea.")
+        parser.add_argument('--modes', nargs='+', default=list(TaskViewSet.SUBTASK_MODES))
+        parser.add_argument('--seed', type=int, default=42)
+
+    def build(self, size, per_task, rng):
+        """Usuario con `size` tareas y `per_task` subtareas por tarea, insertados por lotes."""
+        user = get_user_model().objects.create_user(
+            username=f"benchmark-{uuid.uuid4().hex[:12]}", email="benchmark@example.com", password=None,
+        )
+        now = timezone.now()
+        tasks = Task.objects.bulk_create([
+            Task(
+                title=f"Tarea {i}",
+                due_date=now + datetime.timedelta(days=30),
+                priority=rng.choice(Task.Priority.values),
+                user=user,
+                total_hours=per_task,
+                subtask_count=per_task,
+            )
+            for i in range(size)
+        ], batch_size=2000)
+        Subtask.objects.bulk_create([
+            Subtask(
+                task=task,
+                user=user,
+                description=f"Subtarea {j} de {task.title}",
+                status=rng.choice(Subtask.Status.values),
+                planification_date=now.date() + datetime.timedelta(days=rng.randrange(30)),
+                needed_hours=1.0,
+            )
+            for task in tasks
+            for j in range(per_task)
+        ], batch_size=2000)
+        return user
+
+    def measure(self, user, mode, fast):
+        """(ms, consultas, JSON decodificado) de una petición de listado renderizada."""
+        request = APIRequestFactory().get('/api/task/', {'subtasks': mode})
+        force_authenticate(request, user=user)
+        view = TaskViewSet.as_view({'get': 'list'})
+        with override_settings(FAST_LIST_RENDERING=fast, READ_CACHE_ENABLED=False):
+            with CaptureQueriesContext(connection) as queries:
+                began = time.perf_counter()
+                response = view(request)
+                content = response.render().content
+                elapsed = time.perf_counter() - began
+        return elapsed * 1000, len(queries), json.loads(content)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        for size in options['sizes']:
+            with transaction.atomic():
+                user = self.build(size, options['per_task'], rng)
+                timings = []
+                for mode in options['modes']:
+                    slow_ms, slow_queries, slow = self.measure(user, mode, fast=False)
+                    fast_ms, fast_queries, fast = self.measure(user, mode, fast=True)
+                    timings.append(
+                        f"{mode}: serializer {slow_ms:8.1f} ms ({slow_queries} consultas), "
+                        f"values() {fast_ms:8.1f} ms ({fast_queries} consultas)"
+                        + ("" if slow == fast else "  [SALIDA DISTINTA]")
+                    )
+                transaction.set_rollback(True)
+
+            self.stdout.write(f"{size:>7} tareas ({size * options['per_task']} subtareas)")
+            for line in timings:
+                self.stdout.write(f"    {line}")
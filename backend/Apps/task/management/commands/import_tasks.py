@@ -0,0 +1,39 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from Apps.task.importer import DEFAULT_CHUNK_SIZE, FORMATS, detect_format, import_file
+
+
+class Command(BaseCommand):
+    help = "Importa tareas y subtareas de un archivo CSV o JSON Lines para un usuario."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', type=int, required=True, help="Id del usuario dueño de las tareas.")
+        parser.add_argument('--format', choices=FORMATS, help="Por defecto según la extensión del archivo.")
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help="Solo valida, no guarda nada.")
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or detect_format(options['path'])
+        if file_format is None:
+            raise CommandError("No se pudo deducir el formato: use --format csv|jsonl.")
+        try:
+            user = get_user_model().objects.get(pk=options['user'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No existe el usuario {options['user']}.")
+
+        with open(options['path'], 'rb') as stream:
+            report = import_file(stream, file_format, user, dry_run=options['dry_run'], chunk_size=options['chunk_size'])
+
+        for error in report.errors:
+            self.stderr.write(f"Fila {error['row']}: {json.dumps(error['errors'], ensure_ascii=False)}")
+        summary = f"{report.rows} filas, {report.tasks} tareas, {report.subtasks} subtareas, {report.error_count} errores."
+        if report.imported:
+            self.stdout.write(self.style.SUCCESS(f"Importado: {summary}"))
+        elif report.dry_run and not report.error_count:
+            self.stdout.write(f"Prueba sin errores: {summary}")
+        else:
+            raise CommandError(f"No se importó nada: {summary}")
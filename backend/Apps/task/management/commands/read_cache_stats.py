@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from Apps import read_cache
+
+
+class Command(BaseCommand):
+    help = "Muestra los aciertos y fallos del caché de lecturas por usuario."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help="Pone los contadores en cero después de mostrarlos.")
+
+    def handle(self, *args, **options):
+        stats = read_cache.stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total * 100 if total else 0.0
+        self.stdout.write(f"Aciertos: {stats['hits']}, fallos: {stats['misses']} ({ratio:.1f}% de aciertos)")
+        if options['reset']:
+            read_cache.reset_stats()
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from Apps.read_cache import bump_data_version
+from Apps.task.models import Task
+
+
+class Command(BaseCommand):
+    help = "Recalcula de forma exacta horas, contadores y progreso de las tareas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, help="Solo las tareas de este usuario (id).")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        tasks = Task.objects.order_by('pk')
+        if options['user']:
+            tasks = tasks.filter(user_id=options['user'])
+
+        total = 0
+        batch = []
+        for task_id in tasks.values_list('pk', flat=True).iterator(chunk_size=options['batch_size']):
+            batch.append(task_id)
+            if len(batch) >= options['batch_size']:
+                Task.recompute_metrics(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            Task.recompute_metrics(batch)
+            total += len(batch)
+
+        # bulk_update no emite señales: se invalidan las lecturas cacheadas a mano
+        bump_data_version(*tasks.values_list('user_id', flat=True).distinct())
+        self.stdout.write(self.style.SUCCESS(f"Métricas recalculadas para {total} tareas."))
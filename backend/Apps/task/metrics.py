@@ -0,0 +1,58 @@
+"""
+Recálculo diferido de métricas de tareas y de carga diaria.
+
+Dentro de ``deferred_metrics()`` las escrituras de subtareas solo marcan su tarea
+(y sus días de carga) como sucios; al cerrar el bloque se recalcula cada tarea y
+cada día marcado una sola vez, dentro de la misma transacción.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.apps import apps
+from django.db import transaction
+
+_dirty = ContextVar('dirty_metrics', default=None)
+
+
+def is_deferred():
+    """Indica si estamos dentro de un bloque deferred_metrics()."""
+    return _dirty.get() is not None
+
+
+def mark_dirty(*task_ids):
+    """Registra tareas cuyas métricas deben recalcularse al cerrar el bloque."""
+    _dirty.get()['tasks'].update(task_id for task_id in task_ids if task_id is not None)
+
+
+def mark_dirty_days(*pairs):
+    """Registra pares (user_id, fecha) cuya carga diaria debe reconstruirse al cerrar el bloque."""
+    _dirty.get()['days'].update(pairs)
+
+
+@contextmanager
+def deferred_metrics():
+    """
+    Abre una transacción y agrupa los recálculos de métricas hasta su cierre.
+
+    Los bloques anidados se unen al exterior, que es el único que recalcula.
+    """
+    if is_deferred():
+        with transaction.atomic():
+            yield
+        return
+
+    Task = apps.get_model('task', 'Task')
+    UserDayLoad = apps.get_model('subtask', 'UserDayLoad')
+
+    token = _dirty.set({'tasks': set(), 'days': set()})
+    try:
+        with transaction.atomic():
+            yield
+            dirty = _dirty.get()
+            _dirty.reset(token)
+            token = None
+            Task.recompute_metrics(dirty['tasks'])
+            UserDayLoad.rebuild_days(dirty['days'])
+    finally:
+        if token is not None:
+            _dirty.reset(token)
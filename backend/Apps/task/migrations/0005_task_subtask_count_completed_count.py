@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:08
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_counters(apps, schema_editor):
+    """Inicializa los contadores a partir de las subtareas existentes."""
+    Task = apps.get_model('task', 'Task')
+    tasks = Task.objects.annotate(
+        n_subtasks=Count('subtasks'),
+        n_completed=Count('subtasks', filter=Q(subtasks__status='completed')),
+    ).filter(n_subtasks__gt=0)
+
+    batch = []
+    for task in tasks.iterator(chunk_size=1000):
+        task.subtask_count = task.n_subtasks
+        task.completed_count = task.n_completed
+        batch.append(task)
+        if len(batch) >= 1000:
+            Task.objects.bulk_update(batch, ['subtask_count', 'completed_count'])
+            batch = []
+    if batch:
+        Task.objects.bulk_update(batch, ['subtask_count', 'completed_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0004_alter_task_progress_alter_task_total_hours'),
+        ('subtask', '0005_alter_subtask_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='completed_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='subtask_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 02:43
+
+from django.db import migrations
+
+# Definiciones fijas de esta migración (no se importan de Apps.search: si ese
+# módulo cambia, lo que hace esta migración debe seguir siendo lo mismo)
+INDEX_NAME = 'task_task_search'
+SEARCH_FIELDS = ['title', 'subject', 'description']
+
+SQLITE_CREATE = [
+    "CREATE VIRTUAL TABLE task_task_search USING fts5(title, subject, description, "
+    "content='task_task', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER task_task_search_ai AFTER INSERT ON task_task BEGIN "
+    "INSERT INTO task_task_search(rowid, title, subject, description) "
+    "VALUES (new.id, new.title, new.subject, new.description); END",
+    "CREATE TRIGGER task_task_search_ad AFTER DELETE ON task_task BEGIN "
+    "INSERT INTO task_task_search(task_task_search, rowid, title, subject, description) "
+    "VALUES ('delete', old.id, old.title, old.subject, old.description); END",
+    "CREATE TRIGGER task_task_search_au AFTER UPDATE ON task_task BEGIN "
+    "INSERT INTO task_task_search(task_task_search, rowid, title, subject, description) "
+    "VALUES ('delete', old.id, old.title, old.subject, old.description); "
+    "INSERT INTO task_task_search(rowid, title, subject, description) "
+    "VALUES (new.id, new.title, new.subject, new.description); END",
+    # Indexa las filas existentes
+    "INSERT INTO task_task_search(task_task_search) VALUES ('rebuild')",
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS task_task_search_ai",
+    "DROP TRIGGER IF EXISTS task_task_search_ad",
+    "DROP TRIGGER IF EXISTS task_task_search_au",
+    "DROP TABLE IF EXISTS task_task_search",
+]
+
+
+def create_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+        index = GinIndex(SearchVector(*SEARCH_FIELDS, config='spanish'), name=INDEX_NAME)
+        schema_editor.add_index(apps.get_model('task', 'Task'), index)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_CREATE:
+            schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+    elif vendor == 'sqlite':
+        for sql in SQLITE_DROP:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0005_task_subtask_count_completed_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
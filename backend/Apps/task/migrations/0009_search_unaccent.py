@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:20
+
+from django.db import migrations
+
+# Definiciones fijas de esta migración (no se importan de Apps.search)
+INDEX_NAME = 'task_task_search'
+SEARCH_FIELDS = ['title', 'subject', 'description']
+
+# 'spanish' con unaccent antes del stemmer, para ignorar tildes como SQLite
+CREATE_CONFIG = [
+    "CREATE EXTENSION IF NOT EXISTS unaccent",
+    "DO $$ BEGIN "
+    "IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'spanish_unaccent') THEN "
+    "CREATE TEXT SEARCH CONFIGURATION spanish_unaccent (COPY = spanish); "
+    "ALTER TEXT SEARCH CONFIGURATION spanish_unaccent "
+    "ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem; "
+    "END IF; END $$",
+]
+
+
+def rebuild_index(schema_editor, model, config):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+    schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+    schema_editor.add_index(model, GinIndex(SearchVector(*SEARCH_FIELDS, config=config), name=INDEX_NAME))
+
+
+def use_unaccent(apps, schema_editor):
+    # El índice GIN se creó con la configuración 'spanish': se recrea con spanish_unaccent (sin tildes)
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in CREATE_CONFIG:
+            schema_editor.execute(sql)
+        rebuild_index(schema_editor, apps.get_model('task', 'Task'), 'spanish_unaccent')
+
+
+def use_spanish(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        rebuild_index(schema_editor, apps.get_model('task', 'Task'), 'spanish')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('task', '0008_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_unaccent, use_spanish),
+    ]
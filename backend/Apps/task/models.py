@@ -2,7 +2,11 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.conf import settings 
 from django.core.validators import MinValueValidator
-from django.db.models import Sum 
+from django.db.models import Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Cast, Now
+from django.utils import timezone
+
+from Apps.read_cache import bump_data_version
 
 class Task(models.Model):
 
@@ -22,6 +26,9 @@ class Task(models.Model):
     type = models.CharField(max_length=100, blank=True)
     progress = models.FloatField(default=0.0,validators=[MinValueValidator(0.0)])
     total_hours = models.FloatField(default=0.0, validators=[MinValueValidator(0.0)])
+    # Contadores mantenidos de forma incremental por Subtask.save()/delete()
+    subtask_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
 
     status = models.CharField(
         max_length=20,
@@ -48,35 +55,223 @@ class Task(models.Model):
 
     is_active = models.BooleanField(default=True)
 
+    # Campos de la búsqueda de texto completo (Apps/search.py)
+    SEARCH_FIELDS = ['title', 'subject', 'description']
+
     class Meta:
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["priority"]),
+            # Listado del usuario en su orden (y el de la paginación por cursor) sin ordenar en memoria
+            models.Index(fields=["user", "-created_at", "id"], name="task_user_created_idx"),
+            # Candidatas a archivar (Apps/task/archive.py): completadas o inactivas por antigüedad
+            models.Index(
+                fields=["updated_at"],
+                condition=Q(status="completed") | Q(is_active=False),
+                name="task_archivable_idx",
+            ),
         ]
 
+    # Dueño tal como está en la BD; None si no se conoce
+    _loaded_user_id = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_user_id = instance.__dict__.get('user_id')
+        return instance
+
+    def save(self, *args, **kwargs):
+        previous_user_id = self._loaded_user_id
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if (
+            previous_user_id is not None
+            and previous_user_id != self.user_id
+            and (update_fields is None or 'user' in update_fields)
+        ):
+            self._move_subtasks(previous_user_id)
+        self._loaded_user_id = self.user_id
+
+    def _move_subtasks(self, previous_user_id):
+        """La tarea cambió de dueño: sus subtareas y la carga diaria de ambos usuarios lo siguen."""
+        from Apps.subtask.models import UserDayLoad
+
+        dates = set(self.subtasks.values_list('planification_date', flat=True))
+        self.subtasks.update(user_id=self.user_id)
+        for user_id in (previous_user_id, self.user_id):
+            UserDayLoad.rebuild(user_id, dates)
+        bump_data_version(previous_user_id)
+
+    @staticmethod
+    def due_day_of(due_date):
+        """Día de entrega en la zona horaria del proyecto (TIME_ZONE), el mismo de timezone.localdate()."""
+        if timezone.is_naive(due_date):
+            return due_date.date()
+        return timezone.localdate(due_date)
+
+    @property
+    def due_day(self):
+        return self.due_day_of(self.due_date)
+
+    # Campos que se modifican al recalcular las métricas
+    METRIC_FIELDS = ['total_hours', 'subtask_count', 'completed_count', 'progress', 'status']
+
     def update_metrics(self):
-        """Calcula horas totales y progreso basado en subtareas."""
-        # 1. Suma de horas necesarias de todas las subtareas
-        total = self.subtasks.aggregate(Sum('needed_hours'))['needed_hours__sum'] or 0.0
-        self.total_hours = total
-
-        # 2. Cálculo de progreso por cantidad de subtareas completadas
-        total_subtasks = self.subtasks.count()
-        if total_subtasks > 0:
-            completed = self.subtasks.filter(status="completed").count()
-            self.progress = (completed / total_subtasks) * 100
+        """Recalcula de forma exacta horas, contadores y progreso en una sola consulta."""
+        # 1. Agregación condicional: suma de horas, total y completadas en un solo SELECT
+        metrics = self.subtasks.aggregate(
+            total=Sum('needed_hours'),
+            count=Count('id'),
+            completed=Count('id', filter=Q(status="completed")),
+        )
+        previous_status = self.status
+        self.set_metrics(metrics['total'] or 0.0, metrics['count'], metrics['completed'])
+
+        # Guardamos solo los campos afectados para no disparar señales innecesarias;
+        # un cambio de estado cuenta como actividad (auto_now de updated_at)
+        update_fields = list(self.METRIC_FIELDS)
+        if self.status != previous_status:
+            update_fields.append('updated_at')
+        self.save(update_fields=update_fields)
+
+    def set_metrics(self, total_hours, subtask_count, completed_count):
+        """Asigna horas y contadores y deriva progreso y estado, sin guardar."""
+        self.total_hours = total_hours
+        self.subtask_count = subtask_count
+        self.completed_count = completed_count
+
+        # Cálculo de progreso por cantidad de subtareas completadas
+        if self.subtask_count > 0:
+            self.progress = (self.completed_count / self.subtask_count) * 100
         else:
             self.progress = 0.0
 
-        # 3. Automatización de estados basada en el progreso
+        # Automatización de estados basada en el progreso
         if self.progress >= 100.0:
             self.status = self.Status.COMPLETED
         elif self.status == self.Status.COMPLETED and self.progress < 100.0:
             self.status = self.Status.IN_PROGRESS
 
-        # Guardamos solo los campos afectados para no disparar señales innecesarias
-        self.save(update_fields=['total_hours', 'progress', 'status'])
+    @classmethod
+    def recompute_metrics(cls, task_ids):
+        """
+        Recalcula de forma exacta las métricas de varias tareas a la vez.
+
+        Una agregación agrupada por tarea y un bulk_update, sin importar cuántas tareas sean.
+        """
+        task_ids = set(task_ids)
+        if not task_ids:
+            return
+        Subtask = cls._meta.get_field('subtasks').related_model
+        rows = Subtask.objects.filter(task_id__in=task_ids).order_by().values('task_id').annotate(
+            total=Sum('needed_hours'),
+            count=Count('id'),
+            completed=Count('id', filter=Q(status="completed")),
+        )
+        metrics = {row['task_id']: row for row in rows}
+
+        tasks = []
+        for task_id in task_ids:
+            row = metrics.get(task_id, {'total': 0.0, 'count': 0, 'completed': 0})
+            task = cls(pk=task_id)
+            task.total_hours = row['total'] or 0.0
+            task.subtask_count = row['count']
+            task.completed_count = row['completed']
+            task.progress = (row['completed'] / row['count']) * 100 if row['count'] else 0.0
+            # Misma regla de estados que update_metrics(), resuelta en el UPDATE;
+            # updated_at solo avanza si el estado cambia (lo usa archivable())
+            if task.progress >= 100.0:
+                task.status = cls.Status.COMPLETED
+                status_changes = ~Q(status=cls.Status.COMPLETED)
+            else:
+                task.status = Case(
+                    When(status=cls.Status.COMPLETED, then=Value(cls.Status.IN_PROGRESS)),
+                    default=F('status'),
+                )
+                status_changes = Q(status=cls.Status.COMPLETED)
+            task.updated_at = Case(When(status_changes, then=Now()), default=F('updated_at'))
+            tasks.append(task)
+
+        cls.objects.bulk_update(tasks, [*cls.METRIC_FIELDS, 'updated_at'])
+
+    @classmethod
+    def apply_subtask_delta(cls, task_id, hours=0.0, count=0, completed=0):
+        """
+        Aplica un delta a las métricas de la tarea con un único UPDATE atómico.
+
+        Todas las expresiones del SET leen los valores previos de la fila, así que
+        progreso y estado se derivan de los contadores nuevos sin leerlos antes.
+        Si el estado cambia, updated_at también avanza.
+        """
+        new_count = F('subtask_count') + count
+        new_completed = F('completed_count') + completed
+        has_subtasks = Q(subtask_count__gt=-count)
+        becomes_completed = has_subtasks & Q(completed_count__gte=F('subtask_count') + (count - completed))
+        was_completed = Q(status=cls.Status.COMPLETED)
+
+        return cls.objects.filter(pk=task_id).update(
+            total_hours=F('total_hours') + hours,
+            subtask_count=new_count,
+            completed_count=new_completed,
+            progress=Case(
+                When(has_subtasks, then=Cast(new_completed, FloatField()) / Cast(new_count, FloatField()) * 100.0),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+            status=Case(
+                When(becomes_completed, then=Value(cls.Status.COMPLETED)),
+                When(was_completed, then=Value(cls.Status.IN_PROGRESS)),
+                default=F('status'),
+            ),
+            updated_at=Case(
+                When(becomes_completed & ~was_completed, then=Now()),
+                When(~becomes_completed & was_completed, then=Now()),
+                default=F('updated_at'),
+            ),
+        )
 
     def __str__(self):
         return f"{self.title} - {self.status}"
+
+
+class ArchivedTask(models.Model):
+    """
+    Tarea completada o inactiva movida fuera de task_task por archive_tasks.
+
+    Mismas columnas que Task (y el mismo id) más archived_at. Es de solo
+    lectura: se consulta con ?include_archived=1.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    subject = models.CharField(max_length=100, blank=True)
+    type = models.CharField(max_length=100, blank=True)
+    progress = models.FloatField()
+    total_hours = models.FloatField()
+    subtask_count = models.PositiveIntegerField()
+    completed_count = models.PositiveIntegerField()
+    status = models.CharField(max_length=20, choices=Task.Status.choices)
+    priority = models.CharField(max_length=10, choices=Task.Priority.choices)
+    due_date = models.DateTimeField()
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_tasks"
+    )
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField()
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at", "id"], name="archivedtask_user_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.title} - {self.status} (archivada)"
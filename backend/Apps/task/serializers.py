@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from .importer import detect_format
 from .models import Task
+from Apps.subtask.models import Subtask
 from Apps.subtask.serializers import SubtaskSerializer
+from Apps.sparse_fields import SparseFieldsSerializerMixin
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     
     subtasks = SubtaskSerializer(many=True, read_only=True)
     user = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -15,3 +18,69 @@ class TaskSerializer(serializers.ModelSerializer):
             'priority', 'due_date', 'user', 'subtasks', 
             'created_at', 'updated_at', 'subject', 'type', 'progress_percentage', 'total_hours'
         ]
+
+
+class TaskNoSubtasksSerializer(TaskSerializer):
+    """Tarea sin subtareas anidadas (?subtasks=none)."""
+
+    class Meta(TaskSerializer.Meta):
+        fields = [field for field in TaskSerializer.Meta.fields if field != 'subtasks']
+
+
+class TaskSummarySerializer(TaskNoSubtasksSerializer):
+    """Tarea con un resumen de sus subtareas por estado (?subtasks=summary)."""
+    subtasks_summary = serializers.SerializerMethodField()
+
+    class Meta(TaskNoSubtasksSerializer.Meta):
+        fields = TaskNoSubtasksSerializer.Meta.fields + ['subtasks_summary']
+
+    # Anotaciones summary_* que agrega TaskViewSet.get_queryset()
+    SUMMARY_ANNOTATIONS = [
+        f'summary_{value}_{metric}' for value in Subtask.Status.values for metric in ('count', 'hours')
+    ]
+
+    def get_subtasks_summary(self, obj):
+        return self.summary_from(vars(obj))
+
+    @staticmethod
+    def summary_from(values):
+        """Arma el resumen desde un mapeo con las anotaciones (instancia o fila de values())."""
+        by_status = {
+            value: {
+                "count": values[f'summary_{value}_count'],
+                "hours": values[f'summary_{value}_hours'] or 0.0,
+            }
+            for value in Subtask.Status.values
+        }
+        return {
+            "count": sum(item["count"] for item in by_status.values()),
+            "hours": sum(item["hours"] for item in by_status.values()),
+            "by_status": by_status,
+        }
+
+
+class TaskTreeSubtaskSerializer(serializers.ModelSerializer):
+    """Subtarea dentro de PUT /api/task/{id}/tree/: con id se actualiza, sin id se crea."""
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = Subtask
+        fields = ['id', 'description', 'status', 'planification_date', 'needed_hours', 'note']
+
+
+class TaskTreeSerializer(TaskSerializer):
+    """Estado completo deseado de una tarea y sus subtareas (PUT /api/task/{id}/tree/)."""
+    subtasks = TaskTreeSubtaskSerializer(many=True, max_length=500)
+
+
+class ImportParamsSerializer(serializers.Serializer):
+    """Formulario de POST /api/import/ (multipart)."""
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(choices=['csv', 'jsonl'], required=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        attrs.setdefault('file_format', detect_format(attrs['file'].name))
+        if attrs['file_format'] is None:
+            raise serializers.ValidationError({'file_format': "No se pudo deducir el formato: indique csv o jsonl."})
+        return attrs
@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from Apps.read_cache import bump_data_version
+from .models import Task
+
+
+@receiver([post_save, post_delete], sender=Task)
+def invalidate_task_reads(sender, instance, **kwargs):
+    bump_data_version(instance.user_id)
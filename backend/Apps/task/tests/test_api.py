@@ -411,3 +411,448 @@ def test_task_total_hours_and_progress_calculated_from_subtasks(api_client, test
     # Verificar que progress se calcula correctamente
     # 2 de 4 subtareas completadas = 50%
     assert response.data["progress"] == 50.0
+
+
+@pytest.mark.django_db
+def test_bulk_create_subtasks_single_metrics_pass(api_client, test_user, django_assert_max_num_queries):
+    """Test crear varias subtareas en una sola petición (POST /task/{id}/subtasks/ con lista)"""
+    from datetime import timedelta
+
+    task = Task.objects.create(
+        title="Tarea con muchas subtareas",
+        due_date=timezone.now() + timedelta(days=10),
+        user=test_user,
+    )
+    api_client.force_authenticate(user=test_user)
+    data = [
+        {
+            "description": f"Subtarea {i}",
+            "planification_date": timezone.localdate().isoformat(),
+            "needed_hours": 1.5,
+            "status": "completed" if i < 10 else "pending",
+        }
+        for i in range(30)
+    ]
+
+    with django_assert_max_num_queries(10):
+        response = api_client.post(f"/api/task/{task.id}/subtasks/", data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data) == 30
+    task.refresh_from_db()
+    assert task.subtasks.count() == 30
+    assert task.total_hours == 45.0
+    assert task.subtask_count == 30
+    assert task.completed_count == 10
+
+
+@pytest.mark.django_db
+def test_bulk_create_subtasks_limits_items(api_client, test_user):
+    """Test que la creación en bloque rechaza listas de más de BULK_MAX_ITEMS subtareas"""
+    from datetime import timedelta
+    from Apps.subtask.models import Subtask
+    from Apps.task.views import TaskViewSet
+
+    task = Task.objects.create(title="Demasiadas", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    api_client.force_authenticate(user=test_user)
+    item = {"description": "Sub", "planification_date": timezone.localdate().isoformat(), "needed_hours": 1}
+
+    response = api_client.post(f"/api/task/{task.id}/subtasks/", [item] * (TaskViewSet.BULK_MAX_ITEMS + 1), format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "non_field_errors" in response.data
+    assert not Subtask.objects.filter(task=task).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_subtasks_rejects_date_after_due_date(api_client, test_user):
+    """Test que la creación en bloque valida todo contra el due_date antes de insertar"""
+    from datetime import timedelta
+    from Apps.subtask.models import Subtask
+
+    task = Task.objects.create(
+        title="Tarea con entrega cercana",
+        due_date=timezone.now() + timedelta(days=1),
+        user=test_user,
+    )
+    api_client.force_authenticate(user=test_user)
+    data = [
+        {"description": "Válida", "planification_date": timezone.localdate().isoformat(), "needed_hours": 1},
+        {
+            "description": "Tardía",
+            "planification_date": (timezone.localdate() + timedelta(days=5)).isoformat(),
+            "needed_hours": 1,
+        },
+    ]
+
+    response = api_client.post(f"/api/task/{task.id}/subtasks/", data, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data[0] == {}
+    assert "planification_date" in response.data[1]
+    assert not Subtask.objects.filter(task=task).exists()
+
+
+@pytest.mark.django_db
+def test_list_tasks_cursor_pagination(api_client, test_user):
+    """Test paginación por cursor de tareas ordenada por -created_at, id"""
+    for i in range(5):
+        Task.objects.create(title=f"Tarea {i}", due_date=timezone.now(), user=test_user)
+    api_client.force_authenticate(user=test_user)
+
+    first = api_client.get("/api/task/?page_size=3")
+    second = api_client.get(first.data["next"])
+
+    titles = [t["title"] for t in first.data["results"] + second.data["results"]]
+    assert titles == [f"Tarea {i}" for i in reversed(range(5))]
+    assert second.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_list_tasks_query_count_is_constant(api_client, test_user, django_assert_max_num_queries):
+    """Test que listar tareas con subtareas no hace una consulta por tarea (N+1)"""
+    from datetime import timedelta
+    from Apps.subtask.models import Subtask
+
+    for i in range(5):
+        task = Task.objects.create(title=f"Tarea {i}", due_date=timezone.now() + timedelta(days=5), user=test_user)
+        for j in range(3):
+            Subtask.objects.create(
+                task=task,
+                description=f"Sub {j}",
+                status="completed" if j == 0 else "pending",
+                planification_date=timezone.localdate(),
+                needed_hours=1.0 + j,
+            )
+    api_client.force_authenticate(user=test_user)
+
+    # Tareas + subtareas (sin caché de lecturas no hay ETag ni consulta de versión)
+    with django_assert_max_num_queries(2):
+        full = api_client.get("/api/task/")
+    assert len(full.data) == 5
+    assert all(len(task["subtasks"]) == 3 for task in full.data)
+    assert full.data[0]["subtasks"][0]["task"]["id"] == full.data[0]["id"]
+
+    with django_assert_max_num_queries(1):
+        summary = api_client.get("/api/task/?subtasks=summary")
+    first = summary.data[0]["subtasks_summary"]
+    assert "subtasks" not in summary.data[0]
+    assert (first["count"], first["hours"]) == (3, 6.0)
+    assert first["by_status"]["completed"] == {"count": 1, "hours": 1.0}
+
+    with django_assert_max_num_queries(1):
+        none = api_client.get("/api/task/?subtasks=none")
+    assert "subtasks" not in none.data[0]
+
+    assert api_client.get("/api/task/?subtasks=otro").status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_list_tasks_sparse_fields(api_client, test_user, django_assert_max_num_queries):
+    """Test proyección de campos (GET /task/?fields=...) sin cargar subtareas ni columnas extra"""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    Task.objects.create(title="Proyectada", description="x" * 100, due_date=timezone.now(), user=test_user)
+    api_client.force_authenticate(user=test_user)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get("/api/task/?fields=id,title,due_date,progress_percentage")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.data[0]) == {"id", "title", "due_date", "progress_percentage"}
+    assert len(queries) == 1
+    assert "description" not in queries[-1]["sql"]
+
+    response = api_client.get("/api/task/?omit=subtasks,description")
+    assert "subtasks" not in response.data[0]
+    assert "description" not in response.data[0]
+    assert "title" in response.data[0]
+
+
+@pytest.mark.django_db
+def test_sparse_fields_with_nested_subtasks_keeps_task_columns(api_client, test_user, settings, django_assert_num_queries):
+    """Test que ?fields=...,subtasks no difiere las columnas de la tarea embebida en cada subtarea"""
+    from Apps.subtask.models import Subtask
+
+    settings.FAST_LIST_RENDERING = False
+    task = Task.objects.create(title="Anidada", due_date=timezone.now() + timezone.timedelta(days=5), user=test_user)
+    for i in range(3):
+        Subtask.objects.create(task=task, description=f"S{i}", planification_date=timezone.localdate(), needed_hours=1.0)
+    api_client.force_authenticate(user=test_user)
+
+    # Tarea + subtareas
+    with django_assert_num_queries(2):
+        response = api_client.get(f"/api/task/{task.id}/?fields=id,title,subtasks")
+    assert response.data["subtasks"][0]["task"]["priority"] == task.priority
+
+    with django_assert_num_queries(2):
+        response = api_client.get("/api/task/?fields=id,title,subtasks")
+    assert set(response.data[0]) == {"id", "title", "subtasks"}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("query", ["", "?subtasks=summary", "?subtasks=none", "?page_size=1", "?fields=id,title,subtasks"])
+def test_list_tasks_fast_rendering_is_identical(api_client, test_user, settings, query):
+    """Test que el listado desde values() produce exactamente los mismos bytes que los serializers"""
+    from Apps.subtask.models import Subtask
+
+    for title in ["Uno", "Dos"]:
+        task = Task.objects.create(title=title, due_date=timezone.now() + timezone.timedelta(days=5), user=test_user)
+        Subtask.objects.create(task=task, description="Sub", planification_date=timezone.localdate(), needed_hours=2.0)
+        Subtask.objects.create(
+            task=task, description="Hecha", planification_date=timezone.localdate(), needed_hours=1.0, status="completed"
+        )
+    api_client.force_authenticate(user=test_user)
+
+    settings.READ_CACHE_ENABLED = False
+    settings.FAST_LIST_RENDERING = False
+    expected = api_client.get(f"/api/task/{query}").content
+    settings.FAST_LIST_RENDERING = True
+    assert api_client.get(f"/api/task/{query}").content == expected
+
+
+@pytest.mark.django_db
+def test_task_detail_etag_not_modified(api_client, test_user, settings, django_assert_max_num_queries):
+    """Test que If-None-Match con el ETag vigente responde 304 sin serializar y que una escritura lo invalida"""
+    settings.READ_CACHE_ENABLED = True
+    task = Task.objects.create(title="Cacheable", due_date=timezone.now(), user=test_user)
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.get(f"/api/task/{task.id}/")
+    etag = response["ETag"]
+    assert response.status_code == status.HTTP_200_OK
+
+    with django_assert_max_num_queries(1):
+        response = api_client.get(f"/api/task/{task.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    api_client.patch(f"/api/task/{task.id}/", {"title": "Cambió"}, format="json")
+    response = api_client.get(f"/api/task/{task.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_task_etag_requires_read_cache(api_client, test_user, settings, django_assert_num_queries):
+    """Test que sin caché de lecturas no hay ETag ni consulta de versión: If-None-Match se ignora"""
+    settings.READ_CACHE_ENABLED = False
+    Task.objects.create(title="Sin versión", due_date=timezone.now(), user=test_user)
+    api_client.force_authenticate(user=test_user)
+
+    with django_assert_num_queries(1):
+        response = api_client.get("/api/task/?subtasks=none", HTTP_IF_NONE_MATCH="*")
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header("ETag")
+
+
+@pytest.mark.django_db
+def test_task_etag_uses_read_cache_version(api_client, test_user, settings, django_assert_num_queries):
+    """Test que con el caché de lecturas activo el ETag sale del contador de versión, sin consultas"""
+    settings.READ_CACHE_ENABLED = True
+    task = Task.objects.create(title="Versionada", due_date=timezone.now(), user=test_user)
+    api_client.force_authenticate(user=test_user)
+    etag = api_client.get("/api/task/")["ETag"]
+
+    with django_assert_num_queries(0):
+        response = api_client.get("/api/task/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    with django_assert_num_queries(0):
+        response = api_client.get("/api/task/")
+    assert (response["X-Cache"], response["ETag"]) == ("HIT", etag)
+
+    Task.objects.filter(pk=task.pk).delete()
+    response = api_client.get("/api/task/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == []
+
+
+@pytest.mark.django_db
+def test_task_list_read_cache_invalidated_by_writes(api_client, test_user, settings):
+    """Test que el listado se sirve del caché y que cualquier escritura del usuario lo invalida"""
+    from Apps import read_cache
+    from Apps.subtask.models import Subtask
+
+    settings.READ_CACHE_ENABLED = True
+
+    task = Task.objects.create(title="Cacheada", due_date=timezone.now() + timezone.timedelta(days=3), user=test_user)
+    api_client.force_authenticate(user=test_user)
+    read_cache.reset_stats()
+
+    assert api_client.get("/api/task/?subtasks=summary")["X-Cache"] == "MISS"
+    assert api_client.get("/api/task/?subtasks=summary")["X-Cache"] == "HIT"
+    assert read_cache.stats() == {"hits": 1, "misses": 1}
+
+    # Escritura por el ORM (señal) y por la API en bloque (bulk_create)
+    Subtask.objects.create(task=task, description="Nueva", planification_date=timezone.localdate(), needed_hours=2.0)
+    response = api_client.get("/api/task/?subtasks=summary")
+    assert response["X-Cache"] == "MISS"
+    assert response.data[0]["subtasks_summary"]["count"] == 1
+
+    api_client.post(
+        f"/api/task/{task.id}/subtasks/",
+        [{"description": "Bloque", "planification_date": str(timezone.localdate()), "needed_hours": 1.0}],
+        format="json",
+    )
+    response = api_client.get("/api/task/?subtasks=summary")
+    assert response["X-Cache"] == "MISS"
+    assert response.data[0]["subtasks_summary"]["count"] == 2
+
+
+@pytest.mark.django_db
+def test_search_tasks(api_client, test_user):
+    """Test búsqueda de texto completo de tareas (GET /task/search/?q=)"""
+    match = Task.objects.create(title="Parcial de física", subject="Física", due_date=timezone.now(), user=test_user)
+    Task.objects.create(title="Ensayo", description="Historia moderna", due_date=timezone.now(), user=test_user)
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.get("/api/task/search/?q=fisica")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data] == [match.id]
+    assert "subtasks" not in response.data[0]
+
+
+@pytest.mark.django_db
+def test_search_without_fulltext_index_matches_substrings(test_user, monkeypatch):
+    """Test que en motores sin índice de texto completo la búsqueda usa icontains por palabra"""
+    from types import SimpleNamespace
+    from Apps import search
+
+    monkeypatch.setattr(search, "connection", SimpleNamespace(vendor="mysql"))
+    match = Task.objects.create(title="Parcial de física", subject="Física", due_date=timezone.now(), user=test_user)
+    essay = Task.objects.create(title="Ensayo", description="Historia moderna", due_date=timezone.now(), user=test_user)
+    tasks = Task.objects.filter(user=test_user)
+
+    assert search.search(tasks, "parc", 10) == [match]
+    assert search.search(tasks, "ENSAYO histo", 10) == [essay]
+    assert search.search(tasks, "parcial historia", 10) == []
+    assert search.search(tasks, "a", 1)[0].search_rank == 0.0
+
+
+
+@pytest.mark.django_db
+def test_search_index_installed_after_migrate():
+    """Test que las migraciones dejan el índice de búsqueda de cada modelo (en SQLite, tabla FTS5 y triggers)"""
+    from django.db import connection
+    from Apps.subtask.models import Subtask
+
+    for model in (Task, Subtask):
+        fts = f"{model._meta.db_table}_search"
+        with connection.cursor() as cursor:
+            if connection.vendor == "postgresql":
+                cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = %s", [fts])
+                assert cursor.fetchone(), fts
+                continue
+            if connection.vendor != "sqlite":
+                continue
+            # Una migración que recrea la tabla (AlterField...) borra los triggers si no los reinstala
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [model._meta.db_table]
+            )
+            assert {row[0] for row in cursor.fetchall()} >= {f"{fts}_ai", f"{fts}_ad", f"{fts}_au"}
+            cursor.execute(f"SELECT name FROM pragma_table_info('{fts}')")
+            assert [row[0] for row in cursor.fetchall()] == model.SEARCH_FIELDS
+
+def tree_body(task, subtasks, **changes):
+    """Body de PUT /task/{id}/tree/ con los campos actuales de la tarea."""
+    body = {
+        "title": task.title,
+        "description": task.description,
+        "priority": task.priority,
+        "due_date": task.due_date.isoformat(),
+        "subtasks": subtasks,
+    }
+    body.update(changes)
+    return body
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("size", [3, 30])
+def test_put_task_tree_diffs_subtasks(api_client, test_user, django_assert_num_queries, size):
+    """Test PUT /task/{id}/tree/: altas, cambios y bajas en una petición con consultas acotadas"""
+    from datetime import timedelta
+    from Apps.subtask.models import Subtask, UserDayLoad
+
+    today = timezone.localdate()
+    task = Task.objects.create(title="Árbol", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    existing = [
+        Subtask.objects.create(task=task, description=f"S{i}", planification_date=today, needed_hours=1.0)
+        for i in range(size)
+    ]
+    kept, changed, removed = existing[:1], existing[1:size - 1], existing[size - 1:]
+    subtasks = [{"id": subtask.id, "description": subtask.description, "planification_date": today.isoformat(), "needed_hours": 1.0} for subtask in kept]
+    subtasks += [{"id": subtask.id, "description": "Hecha", "status": "completed", "planification_date": today.isoformat(), "needed_hours": 2.0} for subtask in changed]
+    subtasks += [{"description": f"Nueva {i}", "planification_date": (today + timedelta(days=1)).isoformat(), "needed_hours": 0.5} for i in range(size)]
+
+    api_client.force_authenticate(user=test_user)
+    # El número de consultas no depende de cuántas subtareas se crean, cambian o borran
+    with django_assert_num_queries(16):
+        response = api_client.put(f"/api/task/{task.id}/tree/", tree_body(task, subtasks, title="Árbol editado"), format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["title"] == "Árbol editado"
+    assert len(response.data["subtasks"]) == 2 * size - 1
+    assert not Subtask.objects.filter(pk__in=[subtask.pk for subtask in removed]).exists()
+    task.refresh_from_db()
+    assert task.subtask_count == 2 * size - 1
+    assert task.completed_count == size - 2
+    assert task.total_hours == 1.0 + 2.0 * (size - 2) + 0.5 * size
+    assert UserDayLoad.objects.get(user=test_user, date=today).planned_hours == 1.0
+    assert UserDayLoad.objects.get(user=test_user, date=today + timedelta(days=1)).planned_hours == 0.5 * size
+
+
+@pytest.mark.django_db
+def test_put_task_tree_applies_note_rules(api_client, test_user):
+    """Test que en el árbol una nota sin status pospone la subtarea, igual que PATCH"""
+    from datetime import timedelta
+    from Apps.subtask.models import Subtask
+
+    today = timezone.localdate().isoformat()
+    task = Task.objects.create(title="Notas", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    subtask = Subtask.objects.create(task=task, description="Con nota", planification_date=today, needed_hours=1.0)
+    api_client.force_authenticate(user=test_user)
+
+    response = api_client.put(f"/api/task/{task.id}/tree/", tree_body(task, [
+        {"id": subtask.id, "description": "Con nota", "planification_date": today, "needed_hours": 1.0, "note": " Mañana "},
+        {"description": "Nueva", "planification_date": today, "needed_hours": 1.0, "note": "   ", "status": "in_progress"},
+    ]), format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    subtask.refresh_from_db()
+    assert (subtask.status, subtask.note) == (Subtask.Status.POSTPONED, "Mañana")
+    new = Subtask.objects.get(task=task, description="Nueva")
+    assert (new.status, new.note) == (Subtask.Status.IN_PROGRESS, None)
+
+
+@pytest.mark.django_db
+def test_put_task_tree_is_all_or_nothing(api_client, test_user):
+    """Test que un error en el árbol no escribe nada y se reporta por subtarea"""
+    from datetime import timedelta
+    from Apps.subtask.models import Subtask
+
+    today = timezone.localdate()
+    task = Task.objects.create(title="Árbol", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    other = Task.objects.create(title="Otra", due_date=timezone.now() + timedelta(days=10), user=test_user)
+    subtask = Subtask.objects.create(task=task, description="Lejana", planification_date=today + timedelta(days=5), needed_hours=1.0)
+    foreign = Subtask.objects.create(task=other, description="Otra", planification_date=today, needed_hours=1.0)
+    api_client.force_authenticate(user=test_user)
+
+    # Adelantar la entrega invalida la subtarea aunque ella no cambie
+    item = {"id": subtask.id, "description": "Lejana", "planification_date": subtask.planification_date.isoformat(), "needed_hours": 1.0}
+    response = api_client.put(
+        f"/api/task/{task.id}/tree/",
+        tree_body(task, [item, {"id": foreign.id, "description": "Robada", "planification_date": today.isoformat(), "needed_hours": 1.0}],
+                  due_date=(timezone.now() + timedelta(days=1)).isoformat(), title="No se guarda"),
+        format="json",
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert set(response.data["subtasks"]) == {0, 1}
+    assert "planification_date" in response.data["subtasks"][0]
+
+    task.refresh_from_db()
+    foreign.refresh_from_db()
+    assert task.title == "Árbol"
+    assert foreign.task_id == other.id
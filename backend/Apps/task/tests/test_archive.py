@@ -0,0 +1,147 @@
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Apps.archived import IncludeArchivedMixin
+from Apps.subtask.models import ArchivedSubtask, Subtask, UserDayLoad
+from Apps.task.archive import SUBTASK_COLUMNS, TASK_COLUMNS, archive_tasks
+from Apps.task.models import ArchivedTask, Task
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="archivo", email="archivo@example.com", password="x")
+
+
+@pytest.fixture
+def api_client(settings, user):
+    """Cliente autenticado sin caché de lecturas"""
+    settings.READ_CACHE_ENABLED = False
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def make_task(user, title, days_old=0, **fields):
+    """Crea una tarea con una subtarea pendiente para hoy y la envejece `days_old` días."""
+    task = Task.objects.create(title=title, due_date=timezone.now() + datetime.timedelta(days=5), user=user)
+    Subtask.objects.create(task=task, description=f"Sub {title}", planification_date=timezone.localdate(), needed_hours=2.0)
+    old = timezone.now() - datetime.timedelta(days=days_old)
+    Task.objects.filter(pk=task.pk).update(updated_at=old, created_at=old, **fields)
+    return task
+
+
+def test_archive_tables_mirror_live_columns():
+    """Test que las tablas de archivo tienen todas las columnas de las vivas"""
+    archived_task = {field.attname for field in ArchivedTask._meta.concrete_fields}
+    archived_subtask = {field.attname for field in ArchivedSubtask._meta.concrete_fields}
+    assert set(TASK_COLUMNS) == archived_task - {'archived_at'}
+    assert set(SUBTASK_COLUMNS) == archived_subtask
+
+
+@pytest.mark.django_db
+def test_archive_tasks_moves_old_completed_and_inactive(user):
+    """Test que solo se archivan tareas completadas o inactivas viejas, por lotes y con sus subtareas"""
+    inactive = make_task(user, "Inactiva", days_old=200, is_active=False)
+    completed = make_task(user, "Completada", days_old=200, status=Task.Status.COMPLETED)
+    recent = make_task(user, "Reciente", days_old=10, is_active=False)
+    active = make_task(user, "Activa", days_old=200)
+    assert UserDayLoad.objects.get(user=user, date=timezone.localdate()).planned_hours == 8.0
+
+    assert archive_tasks(days=90, chunk_size=1) == 2
+
+    assert set(Task.objects.values_list('pk', flat=True)) == {recent.pk, active.pk}
+    assert set(ArchivedTask.objects.values_list('pk', flat=True)) == {inactive.pk, completed.pk}
+    assert ArchivedSubtask.objects.filter(task_id=inactive.pk, user=user, needed_hours=2.0).exists()
+    assert not Subtask.objects.filter(task_id__in=[inactive.pk, completed.pk]).exists()
+    # Las subtareas archivadas dejan de ocupar capacidad
+    assert UserDayLoad.objects.get(user=user, date=timezone.localdate()).planned_hours == 4.0
+    assert archive_tasks(days=90) == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("mode", ["incremental", "recompute", "update_metrics"])
+def test_task_just_completed_by_subtask_is_not_archivable(user, settings, mode):
+    """Test que completar la última subtarea de una tarea vieja cuenta como actividad reciente"""
+    settings.TASK_METRICS_INCREMENTAL = mode != "recompute"
+    task = make_task(user, "Vieja", days_old=120)
+    subtask = task.subtasks.get()
+
+    if mode == "update_metrics":
+        Subtask.objects.filter(pk=subtask.pk).update(status=Subtask.Status.COMPLETED)
+        Task.objects.get(pk=task.pk).update_metrics()
+    else:
+        subtask.status = Subtask.Status.COMPLETED
+        subtask.save()
+
+    task.refresh_from_db()
+    assert task.status == Task.Status.COMPLETED
+    assert task.updated_at > timezone.now() - datetime.timedelta(minutes=1)
+    assert archive_tasks(days=90) == 0
+    assert Task.objects.filter(pk=task.pk).exists()
+
+
+@pytest.mark.django_db
+def test_archive_tasks_command_dry_run(user, capsys):
+    """Test que --dry-run solo cuenta"""
+    make_task(user, "Inactiva", days_old=200, is_active=False)
+    call_command('archive_tasks', '--dry-run')
+    assert "1 tareas para archivar" in capsys.readouterr().out
+    assert not ArchivedTask.objects.exists()
+    call_command('archive_tasks', '--days', '30')
+    assert ArchivedTask.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_include_archived_task_reads(api_client, user):
+    """Test que los listados excluyen lo archivado salvo con ?include_archived=1, también por cursor"""
+    archived = make_task(user, "Vieja", days_old=200, status=Task.Status.COMPLETED)
+    live = make_task(user, "Nueva")
+    archive_tasks()
+
+    response = api_client.get("/api/task/")
+    assert [item["id"] for item in response.data] == [live.pk]
+
+    response = api_client.get("/api/task/?include_archived=1")
+    assert [(item["id"], item["archived"]) for item in response.data] == [(live.pk, False), (archived.pk, True)]
+    assert response.data[1]["subtasks"][0]["description"] == "Sub Vieja"
+
+    first = api_client.get("/api/task/?include_archived=1&page_size=1&subtasks=summary")
+    assert [item["id"] for item in first.data["results"]] == [live.pk]
+    second = api_client.get(first.data["next"])
+    assert [item["id"] for item in second.data["results"]] == [archived.pk]
+    assert second.data["results"][0]["subtasks_summary"]["count"] == 1
+    assert second.data["next"] is None
+
+    assert api_client.get(f"/api/task/{archived.pk}/").status_code == 404
+    response = api_client.get(f"/api/task/{archived.pk}/?include_archived=1")
+    assert response.status_code == 200
+    assert response.data["archived"] is True
+
+
+@pytest.mark.django_db
+def test_include_archived_subtask_reads(api_client, user):
+    """Test que las subtareas archivadas se listan con los mismos filtros y su tarea embebida"""
+    archived = make_task(user, "Vieja", days_old=200, is_active=False)
+    make_task(user, "Nueva")
+    archive_tasks()
+
+    assert len(api_client.get("/api/subtasks/").data) == 1
+
+    response = api_client.get(f"/api/subtasks/?include_archived=1&task={archived.pk}")
+    assert [item["archived"] for item in response.data] == [True]
+    assert response.data[0]["task"]["title"] == "Vieja"
+
+    response = api_client.get("/api/subtasks/?include_archived=true&page_size=50")
+    assert len(response.data["results"]) == 2
+
+
+def test_include_archived_requires_archived_model():
+    """Test que una vista sin modelo de archivo falla con ImproperlyConfigured"""
+    with pytest.raises(ImproperlyConfigured):
+        IncludeArchivedMixin().get_archived_queryset()
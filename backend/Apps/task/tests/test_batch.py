@@ -0,0 +1,130 @@
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from Apps.subtask.models import Subtask
+from Apps.task.models import Task
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="batch", email="batch@example.com", password="x")
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def task_payload(title):
+    return {"title": title, "due_date": (timezone.now() + timezone.timedelta(days=3)).isoformat()}
+
+
+@pytest.mark.django_db
+def test_batch_runs_sub_requests_in_order(api_client, user, settings):
+    """Test que /api/batch/ ejecuta las sub-peticiones con las vistas reales y devuelve cada respuesta"""
+    settings.READ_CACHE_ENABLED = True
+    task = Task.objects.create(title="Existente", due_date=timezone.now(), user=user)
+    response = api_client.post("/api/batch/", {"requests": [
+        {"method": "GET", "path": "/api/user/me/"},
+        {"method": "POST", "path": "/api/task/", "body": task_payload("Nueva")},
+        {"method": "GET", "path": "/api/task/?subtasks=none&fields=id,title"},
+        {"method": "GET", "path": f"/api/task/{task.id + 1000}/"},
+        {"method": "GET", "path": "/api/no-existe/"},
+    ]}, format="json")
+
+    assert response.status_code == status.HTTP_200_OK
+    me, created, listed, missing, unknown = response.data["responses"]
+    assert (me["status"], me["body"]["id"]) == (200, user.id)
+    assert created["status"] == 201
+    assert [item["title"] for item in listed["body"]] == ["Nueva", "Existente"]
+    assert "ETag" in listed["headers"]
+    assert (missing["status"], unknown["status"]) == (404, 404)
+    assert all(item["duration_ms"] >= 0 for item in response.data["responses"])
+
+
+@pytest.mark.django_db
+def test_batch_atomic_rolls_back_on_failure(api_client):
+    """Test que en modo atómico la primera falla deshace lo anterior y el resto no se ejecuta"""
+    response = api_client.post("/api/batch/", {"atomic": True, "requests": [
+        {"method": "POST", "path": "/api/task/", "body": task_payload("Deshecha")},
+        {"method": "POST", "path": "/api/task/", "body": {"title": "Sin fecha"}},
+        {"method": "POST", "path": "/api/task/", "body": task_payload("Nunca")},
+    ]}, format="json")
+
+    assert [item["status"] for item in response.data["responses"]] == [201, 400, 424]
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_batch_atomic_rollback_does_not_poison_read_cache(api_client, user, settings):
+    """Test que lo leído dentro de un batch atómico deshecho no queda en el caché de lecturas"""
+    settings.READ_CACHE_ENABLED = True
+    task = Task.objects.create(title="Con sub", due_date=timezone.now() + timezone.timedelta(days=3), user=user)
+    subtask = Subtask.objects.create(task=task, description="orig", planification_date=timezone.localdate(), needed_hours=1)
+
+    response = api_client.post("/api/batch/", {"atomic": True, "requests": [
+        {"method": "PATCH", "path": f"/api/subtasks/{subtask.id}/", "body": {"description": "PHANTOM"}},
+        {"method": "GET", "path": "/api/subtasks/"},
+        {"method": "GET", "path": "/api/subtasks/999999/"},
+    ]}, format="json")
+    assert [item["status"] for item in response.data["responses"]] == [200, 200, 404]
+    assert response.data["responses"][1]["body"][0]["description"] == "PHANTOM"
+    phantom_etag = response.data["responses"][1]["headers"]["ETag"]
+
+    response = api_client.get("/api/subtasks/", HTTP_IF_NONE_MATCH=phantom_etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["description"] for item in response.data] == ["orig"]
+
+
+@pytest.mark.django_db
+def test_batch_atomic_rolls_back_when_time_runs_out(api_client, settings, monkeypatch):
+    """Test que en modo atómico agotar el tiempo deshace las sub-peticiones ya ejecutadas"""
+    settings.BATCH_TIME_BUDGET_MS = 2500
+    # Reloj que avanza 1 s por lectura: el tiempo se agota justo después de la primera sub-petición
+    ticks = iter(range(100))
+    monkeypatch.setattr("Apps.batch.time", SimpleNamespace(perf_counter=lambda: next(ticks)))
+
+    response = api_client.post("/api/batch/", {"atomic": True, "requests": [
+        {"method": "POST", "path": "/api/task/", "body": task_payload("Deshecha")},
+        {"method": "POST", "path": "/api/task/", "body": task_payload("Sin tiempo")},
+        {"method": "POST", "path": "/api/task/", "body": task_payload("Nunca")},
+    ]}, format="json")
+
+    assert [item["status"] for item in response.data["responses"]] == [201, 503, 424]
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_batch_rejects_non_api_responses(api_client):
+    """Test que una ruta con respuesta de archivo (export) se rechaza en vez de devolver un body vacío"""
+    response = api_client.post("/api/batch/", {"requests": [
+        {"method": "GET", "path": "/api/user/export/"},
+        {"method": "GET", "path": "/api/user/me/"},
+    ]}, format="json")
+
+    exported, me = response.data["responses"]
+    assert (exported["status"], exported["body"]["detail"]) == (400, "Ruta no soportada en batch.")
+    assert me["status"] == 200
+
+
+@pytest.mark.django_db
+def test_batch_limits_and_auth(api_client, settings):
+    """Test límites del batch, rutas permitidas y autenticación"""
+    settings.BATCH_MAX_REQUESTS = 2
+    item = {"method": "GET", "path": "/api/user/me/"}
+    assert api_client.post("/api/batch/", {"requests": [item] * 3}, format="json").status_code == 400
+    assert api_client.post("/api/batch/", {"requests": [{"method": "GET", "path": "/api/batch/"}]}, format="json").status_code == 400
+    assert api_client.post("/api/batch/", {"requests": [{"method": "GET", "path": "/admin/"}]}, format="json").status_code == 400
+
+    settings.BATCH_TIME_BUDGET_MS = 0
+    response = api_client.post("/api/batch/", {"requests": [item, item]}, format="json")
+    assert [entry["status"] for entry in response.data["responses"]] == [503, 503]
+
+    assert APIClient().post("/api/batch/", {"requests": [item]}, format="json").status_code == 401
@@ -0,0 +1,184 @@
+import datetime
+import io
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Apps.subtask.models import Subtask, UserDayLoad
+from Apps.task.importer import import_file
+from Apps.task.models import Task
+
+HEADER = "task,title,due_date,priority,subtask,planification_date,needed_hours,status\n"
+
+
+@pytest.fixture
+def user():
+    return get_user_model().objects.create_user(username="importa", email="importa@example.com", password="x")
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def day(offset):
+    return (timezone.localdate() + datetime.timedelta(days=offset)).isoformat()
+
+
+def csv_file(*lines):
+    return io.BytesIO((HEADER + "".join(line + "\n" for line in lines)).encode())
+
+
+@pytest.mark.django_db
+def test_import_csv_creates_tasks_with_metrics_and_day_load(user):
+    """Test que el CSV crea tareas y subtareas por lotes con métricas y carga diaria correctas"""
+    stream = csv_file(
+        f"a,Parcial,{day(10)},high,Leer,{day(1)},2,pending",
+        f"b,Informe,{day(5)},,Escribir,{day(1)},3,completed",
+        f"a,Parcial,{day(10)},high,Resumir,{day(2)},1.5,completed",
+        f"b,Informe,{day(5)},,Revisar,{day(1)},1,pending",
+        f"c,Sin subtareas,{day(3)},,,,,",
+    )
+    # Lotes de una subtarea: las de 'a' y 'b' llegan después de insertar su tarea
+    report = import_file(stream, 'csv', user, chunk_size=1)
+
+    assert (report.imported, report.rows, report.tasks, report.subtasks) == (True, 5, 3, 4)
+    parcial = Task.objects.get(user=user, title="Parcial")
+    assert (parcial.priority, parcial.total_hours, parcial.subtask_count, parcial.completed_count) == ("high", 3.5, 2, 1)
+    assert parcial.progress == 50.0
+    assert Task.objects.get(title="Sin subtareas").subtask_count == 0
+    assert Subtask.objects.filter(user=user).count() == 4
+    # Carga diaria: solo subtareas activas
+    assert UserDayLoad.objects.get(user=user, date=day(1)).planned_hours == 3.0
+    assert not UserDayLoad.objects.filter(user=user, date=day(2)).exists()
+
+    # Las métricas coinciden con un recálculo exacto
+    expected = {task.pk: (task.total_hours, task.subtask_count, task.completed_count, task.status)
+                for task in Task.objects.filter(user=user)}
+    Task.recompute_metrics(expected)
+    assert {task.pk: (task.total_hours, task.subtask_count, task.completed_count, task.status)
+            for task in Task.objects.filter(user=user)} == expected
+
+
+@pytest.mark.django_db
+def test_import_jsonl_groups_by_title_and_due_date(user):
+    """Test que JSON Lines sin columna task agrupa por título y entrega, y informa líneas inválidas"""
+    due = (timezone.now() + datetime.timedelta(days=7)).isoformat()
+    lines = [
+        json.dumps({"title": "Ensayo", "due_date": due, "subtask": "Borrador", "planification_date": day(1), "needed_hours": 2}),
+        json.dumps({"title": "Ensayo", "due_date": due, "subtask": "Final", "planification_date": day(2), "needed_hours": 1}),
+    ]
+    report = import_file(io.BytesIO("\n".join(lines).encode()), 'jsonl', user)
+    assert (report.tasks, report.subtasks) == (1, 2)
+    assert Task.objects.get(user=user).total_hours == 3.0
+
+    report = import_file(io.BytesIO(b'{"title": "Otra"\n[1]\n'), 'jsonl', user)
+    assert [error["row"] for error in report.errors] == [1, 2]
+    assert Task.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_import_reports_row_errors_and_rolls_back(user):
+    """Test que una fila inválida deshace todo y se informa por fila, incluida la regla del due_date"""
+    stream = csv_file(
+        f"a,Parcial,{day(3)},,Leer,{day(1)},2,pending",
+        f"a,Parcial,{day(3)},,Tarde,{day(4)},2,pending",
+        f"b,,{day(3)},,Algo,{day(1)},1,pending",
+        f"b,,{day(3)},,Otra,{day(1)},1,pending",
+        f"c,Horas,{day(3)},,Mal,{day(1)},x,pending",
+    )
+    report = import_file(stream, 'csv', user)
+
+    assert not report.imported
+    rows = {error["row"]: error["errors"] for error in report.errors}
+    assert set(rows) == {3, 4, 5, 6}
+    assert "planification_date" in rows[3]
+    assert "title" in rows[4]
+    assert "task" in rows[5]
+    assert "needed_hours" in rows[6]
+    assert not Task.objects.exists() and not Subtask.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_dry_run_saves_nothing(user):
+    """Test que el modo prueba valida y cuenta sin guardar"""
+    report = import_file(csv_file(f"a,Parcial,{day(3)},,Leer,{day(1)},2,pending"), 'csv', user, dry_run=True)
+    assert (report.dry_run, report.imported, report.tasks, report.subtasks) == (True, False, 1, 1)
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_tasks_command(user, tmp_path, capsys):
+    """Test del comando import_tasks con archivo válido e inválido"""
+    path = tmp_path / "plan.csv"
+    path.write_bytes(csv_file(f"a,Parcial,{day(3)},,Leer,{day(1)},2,pending").getvalue())
+    call_command('import_tasks', str(path), '--user', str(user.pk))
+    assert "Importado: 1 filas, 1 tareas, 1 subtareas" in capsys.readouterr().out
+    assert Task.objects.filter(user=user).count() == 1
+
+    path.write_bytes(csv_file(f"a,Parcial,{day(3)},,Tarde,{day(9)},2,pending").getvalue())
+    with pytest.raises(CommandError):
+        call_command('import_tasks', str(path), '--user', str(user.pk))
+    assert "Fila 2" in capsys.readouterr().err
+
+
+@pytest.mark.django_db
+def test_import_api_upload(api_client, user):
+    """Test de POST /api/import/ con multipart: importación, prueba, errores y formato"""
+    content = csv_file(f"a,Parcial,{day(3)},,Leer,{day(1)},2,pending").getvalue()
+
+    response = api_client.post("/api/import/", {"file": SimpleUploadedFile("plan.csv", content), "dry_run": "true"})
+    assert (response.status_code, response.data["subtasks"]) == (200, 1)
+    assert not Task.objects.exists()
+
+    response = api_client.post("/api/import/", {"file": SimpleUploadedFile("plan.csv", content)})
+    assert (response.status_code, response.data["imported"]) == (201, True)
+    assert Task.objects.filter(user=user).count() == 1
+
+    bad = csv_file(f"a,Parcial,{day(3)},,Tarde,{day(9)},2,pending").getvalue()
+    response = api_client.post("/api/import/", {"file": SimpleUploadedFile("plan.csv", bad)})
+    assert response.status_code == 400
+    assert response.data["errors"][0]["row"] == 2
+
+    response = api_client.post("/api/import/", {"file": SimpleUploadedFile("plan.txt", content)})
+    assert response.status_code == 400 and "file_format" in response.data["details"]
+    assert APIClient().post("/api/import/", {"file": SimpleUploadedFile("plan.csv", content)}).status_code == 401
+
+
+@pytest.mark.django_db
+def test_import_rejects_non_utf8_file(api_client):
+    """Test que un CSV en Latin-1 devuelve un error de archivo y no un 500"""
+    content = (HEADER + f"a,Física,{day(3)},,Leer,{day(1)},2,pending\n").encode("latin-1")
+    response = api_client.post("/api/import/", {"file": SimpleUploadedFile("plan.csv", content)})
+    assert response.status_code == 400
+    assert response.data["errors"][0]["row"] == 2
+    assert "UTF-8" in response.data["errors"][0]["errors"]["row"][0]
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_jsonl_value_types(user):
+    """Test que JSON Lines acepta números como texto y rechaza por fila los valores que no son escalares"""
+    due = (timezone.now() + datetime.timedelta(days=7)).isoformat()
+    lines = [
+        {"task": 1, "title": "Ensayo", "due_date": due, "subtask": "A", "planification_date": day(1), "needed_hours": 2},
+        {"task": 2, "title": "Fecha numérica", "due_date": 5},
+        {"task": ["a"], "title": "Clave lista", "due_date": due},
+        {"task": 3, "title": {"es": "Objeto"}, "due_date": due},
+    ]
+    stream = io.BytesIO("\n".join(json.dumps(line) for line in lines).encode())
+    report = import_file(stream, 'jsonl', user)
+
+    rows = {error["row"]: error["errors"] for error in report.errors}
+    assert set(rows) == {2, 3, 4}
+    assert "due_date" in rows[2]
+    assert "task" in rows[3]
+    assert "title" in rows[4]
+    assert not Task.objects.exists()
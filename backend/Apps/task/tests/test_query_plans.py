@@ -0,0 +1,71 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from Apps.query_plans import SUPPORTED_VENDORS, plan_problems
+from Apps.subtask.models import Subtask
+from Apps.task.models import Task
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor not in SUPPORTED_VENDORS, reason=f"Sin lectura de planes para {connection.vendor}."
+)
+
+
+@pytest.fixture
+def api_client(settings):
+    """Cliente autenticado con datos mínimos y sin caché de lecturas"""
+    settings.READ_CACHE_ENABLED = False
+    user = get_user_model().objects.create_user(username="plan", email="plan@example.com", password="x")
+    for i in range(3):
+        task = Task.objects.create(title=f"Tarea {i}", due_date=timezone.now() + timezone.timedelta(days=5), user=user)
+        Subtask.objects.create(task=task, description="Sub", planification_date=timezone.localdate(), needed_hours=1.0)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    client.task = task
+    return client
+
+
+def endpoint_problems(api_client, url, allow_sort=()):
+    with CaptureQueriesContext(connection) as queries:
+        assert api_client.get(url).status_code == 200
+    return {
+        query["sql"]: problems
+        for query in queries
+        if query["sql"].lstrip().upper().startswith("SELECT")
+        for problems in [plan_problems(query["sql"], allow_sort)]
+        if problems
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("url, allow_sort", [
+    ("/api/task/", ("subtask_subtask",)),
+    ("/api/task/?subtasks=summary", ()),
+    ("/api/task/?subtasks=none", ()),
+    ("/api/task/?subtasks=none&page_size=1", ()),
+    ("/api/task/?subtasks=none&include_archived=1&page_size=1", ()),
+    # El ranking ordena las coincidencias de la búsqueda
+    ("/api/task/search/?q=tarea", ("task_task_search",)),
+])
+def test_task_list_query_plans(api_client, url, allow_sort):
+    """Test que las consultas del listado de tareas usan índices y no ordenan en memoria"""
+    # El prefetch de subtareas mezcla varias tareas: el orden por fecha no sale de un índice
+    assert endpoint_problems(api_client, url, allow_sort) == {}
+
+
+@pytest.mark.django_db
+def test_task_detail_query_plans(api_client):
+    """Test que el detalle de una tarea con sus subtareas usa índices"""
+    assert endpoint_problems(api_client, f"/api/task/{api_client.task.id}/") == {}
+
+
+@pytest.mark.django_db
+def test_plan_problems_detects_full_scan_and_sort():
+    """Test que la revisión de planes detecta un scan completo con ordenamiento en memoria"""
+    problems = plan_problems(str(Task.objects.order_by("title").query))
+
+    assert problems
+    assert plan_problems(str(Task.objects.order_by("title").query), allow_sort=("task_task",)) != problems
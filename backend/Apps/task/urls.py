@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import TaskViewSet
+from .views import ImportView, TaskViewSet
 
 router = DefaultRouter()
 router.register(r'task', TaskViewSet, basename='task')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('import/', ImportView.as_view(), name='task_import'),
 ]
\ No newline at end of file
@@ -1,33 +1,150 @@
 from rest_framework import viewsets, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from django.db.models import Prefetch
-from Apps.subtask.models import Subtask
-from Apps.subtask.serializers import SubtaskSerializer
-from .models import Task
-from .serializers import TaskSerializer
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Prefetch, Q, Sum
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from Apps.subtask.models import ArchivedSubtask, Subtask, UserDayLoad
+from Apps.subtask.serializers import SubtaskSerializer, TaskMiniSerializer, apply_note_rules
+from .metrics import deferred_metrics, mark_dirty, mark_dirty_days
+from .models import ArchivedTask, Task
+from .importer import import_file
+from .serializers import (
+    ImportParamsSerializer,
+    TaskNoSubtasksSerializer,
+    TaskSerializer,
+    TaskSummarySerializer,
+    TaskTreeSerializer,
+)
 from rest_framework.permissions import IsAuthenticated
+from Apps.archived import IncludeArchivedMixin
+from Apps.conditional import ConditionalGetMixin
+from Apps.fast_read import FastListMixin, ValuesRenderer
+from Apps.pagination import KeysetPagination
+from Apps.read_cache import CachedReadMixin, bump_data_version, cached_read
+from Apps.search import SearchParamsSerializer, search
+from Apps.sparse_fields import SparseFieldsViewMixin
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, CachedReadMixin, IncludeArchivedMixin, FastListMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created_at', 'id')
+    archived_model = ArchivedTask
+    # Máximo de subtareas por POST /api/task/{id}/subtasks/ con lista (como PUT tree/)
+    BULK_MAX_ITEMS = 500
+
+    # Modos de ?subtasks= para listar/obtener tareas
+    SUBTASK_MODES = {
+        'full': TaskSerializer,
+        'summary': TaskSummarySerializer,
+        'none': TaskNoSubtasksSerializer,
+    }
+
+    def get_subtasks_mode(self):
+        # Las escrituras y acciones propias usan la representación completa sin prefetch
+        if self.action not in ('list', 'retrieve'):
+            return None
+        mode = self.request.query_params.get('subtasks', 'full')
+        if mode not in self.SUBTASK_MODES:
+            raise ValidationError({'subtasks': f"Valor inválido. Opciones: {', '.join(self.SUBTASK_MODES)}."})
+        return mode
+
+    def get_serializer_class(self):
+        return self.SUBTASK_MODES.get(self.get_subtasks_mode(), TaskSerializer)
 
     def get_queryset(self):
         # Solo devuelve las tareas del usuario autenticado
-        return Task.objects.filter(user=self.request.user)
+        return self.shape_queryset(Task.objects.filter(user=self.request.user), Subtask)
+
+    def get_archived_queryset(self):
+        return self.shape_queryset(super().get_archived_queryset().filter(user=self.request.user), ArchivedSubtask)
+
+    def shape_queryset(self, queryset, subtask_model):
+        """Proyección y carga de subtareas según ?fields= y ?subtasks=, para tareas vivas o archivadas."""
+        mode = self.get_subtasks_mode()
+        nested = mode == 'full' and self.wants_field('subtasks')
+        # subtask.task es la tarea ya cargada: sus columnas de TaskMiniSerializer no pueden quedar diferidas
+        queryset = self.restrict_queryset(queryset, also=TaskMiniSerializer.Meta.fields if nested else ())
+
+        if nested:
+            # Una consulta para todas las subtareas; Django enlaza subtask.task con la tarea ya cargada
+            return queryset.prefetch_related(Prefetch('subtasks', queryset=subtask_model.objects.order_by('planification_date', 'created_at')))
+        if mode == 'summary' and self.wants_field('subtasks_summary'):
+            # Conteos y horas por estado como anotaciones: una sola consulta agrupada
+            annotations = {}
+            for value in Subtask.Status.values:
+                annotations[f'summary_{value}_count'] = Count('subtasks', filter=Q(subtasks__status=value))
+                annotations[f'summary_{value}_hours'] = Sum('subtasks__needed_hours', filter=Q(subtasks__status=value))
+            return queryset.annotate(**annotations)
+        return queryset
+
+    def get_fast_renderer(self):
+        # Las subtareas anidadas se cargan por página en fast_render()
+        self.fast_subtasks = {}
+        task_renderer = ValuesRenderer.compile(TaskMiniSerializer())
+        custom = {
+            'subtasks': (task_renderer.sources, lambda row: self.fast_subtasks.get(row['id'], [])),
+            'subtasks_summary': (TaskSummarySerializer.SUMMARY_ANNOTATIONS, TaskSummarySerializer.summary_from),
+        }
+        self.fast_task_renderer = task_renderer
+        return ValuesRenderer.compile(self.get_serializer(), custom=custom)
+
+    def fast_render(self, renderer, rows):
+        rows = list(rows)
+        if self.get_subtasks_mode() == 'full' and self.wants_field('subtasks'):
+            self.load_fast_subtasks(rows)
+        return super().fast_render(renderer, rows)
+
+    def load_fast_subtasks(self, rows):
+        """Subtareas de las tareas de la página en una consulta, cada una con su tarea embebida."""
+        # Como SubtaskListSerializer: la tarea se serializa una vez y se reutiliza
+        embedded = {row['id']: self.fast_task_renderer.render(row) for row in rows}
+        renderer = ValuesRenderer.compile(SubtaskSerializer(), custom={
+            'task': (['task'], lambda row: embedded[row['task']]),
+        })
+        subtasks = (
+            Subtask.objects.filter(task_id__in=embedded)
+            .order_by('planification_date', 'created_at')
+            .values(*renderer.sources)
+        )
+        for row in subtasks:
+            self.fast_subtasks.setdefault(row['task'], []).append(renderer.render(row))
 
     def perform_create(self, serializer):
         # Asigna automáticamente el usuario autenticado al crear una tarea
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=['get'], url_path='search')
+    @cached_read
+    def search(self, request):
+        """
+        Búsqueda de texto completo en título, materia y descripción, ordenada por relevancia.
+        GET /api/task/search/?q=parcial&limit=20
+        """
+        params = SearchParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        results = search(self.get_queryset(), params.validated_data['q'], params.validated_data['limit'])
+        return Response(TaskNoSubtasksSerializer(results, many=True).data, status=status.HTTP_200_OK)
+
     @action(detail=True, methods=['post'], url_path='subtasks')
     def crear_subtarea(self, request, pk=None):
         
         #Crea una subtarea vinculada a una actividad específica (ID en la URL).
         #POST /api/task/{id}/subtareas/
+        #Si el cuerpo es una lista JSON se crean todas en bloque.
         
         task = self.get_object() # Obtiene la Task usando el ID de la URL
+
+        if isinstance(request.data, list):
+            return self._crear_subtareas_en_bloque(task, request.data)
         
         # Pasamos los datos del cuerpo de la petición al serializer de subtareas
         serializer = SubtaskSerializer(data=request.data)
@@ -39,4 +156,153 @@ class TaskViewSet(viewsets.ModelViewSet):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         
         # Si los tipos de datos son erróneos (ej: texto en lugar de horas), DRF devuelve el error 400
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def _crear_subtareas_en_bloque(self, task, items):
+        """Valida todas las subtareas primero, las inserta con bulk_create y recalcula métricas una vez."""
+        # La tarea siempre sale de la URL, no del cuerpo
+        items = [
+            {key: value for key, value in item.items() if key != 'task'} if isinstance(item, dict) else item
+            for item in items
+        ]
+        serializer = SubtaskSerializer(data=items, many=True, max_length=self.BULK_MAX_ITEMS)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Misma regla de Subtask.clean() contra el due_date de la tarea, en memoria
+        subtasks = []
+        errors = []
+        for attrs in serializer.validated_data:
+            subtask = Subtask(task=task, user_id=task.user_id, **attrs)
+            try:
+                subtask.clean()
+                errors.append({})
+            except DjangoValidationError as exc:
+                errors.append(exc.message_dict)
+            subtasks.append(subtask)
+
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            created = Subtask.objects.bulk_create(subtasks)
+            # bulk_create no emite señales: la versión del caché se incrementa a mano
+            bump_data_version(task.user_id)
+            task.update_metrics()
+            UserDayLoad.rebuild(task.user_id, {subtask.planification_date for subtask in created})
+
+        return Response(SubtaskSerializer(created, many=True).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['put'], url_path='tree')
+    def tree(self, request, pk=None):
+        """
+        Guarda en una transacción la tarea y el conjunto completo de sus subtareas.
+        PUT /api/task/{id}/tree/
+        Body: los campos de la tarea y "subtasks": [...]. Las subtareas con id se
+        actualizan, las que no traen id se crean y las que faltan se borran.
+        """
+        with deferred_metrics():
+            # Sin get_queryset(): no hace falta prefetchear las subtareas que se leen bloqueadas abajo
+            task = get_object_or_404(Task.objects.select_for_update(), pk=pk, user=request.user)
+            self.check_object_permissions(request, task)
+            serializer = TaskTreeSerializer(task, data=request.data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            items = serializer.validated_data.pop('subtasks')
+
+            # Los cambios de la tarea se aplican primero: las fechas se validan contra el nuevo due_date
+            for name, value in serializer.validated_data.items():
+                setattr(task, name, value)
+
+            # Subtareas actuales en una consulta (ya enlazadas a `task`), bloqueadas hasta el commit
+            current = task.subtasks.select_for_update().in_bulk()
+            errors = {}
+            kept = set()
+            created, updated, fields, days = [], [], {'updated_at'}, set()
+            now = timezone.now()
+            for index, attrs in enumerate(items):
+                subtask_id = attrs.pop('id', None)
+                # Misma normalización de nota que PATCH y /bulk/: nota sin status es una posposición
+                apply_note_rules(attrs)
+                changed = None
+                if subtask_id is None:
+                    subtask = Subtask(task=task, user_id=task.user_id, **attrs)
+                elif subtask_id in kept or subtask_id not in current:
+                    errors[index] = {'id': ["La subtarea no pertenece a esta tarea o está repetida."]}
+                    continue
+                else:
+                    kept.add(subtask_id)
+                    subtask = current[subtask_id]
+                    changed = {name for name, value in attrs.items() if getattr(subtask, name) != value}
+                    if changed:
+                        days.add((subtask.user_id, subtask.planification_date))
+                        for name in changed:
+                            setattr(subtask, name, attrs[name])
+                        subtask.updated_at = now
+
+                # Todas, también las que no cambian, se validan en memoria contra la tarea editada
+                try:
+                    subtask.clean_fields(exclude=['task', 'user'])
+                    subtask.clean()
+                except DjangoValidationError as exc:
+                    errors[index] = exc.message_dict
+                    continue
+                if changed is None:
+                    created.append(subtask)
+                elif changed:
+                    updated.append(subtask)
+                    fields.update(changed)
+                else:
+                    continue
+                days.add((subtask.user_id, subtask.planification_date))
+
+            if errors:
+                return Response({'subtasks': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+            # Las que no aparecen en el body se borran
+            deleted = [subtask for subtask_id, subtask in current.items() if subtask_id not in kept]
+            days.update((subtask.user_id, subtask.planification_date) for subtask in deleted)
+
+            task.save()
+            if deleted:
+                Subtask.objects.filter(pk__in=[subtask.pk for subtask in deleted]).delete()
+            if updated:
+                Subtask.objects.bulk_update(updated, sorted(fields))
+            if created:
+                Subtask.objects.bulk_create(created)
+            # Métricas de la tarea y carga de cada día afectado, una sola vez al cerrar el bloque
+            mark_dirty(task.pk)
+            mark_dirty_days(*days)
+            # bulk_create/bulk_update no emiten señales
+            bump_data_version(task.user_id)
+
+        task = Task.objects.prefetch_related(
+            Prefetch('subtasks', queryset=Subtask.objects.order_by('planification_date', 'created_at'))
+        ).get(pk=task.pk)
+        return Response(TaskSerializer(task).data, status=status.HTTP_200_OK)
+
+
+class ImportView(APIView):
+    """
+    Importa tareas y subtareas desde un CSV o JSON Lines (ver Apps/task/importer.py).
+    POST /api/import/ (multipart: file, file_format?, dry_run?)
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        params = ImportParamsSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        report = import_file(
+            params.validated_data['file'],
+            params.validated_data['file_format'],
+            request.user,
+            dry_run=params.validated_data['dry_run'],
+        )
+        if report.error_count:
+            code = status.HTTP_400_BAD_REQUEST
+        elif report.imported:
+            code = status.HTTP_201_CREATED
+        else:
+            code = status.HTTP_200_OK
+        return Response(report.as_dict(), status=code)
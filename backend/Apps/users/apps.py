@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Apps.users'
+
+    def ready(self):
+        # Invalida el caché de lecturas en cada escritura
+        from . import signals  # noqa: F401
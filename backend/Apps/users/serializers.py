@@ -1,7 +1,13 @@
 from rest_framework import serializers
 from .models import CustomUser
+from Apps.sparse_fields import SparseFieldsSerializerMixin
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = CustomUser
-        fields = ['id', 'username', 'email', 'daily_hours', 'bio']
\ No newline at end of file
+        fields = ['id', 'username', 'email', 'daily_hours', 'bio']
+
+class RebalanceRequestSerializer(serializers.Serializer):
+    """Parámetros de /api/user/rebalance/: capacidad a evaluar y si se aplican los cambios."""
+    daily_hours = serializers.IntegerField(min_value=1, max_value=24, required=False)
+    apply = serializers.BooleanField(default=False)
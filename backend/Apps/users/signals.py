@@ -0,0 +1,10 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from Apps.read_cache import bump_data_version
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_user_reads(sender, instance, **kwargs):
+    bump_data_version(instance.pk)
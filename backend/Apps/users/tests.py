@@ -1,3 +1,7 @@
+import io
+import json
+import zipfile
+
 from django.test import TestCase
 from django.utils import timezone
 from rest_framework import status
@@ -7,6 +11,9 @@ from rest_framework.test import APIClient
 from Apps.subtask.models import Subtask
 from Apps.task.models import Task
 
+from Apps.task.archive import archive_tasks
+
+from .export import stream_export
 from .models import CustomUser
 from .auth_serializers import RegisterSerializer
 
@@ -112,3 +119,64 @@ class UpdateMeConflictDetectionTests(TestCase):
         )
 
         self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = CustomUser.objects.create_user(
+            username="export.user",
+            email="export@example.com",
+            password="StrongPass123!",
+        )
+        self.client.force_authenticate(user=self.user)
+        other = CustomUser.objects.create_user(username="otro", email="otro@example.com", password="StrongPass123!")
+        Task.objects.create(title="Ajena", due_date=timezone.now(), user=other)
+
+    def make_task(self, title):
+        task = Task.objects.create(title=title, due_date=timezone.now() + timezone.timedelta(days=3), user=self.user)
+        Subtask.objects.create(task=task, description=f"Sub {title}", planification_date=timezone.localdate(), needed_hours=2)
+        return task
+
+    def test_export_streams_zip_with_all_account_data(self):
+        """El zip trae perfil, tareas y subtareas del usuario, incluidas las archivadas."""
+        archived = self.make_task("Vieja")
+        Task.objects.filter(pk=archived.pk).update(is_active=False, updated_at=timezone.now() - timezone.timedelta(days=200))
+        archive_tasks()
+        live = self.make_task("Ñandú")
+
+        response = self.client.get("/api/user/export/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertIn('filename="export-export.user-', response["Content-Disposition"])
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        self.assertEqual(archive.namelist(), ["profile.json", "tasks.jsonl", "subtasks.jsonl"])
+        self.assertEqual(json.loads(archive.read("profile.json"))["username"], "export.user")
+        tasks = [json.loads(line) for line in archive.read("tasks.jsonl").splitlines()]
+        self.assertEqual([(t["id"], t["title"], t["archived"]) for t in tasks], [(live.pk, "Ñandú", False), (archived.pk, "Vieja", True)])
+        subtasks = [json.loads(line) for line in archive.read("subtasks.jsonl").splitlines()]
+        self.assertEqual([(s["task_id"], s["archived"]) for s in subtasks], [(live.pk, False), (archived.pk, True)])
+
+    def test_export_sends_first_bytes_before_querying(self):
+        """El primer bloque (profile.json) sale sin consultas; las filas se leen después."""
+        for index in range(5):
+            self.make_task(f"Tarea {index}")
+        chunks = stream_export(self.user, chunk_size=2)
+        with self.assertNumQueries(0):
+            first = next(chunks)
+        self.assertTrue(first.startswith(b"PK"))
+        archive = zipfile.ZipFile(io.BytesIO(first + b"".join(chunks)))
+        self.assertEqual(len(archive.read("tasks.jsonl").splitlines()), 5)
+
+    def test_export_filename_with_non_ascii_username(self):
+        """El nombre del adjunto va codificado (filename*) si el usuario no es ASCII."""
+        user = CustomUser.objects.create_user(username="José", email="jose@example.com", password="StrongPass123!")
+        self.client.force_authenticate(user=user)
+        response = self.client.get("/api/user/export/")
+        self.assertTrue(response["Content-Disposition"].startswith("attachment; filename*=utf-8''export-Jos%C3%A9-"))
+        response["Content-Disposition"].encode("ascii")
+
+    def test_export_requires_auth(self):
+        self.assertEqual(APIClient().get("/api/user/export/").status_code, status.HTTP_401_UNAUTHORIZED)
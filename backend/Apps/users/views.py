@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Sum
+from django.http import StreamingHttpResponse
+from django.utils.http import content_disposition_header
 from django.utils import timezone
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -7,9 +8,13 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from .serializers import UserSerializer
+from .serializers import RebalanceRequestSerializer, UserSerializer
+from Apps.read_cache import CachedReadMixin, cached_read
+from Apps.sparse_fields import SparseFieldsViewMixin
 from .auth_serializers import RegisterSerializer, CustomTokenObtainPairSerializer
-from Apps.subtask.models import Subtask
+from .export import stream_export
+from Apps.subtask.models import Subtask, UserDayLoad
+from Apps.subtask import scheduling
 
 User = get_user_model()
 
@@ -18,12 +23,13 @@ class AuthTokenView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(CachedReadMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     serializer_class = UserSerializer
+    sparse_actions = ('list', 'retrieve', 'me')
 
     def get_queryset(self):
         # Cada usuario solo ve su propia info
-        return User.objects.filter(id=self.request.user.id)
+        return self.restrict_queryset(User.objects.filter(id=self.request.user.id))
 
     def get_permissions(self):
         if self.action in ['create', 'register']:
@@ -38,8 +44,18 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(UserSerializer(user).data, status=status.HTTP_201_CREATED)
 
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated], url_path='me')
+    @cached_read
     def me(self, request):
-        return Response(UserSerializer(request.user).data, status=status.HTTP_200_OK)
+        return Response(self.get_serializer(request.user).data, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated], url_path='export')
+    def export(self, request):
+        """Zip con profile.json, tasks.jsonl y subtasks.jsonl, generado en streaming (ver Apps/users/export.py)."""
+        response = StreamingHttpResponse(stream_export(request.user), content_type='application/zip')
+        filename = f"export-{request.user.username}-{timezone.localdate().isoformat()}.zip"
+        # filename* (RFC 6266) si el nombre de usuario no es ASCII
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
 
     @action(detail=False, methods=['put'], permission_classes=[IsAuthenticated], url_path='update')
     def update_me(self, request):
@@ -52,34 +68,36 @@ class UserViewSet(viewsets.ModelViewSet):
                 
                 if new_daily_hours < old_daily_hours:
                     today = timezone.localdate()
-                    subtasks_queryset = Subtask.objects.filter(
-                        task__user=request.user,
-                        planification_date__gte=today,
-                        status__in=[Subtask.Status.PENDING, Subtask.Status.IN_PROGRESS]
-                    )
-                    
-                    conflicts_dates = subtasks_queryset.values('planification_date').annotate(
-                        total_day_hours=Sum('needed_hours')
-                    ).filter(total_day_hours__gt=new_daily_hours)
+                    # Lectura por rango sobre la carga diaria materializada
+                    dates = list(UserDayLoad.objects.filter(
+                        user=request.user,
+                        date__gte=today,
+                        planned_hours__gt=new_daily_hours,
+                    ).values_list('date', flat=True))
                     
-                    if conflicts_dates.exists():
-                        dates = [c['planification_date'] for c in conflicts_dates]
-                        conflicting_subtasks = subtasks_queryset.select_related('task').filter(planification_date__in=dates).order_by('planification_date')
+                    if dates:
+                        conflicting_subtasks = Subtask.objects.filter(
+                            user=request.user,
+                            planification_date__in=dates,
+                            status__in=Subtask.ACTIVE_STATUSES,
+                        ).order_by('planification_date').values_list(
+                            'id', 'description', 'needed_hours', 'planification_date', 'task__title', 'task__due_date',
+                        )
                         
                         grouped_conflicts = {}
-                        for s in conflicting_subtasks:
-                            date_key = s.planification_date.isoformat()
+                        for pk, description, hours, day, task_title, task_due_date in conflicting_subtasks:
+                            date_key = day.isoformat()
                             if date_key not in grouped_conflicts:
                                 grouped_conflicts[date_key] = {
-                                    "fecha": s.planification_date,
+                                    "fecha": day,
                                     "subtasks": []
                                 }
                             grouped_conflicts[date_key]["subtasks"].append({
-                                "id": s.id,
-                                "nombre": s.description,
-                                "horas": s.needed_hours,
-                                "task_title": s.task.title,
-                                "task_due_date": s.task.due_date.isoformat() if s.task and s.task.due_date else None,
+                                "id": pk,
+                                "nombre": description,
+                                "horas": hours,
+                                "task_title": task_title,
+                                "task_due_date": task_due_date.isoformat() if task_due_date else None,
                             })
                         
                         return Response(list(grouped_conflicts.values()), status=status.HTTP_409_CONFLICT)
@@ -91,5 +109,47 @@ class UserViewSet(viewsets.ModelViewSet):
         user = serializer.save()
         return Response(UserSerializer(user).data, status=status.HTTP_200_OK)
 
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated], url_path='rebalance')
+    def rebalance(self, request):
+        """
+        Propone una nueva planificación para que ningún día supere la capacidad.
+        POST /api/user/rebalance/  {"daily_hours": 6, "apply": false}
+        Con apply=false (por defecto) solo se devuelve la propuesta.
+        """
+        params = RebalanceRequestSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+
+        plan = scheduling.rebalance(
+            request.user,
+            capacity=params.validated_data.get('daily_hours'),
+            apply=params.validated_data['apply'],
+        )
+        return Response({
+            "daily_hours": plan.capacity,
+            "applied": params.validated_data['apply'],
+            "moves": [
+                {"id": move.id, "from": move.from_date, "to": move.to_date}
+                for move in plan.moves
+            ],
+            "unresolved": plan.unresolved,
+        }, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated], url_path='capacity-impact')
+    @cached_read
+    def capacity_impact(self, request):
+        """
+        Impacto de cada valor posible de daily_hours (1 a 24) sobre los días futuros.
+        GET /api/user/capacity-impact/
+        Solo lectura: no modifica la capacidad ni las subtareas.
+        """
+        # Una sola consulta sobre la carga diaria materializada
+        loads = UserDayLoad.objects.filter(
+            user=request.user,
+            date__gte=timezone.localdate(),
+            subtask_count__gt=0,
+        ).values_list('planned_hours', flat=True)
 
-        
\ No newline at end of file
+        return Response({
+            "current_daily_hours": request.user.daily_hours,
+            "curve": scheduling.capacity_curve(loads),
+        }, status=status.HTTP_200_OK)
@@ -1,3 +1,4 @@
+from django.db.models import Aggregate, CharField
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
@@ -32,4 +33,23 @@ def custom_exception_handler(exc, context):
             "error_log": str(exc) # Solo para desarrollo, quítalo en producción
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    return response
\ No newline at end of file
+    return response
+
+class ConcatIds(Aggregate):
+    """Concatena ids agrupados separados por coma (GROUP_CONCAT en SQLite, STRING_AGG en PostgreSQL)."""
+    function = 'GROUP_CONCAT'
+    output_field = CharField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler,
+            connection,
+            function='STRING_AGG',
+            template="%(function)s(CAST(%(expressions)s AS TEXT), ',')",
+            **extra_context,
+        )
+
+
+def split_ids(value):
+    """Convierte el resultado de ConcatIds en una lista ordenada de enteros."""
+    return sorted(int(token) for token in value.split(',')) if value else []
@@ -216,3 +216,32 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Prueba de que si esta acutalizando automaticamente el deploy
+
+
+# Métricas de tareas: True mantiene contadores con deltas atómicos en cada
+# escritura de subtarea; False recalcula todo con una agregación por escritura.
+TASK_METRICS_INCREMENTAL = config("TASK_METRICS_INCREMENTAL", default=True, cast=bool)
+
+# Listados de tareas y subtareas armados desde values() en lugar de los
+# serializers de DRF (misma salida, mucho menos CPU por fila).
+FAST_LIST_RENDERING = config("FAST_LIST_RENDERING", default=True, cast=bool)
+
+# Caché de respuestas GET por usuario (Apps/read_cache.py). LocMem es por
+# proceso: con varios workers cada uno tendría su propio contador de versión y
+# serviría respuestas viejas, así que por defecto el caché de lecturas solo se
+# activa si CACHE_BACKEND apunta a un backend compartido (Redis, Memcached...).
+LOCMEM_CACHE_BACKEND = "django.core.cache.backends.locmem.LocMemCache"
+CACHE_BACKEND = config("CACHE_BACKEND", default=LOCMEM_CACHE_BACKEND)
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": config("CACHE_LOCATION", default="read-cache"),
+    }
+}
+READ_CACHE_ENABLED = config("READ_CACHE_ENABLED", default=CACHE_BACKEND != LOCMEM_CACHE_BACKEND, cast=bool)
+READ_CACHE_TIMEOUT = config("READ_CACHE_TIMEOUT", default=300, cast=int)
+
+# POST /api/batch/ (Apps/batch.py): sub-peticiones por batch y tiempo total
+# tras el cual las restantes no se ejecutan (503).
+BATCH_MAX_REQUESTS = config("BATCH_MAX_REQUESTS", default=20, cast=int)
+BATCH_TIME_BUDGET_MS = config("BATCH_TIME_BUDGET_MS", default=10000, cast=int)
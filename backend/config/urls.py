@@ -18,8 +18,11 @@ from django.contrib import admin
 
 from django.urls import path, include
 
+from Apps.batch import BatchView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/batch/', BatchView.as_view(), name='batch'),
 
     #Para mis modelos
     path('api/', include('Apps.subtask.urls')),